@@ -10,6 +10,11 @@ from pathlib import Path
 from typing import Optional
 import yaml
 
+# Erlaubte Werte der Auswahl-Einstellungen
+FSYNC_POLICIES = ("none", "file", "batch")
+TRACKER_BACKENDS = ("json", "sqlite")
+TRACKER_MODES = ("hash", "git")
+
 
 @dataclass
 class Config:
@@ -24,6 +29,8 @@ class Config:
     # Dokumentations-Einstellungen
     docs_root: Path = field(default_factory=lambda: Path.home() / "Documents" / "project-docs")
     doc_types: list[str] = field(default_factory=lambda: ["module", "table", "flow", "note"])
+    # fsync beim Schreiben: "none", "file" oder "batch"
+    docs_fsync: str = "none"
     
     # Server-Einstellungen
     server_name: str = "doku-tool"
@@ -34,6 +41,18 @@ class Config:
     max_file_size: int = 15000
     max_results: int = 30
     
+    # Cache für geparste Module
+    cache_max_entries: int = 256
+    cache_max_bytes: int = 64 * 1024 * 1024
+    
+    # Parallelität
+    workers: int = 8
+    
+    # Änderungs-Tracking: "json" oder "sqlite"
+    tracker_backend: str = "json"
+    # Änderungserkennung: "hash" (MD5) oder "git" (Blob-SHA)
+    tracker_mode: str = "hash"
+    
     @property
     def lib_path(self) -> Path:
         """Vollständiger Pfad zum lib-Verzeichnis."""
@@ -44,6 +63,21 @@ class Config:
         """Pfad zur Hash-Datei."""
         return self.docs_root / ".module_hashes.json"
     
+    @property
+    def tracker_db(self) -> Path:
+        """Pfad zur Tracking-Datenbank (Backend "sqlite")."""
+        return self.docs_root / ".module_hashes.db"
+    
+    @property
+    def snapshot_dir(self) -> Path:
+        """Verzeichnis für Snapshots dokumentierter Module."""
+        return self.docs_root / ".snapshots"
+    
+    @property
+    def index_dir(self) -> Path:
+        """Verzeichnis für persistente Indizes (Modul-Index etc.)."""
+        return self.docs_root / ".index"
+    
     def module_to_path(self, module_name: str) -> Path:
         """Konvertiert Modulname zu Dateipfad."""
         path = module_name.replace(self.module_separator, "/") + self.file_extension
@@ -55,8 +89,22 @@ class Config:
         return str(rel.with_suffix("")).replace("/", self.module_separator)
 
 
+def _check_choice(setting: str, value, allowed: tuple[str, ...]) -> None:
+    """Prüft eine Auswahl-Einstellung.
+
+    Raises:
+        ValueError: Wenn der Wert nicht erlaubt ist
+    """
+    if value not in allowed:
+        raise ValueError(f"Ungültiger Wert für {setting}: '{value}'. Erlaubt: {list(allowed)}")
+
+
 def load_config(config_file: Optional[Path] = None) -> Config:
-    """Lädt Konfiguration aus Datei."""
+    """Lädt Konfiguration aus Datei.
+
+    Raises:
+        ValueError: Bei ungültigem docs.fsync, tracker.backend oder tracker.mode
+    """
     config = Config()
     
     if config_file and config_file.exists():
@@ -82,6 +130,8 @@ def load_config(config_file: Optional[Path] = None) -> Config:
                 config.docs_root = Path(docs["root"]).expanduser()
             if "types" in docs:
                 config.doc_types = docs["types"]
+            if "fsync" in docs:
+                config.docs_fsync = docs["fsync"]
         
         # Server
         if "server" in data:
@@ -100,7 +150,32 @@ def load_config(config_file: Optional[Path] = None) -> Config:
                 config.max_file_size = lim["max_file_size"]
             if "max_results" in lim:
                 config.max_results = lim["max_results"]
+        
+        # Cache
+        if "cache" in data:
+            cache = data["cache"]
+            if "max_entries" in cache:
+                config.cache_max_entries = cache["max_entries"]
+            if "max_bytes" in cache:
+                config.cache_max_bytes = cache["max_bytes"]
+        
+        # Performance
+        if "performance" in data:
+            perf = data["performance"]
+            if "workers" in perf:
+                config.workers = perf["workers"]
+        
+        # Tracking
+        if "tracker" in data:
+            trk = data["tracker"]
+            if "backend" in trk:
+                config.tracker_backend = trk["backend"]
+            if "mode" in trk:
+                config.tracker_mode = trk["mode"]
     
+    _check_choice("docs.fsync", config.docs_fsync, FSYNC_POLICIES)
+    _check_choice("tracker.backend", config.tracker_backend, TRACKER_BACKENDS)
+    _check_choice("tracker.mode", config.tracker_mode, TRACKER_MODES)
     return config
 
 
@@ -11,6 +11,7 @@ Aufruf:
     python code/main.py check Order::Validation  # Einzelnes Modul prüfen
     python code/main.py check --all              # Alle Module prüfen
     python code/main.py stats                    # Statistiken anzeigen
+    python code/main.py project-stats            # Projekt-Statistiken anzeigen
 """
 import argparse
 import sys
@@ -35,6 +36,7 @@ def create_parser() -> argparse.ArgumentParser:
                "  %(prog)s check Order::Validation   Prüft ein Modul auf Änderungen\n"
                "  %(prog)s check --all               Prüft alle dokumentierten Module\n"
                "  %(prog)s stats                     Zeigt Dokumentations-Statistiken\n"
+               "  %(prog)s project-stats             Zeigt Statistiken über alle Module\n"
                "  %(prog)s list                      Listet dokumentierte Module\n",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
@@ -108,6 +110,56 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Alle dokumentierten Module prüfen",
     )
+    check_parser.add_argument(
+        "--paranoid",
+        action="store_true",
+        help="Immer neu hashen, auch wenn mtime/Größe/Inode unverändert sind",
+    )
+    check_parser.add_argument(
+        "--propagate",
+        action="store_true",
+        help="Mit --all: auch Module melden, deren Abhängigkeiten geändert sind",
+    )
+    check_parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        metavar="N",
+        help="Anzahl paralleler Hash-Worker (überschreibt Config)",
+    )
+    
+    # mark - Als dokumentiert markieren
+    mark_parser = subparsers.add_parser(
+        "mark",
+        help="Module als dokumentiert markieren",
+        description="Speichert die Hashes der angegebenen Module. "
+                    "Glob-Muster wie 'Order::*' sind erlaubt.",
+    )
+    mark_parser.add_argument(
+        "modules",
+        nargs="+",
+        metavar="MODULE",
+        help="Modulname oder Glob-Muster",
+    )
+    mark_parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        metavar="N",
+        help="Anzahl paralleler Hash-Worker (überschreibt Config)",
+    )
+    
+    # unmark - Markierung entfernen
+    unmark_parser = subparsers.add_parser(
+        "unmark",
+        help="Dokumentations-Markierung entfernen",
+        description="Entfernt die gespeicherten Hashes der angegebenen Module. "
+                    "Glob-Muster wie 'Order::*' sind erlaubt.",
+    )
+    unmark_parser.add_argument(
+        "modules",
+        nargs="+",
+        metavar="MODULE",
+        help="Modulname oder Glob-Muster",
+    )
     
     # stats - Statistiken
     subparsers.add_parser(
@@ -116,6 +168,50 @@ def create_parser() -> argparse.ArgumentParser:
         description="Zeigt eine Übersicht über die vorhandene Dokumentation.",
     )
     
+    # coverage - Dokumentations-Abdeckung
+    coverage_parser = subparsers.add_parser(
+        "coverage",
+        help="Dokumentations-Abdeckung anzeigen",
+        description="Gleicht alle Module unter lib mit Tracker und Doku-Ordner ab: "
+                    "dokumentiert, veraltet, nicht erfasst, verwaist.",
+    )
+    coverage_parser.add_argument(
+        "category",
+        nargs="?",
+        default="",
+        metavar="CATEGORY",
+        help="Nur eine Kategorie auflisten: documented, stale, untracked, orphaned",
+    )
+    coverage_parser.add_argument(
+        "--offset",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Einträge überspringen (Blättern)",
+    )
+    coverage_parser.add_argument(
+        "-n", "--limit",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Einträge pro Liste (Standard: max_results)",
+    )
+    
+    # project-stats - Projektweite Statistiken
+    project_stats_parser = subparsers.add_parser(
+        "project-stats",
+        help="Projekt-Statistiken anzeigen",
+        description="Scannt alle Module unter lib und zeigt Verteilungen sowie "
+                    "die größten und am stärksten vernetzten Module.",
+    )
+    project_stats_parser.add_argument(
+        "-n", "--top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Anzahl der Einträge in den Top-Listen (Standard: 10)",
+    )
+    
     # list - Dokumentierte Module auflisten
     list_parser = subparsers.add_parser(
         "list",
@@ -127,6 +223,24 @@ def create_parser() -> argparse.ArgumentParser:
         choices=["module", "table", "flow", "note"],
         help="Nur bestimmten Dokumentationstyp anzeigen",
     )
+    list_parser.add_argument(
+        "--cursor",
+        default="",
+        help="Fortsetzung aus der vorigen Ausgabe",
+    )
+    list_parser.add_argument(
+        "-n", "--limit",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Einträge pro Seite (Standard: max_results)",
+    )
+    list_parser.add_argument(
+        "--sort",
+        choices=["name", "mtime"],
+        default="name",
+        help="Sortierung: name oder mtime (neueste zuerst)",
+    )
     
     # find - Module suchen
     find_parser = subparsers.add_parser(
@@ -195,16 +309,37 @@ def cmd_check(args: argparse.Namespace, config: Config) -> int:
     """Änderungen prüfen."""
     import tools
     
+    if args.workers:
+        config.workers = args.workers
+    
     if args.all:
-        print(tools.check_all_changes(config))
+        print(tools.check_all_changes(config, args.paranoid, args.propagate))
     elif args.module:
-        print(tools.check_changes(config, args.module))
+        print(tools.check_changes(config, args.module, args.paranoid))
     else:
         print("Fehler: Modulname oder --all angeben", file=sys.stderr)
         return 1
     return 0
 
 
+def cmd_mark(args: argparse.Namespace, config: Config) -> int:
+    """Module als dokumentiert markieren."""
+    import tools
+    
+    if args.workers:
+        config.workers = args.workers
+    
+    print(tools.mark_modules_documented(config, args.modules))
+    return 0
+
+
+def cmd_unmark(args: argparse.Namespace, config: Config) -> int:
+    """Markierung entfernen."""
+    import tools
+    print(tools.unmark_modules_documented(config, args.modules))
+    return 0
+
+
 def cmd_stats(args: argparse.Namespace, config: Config) -> int:
     """Statistiken anzeigen."""
     import tools
@@ -212,17 +347,32 @@ def cmd_stats(args: argparse.Namespace, config: Config) -> int:
     return 0
 
 
+def cmd_coverage(args: argparse.Namespace, config: Config) -> int:
+    """Dokumentations-Abdeckung anzeigen."""
+    import tools
+    print(tools.coverage_report(config, args.category, args.offset, args.limit))
+    return 0
+
+
+def cmd_project_stats(args: argparse.Namespace, config: Config) -> int:
+    """Projekt-Statistiken anzeigen."""
+    import tools
+    print(tools.project_stats(config, args.top))
+    return 0
+
+
 def cmd_list(args: argparse.Namespace, config: Config) -> int:
     """Module auflisten."""
     import tools
     
     if args.type:
-        print(tools.list_docs(config, args.type))
+        print(tools.list_docs(config, args.type, cursor=args.cursor,
+                              limit=args.limit, sort=args.sort))
     else:
         print("=== Dokumentierte Module ===")
         print(tools.list_documented(config))
         print("\n=== Dokumentations-Dateien ===")
-        print(tools.list_docs(config))
+        print(tools.list_docs(config, cursor=args.cursor, limit=args.limit, sort=args.sort))
     return 0
 
 
@@ -257,6 +407,8 @@ docs:
     - table
     - flow
     - note
+  # fsync beim Schreiben: "none", "file" (jede Datei) oder "batch" (einmal pro write_docs)
+  fsync: none
 
 server:
   # Name des MCP-Servers
@@ -271,6 +423,22 @@ limits:
   max_file_size: 15000
   # Maximale Anzahl Suchergebnisse
   max_results: 30
+
+cache:
+  # Maximale Anzahl geparster Module im Speicher
+  max_entries: 256
+  # Maximaler Speicher für geparste Module (Bytes)
+  max_bytes: 67108864
+
+performance:
+  # Anzahl paralleler Worker (Batch-Tools, Scans)
+  workers: 8
+
+tracker:
+  # Speicher für Doku-Hashes: "json" oder "sqlite"
+  backend: json
+  # Änderungserkennung: "hash" (MD5) oder "git" (Blob-SHA aus dem Checkout)
+  mode: hash
 """
     
     output = args.output
@@ -296,7 +464,11 @@ def main() -> int:
     
     # Config laden (außer für init)
     if args.command != "init":
-        config = get_config(args)
+        try:
+            config = get_config(args)
+        except ValueError as e:
+            print(f"Fehler in der Konfiguration: {e}", file=sys.stderr)
+            return 1
     else:
         config = Config()  # Dummy für init
     
@@ -304,7 +476,11 @@ def main() -> int:
     commands = {
         "serve": cmd_serve,
         "check": cmd_check,
+        "mark": cmd_mark,
+        "unmark": cmd_unmark,
         "stats": cmd_stats,
+        "coverage": cmd_coverage,
+        "project-stats": cmd_project_stats,
         "list": cmd_list,
         "find": cmd_find,
         "init": cmd_init,
@@ -2,10 +2,14 @@
 
 Exponiert die Tools als MCP-Werkzeuge für Claude.
 """
+import threading
+
 from mcp.server.fastmcp import FastMCP
 
 from config import Config
 import tools
+from tools.codesearch import get_code_search
+from tools.project import get_project_index
 
 
 def create_server(config: Config) -> FastMCP:
@@ -22,13 +26,15 @@ def create_server(config: Config) -> FastMCP:
     # === Code lesen (Eingabe) ===
     
     @mcp.tool()
-    def read_module(module_name: str) -> str:
-        """Liest ein Modul und gibt den Inhalt zurück.
+    def read_module(module_name: str, start_line: int = 0, end_line: int = 0) -> str:
+        """Liest ein Modul und gibt den Inhalt zurück (große Module seitenweise).
         
         Args:
             module_name: Modulname (z.B. 'Order::Validation')
+            start_line: Erste Zeile (1-basiert), 0 = Dateianfang
+            end_line: Letzte Zeile (inklusive), 0 = so weit das Budget reicht
         """
-        return tools.read_module(config, module_name)
+        return tools.read_module(config, module_name, start_line, end_line)
     
     @mcp.tool()
     def find_modules(pattern: str) -> str:
@@ -48,6 +54,65 @@ def create_server(config: Config) -> FastMCP:
         """
         return tools.module_dependencies(config, module_name)
     
+    @mcp.tool()
+    def module_dependents(module_name: str) -> str:
+        """Zeigt welche Module ein Modul verwenden ("Verwendet von").
+        
+        Args:
+            module_name: Modulname
+        """
+        return tools.module_dependents(config, module_name)
+    
+    @mcp.tool()
+    def dependency_closure(module_name: str, direction: str = "dependencies",
+                           max_depth: int = 0) -> str:
+        """Zeigt die transitive Hülle der Abhängigkeiten oder Verwender inkl. Zyklen.
+        
+        Args:
+            module_name: Modulname
+            direction: 'dependencies' oder 'dependents'
+            max_depth: Maximale Tiefe in Hops, 0 = unbegrenzt
+        """
+        return tools.dependency_closure(config, module_name, direction, max_depth)
+    
+    @mcp.tool()
+    def impact_analysis(changed: list[str]) -> str:
+        """Zeigt welche Module von Änderungen an mehreren Modulen/Dateien betroffen sind.
+        
+        Args:
+            changed: Geänderte Module (Modulnamen oder Dateipfade)
+        """
+        return tools.impact_analysis(config, changed)
+    
+    @mcp.tool()
+    def read_sub(module_name: str, sub_name: str) -> str:
+        """Liest nur eine Subroutine eines Moduls (statt des ganzen Moduls).
+        
+        Args:
+            module_name: Modulname
+            sub_name: Name der Subroutine
+        """
+        return tools.read_sub(config, module_name, sub_name)
+    
+    @mcp.tool()
+    def find_sub(sub_name: str) -> str:
+        """Findet Subroutinen projektweit (Modul und Zeilenbereich).
+        
+        Args:
+            sub_name: Name der Subroutine (exakt oder Teil des Namens)
+        """
+        return tools.find_sub(config, sub_name)
+    
+    @mcp.tool()
+    def search_code(query: str, regex: bool = False) -> str:
+        """Durchsucht den Code aller Module (Trigramm-Index, ohne Groß/Klein).
+        
+        Args:
+            query: Suchtext
+            regex: query als regulären Ausdruck behandeln
+        """
+        return tools.search_code(config, query, regex)
+    
     @mcp.tool()
     def module_stats(module_name: str) -> str:
         """Gibt Statistiken über ein Modul aus (Zeilen, Funktionen, etc.).
@@ -57,21 +122,64 @@ def create_server(config: Config) -> FastMCP:
         """
         return tools.module_stats(config, module_name)
     
+    @mcp.tool()
+    def project_stats(top: int = 10) -> str:
+        """Gibt projektweite Statistiken aus (Verteilungen, größte und am stärksten vernetzte Module).
+        
+        Args:
+            top: Anzahl der Einträge in den Top-Listen
+        """
+        return tools.project_stats(config, top)
+    
+    @mcp.tool()
+    def read_modules(module_names: list[str], max_chars: int = 0) -> str:
+        """Liest mehrere Module in einem Aufruf.
+        
+        Args:
+            module_names: Modulnamen
+            max_chars: Budget pro Modul in Zeichen, 0 = Standardlimit
+        """
+        return tools.read_modules(config, module_names, max_chars)
+    
+    @mcp.tool()
+    def modules_stats(module_names: list[str]) -> str:
+        """Gibt Statistiken für mehrere Module in einem Aufruf aus.
+        
+        Args:
+            module_names: Modulnamen
+        """
+        return tools.modules_stats(config, module_names)
+    
+    @mcp.tool()
+    def modules_dependencies(module_names: list[str]) -> str:
+        """Zeigt die Abhängigkeiten mehrerer Module in einem Aufruf.
+        
+        Args:
+            module_names: Modulnamen
+        """
+        return tools.modules_dependencies(config, module_names)
+    
     # === Änderungs-Tracking (Verarbeitung) ===
     
     @mcp.tool()
-    def check_changes(module_name: str) -> str:
+    def check_changes(module_name: str, paranoid: bool = False) -> str:
         """Prüft ob sich ein Modul seit der letzten Dokumentation geändert hat.
         
         Args:
             module_name: Modulname
+            paranoid: Immer neu hashen, auch bei unveränderter stat-Signatur
         """
-        return tools.check_changes(config, module_name)
+        return tools.check_changes(config, module_name, paranoid)
     
     @mcp.tool()
-    def check_all_changes() -> str:
-        """Prüft alle dokumentierten Module auf Änderungen."""
-        return tools.check_all_changes(config)
+    def check_all_changes(paranoid: bool = False, propagate: bool = False) -> str:
+        """Prüft alle dokumentierten Module auf Änderungen.
+        
+        Args:
+            paranoid: Immer neu hashen, auch bei unveränderter stat-Signatur
+            propagate: Auch Module melden, deren (transitive) Abhängigkeiten geändert sind
+        """
+        return tools.check_all_changes(config, paranoid, propagate)
     
     @mcp.tool()
     def mark_documented(module_name: str) -> str:
@@ -91,6 +199,34 @@ def create_server(config: Config) -> FastMCP:
         """
         return tools.unmark_documented(config, module_name)
     
+    @mcp.tool()
+    def mark_modules_documented(module_names: list[str]) -> str:
+        """Markiert mehrere Module auf einmal als dokumentiert.
+        
+        Args:
+            module_names: Modulnamen oder Glob-Muster (z.B. 'Order::*')
+        """
+        return tools.mark_modules_documented(config, module_names)
+    
+    @mcp.tool()
+    def unmark_modules_documented(module_names: list[str]) -> str:
+        """Entfernt die Dokumentations-Markierung für mehrere Module.
+        
+        Args:
+            module_names: Modulnamen oder Glob-Muster (z.B. 'Order::*')
+        """
+        return tools.unmark_modules_documented(config, module_names)
+    
+    @mcp.tool()
+    def diff_since_documented(module_name: str, context: int = 3) -> str:
+        """Zeigt die Änderungen eines Moduls seit der letzten Dokumentation (Unified Diff).
+        
+        Args:
+            module_name: Modulname
+            context: Anzahl Kontextzeilen im Diff
+        """
+        return tools.diff_since_documented(config, module_name, context)
+    
     @mcp.tool()
     def list_documented() -> str:
         """Listet alle als dokumentiert markierten Module."""
@@ -101,6 +237,17 @@ def create_server(config: Config) -> FastMCP:
         """Gibt Statistiken über die Dokumentation aus."""
         return tools.documentation_stats(config)
     
+    @mcp.tool()
+    def coverage_report(category: str = "", offset: int = 0, limit: int = 0) -> str:
+        """Zeigt, welche Module dokumentiert, veraltet oder nie erfasst sind.
+        
+        Args:
+            category: 'documented', 'stale', 'untracked' oder 'orphaned'. Leer = Übersicht
+            offset: Anzahl zu überspringender Einträge pro Liste
+            limit: Einträge pro Liste, 0 = max_results
+        """
+        return tools.coverage_report(config, category, offset, limit)
+    
     # === Dokumentation (Ausgabe) ===
     
     @mcp.tool()
@@ -114,6 +261,53 @@ def create_server(config: Config) -> FastMCP:
         """
         return tools.write_doc(config, doc_type, name, content)
     
+    @mcp.tool()
+    def write_docs(docs: list[dict]) -> str:
+        """Schreibt mehrere Dokumentations-Dateien in einem Aufruf (unveränderte werden übersprungen).
+        
+        Args:
+            docs: Einträge mit 'doc_type', 'name' und 'content'
+        """
+        return tools.write_docs(config, docs)
+    
+    @mcp.tool()
+    def patch_doc(doc_type: str, name: str, section_heading: str, new_body: str) -> str:
+        """Ersetzt den Inhalt eines Abschnitts (samt Unterabschnitten), der Rest bleibt.
+        
+        Args:
+            doc_type: 'module', 'table', 'flow' oder 'note'
+            name: Name der Datei (ohne .md)
+            section_heading: Überschrift, z.B. 'Zweck' oder '## Zweck'
+            new_body: Neuer Inhalt unter der Überschrift
+        """
+        return tools.patch_doc(config, doc_type, name, section_heading, new_body)
+    
+    @mcp.tool()
+    def append_to_section(doc_type: str, name: str, section_heading: str, text: str) -> str:
+        """Hängt Text an das Ende eines Abschnitts an.
+        
+        Args:
+            doc_type: 'module', 'table', 'flow' oder 'note'
+            name: Name der Datei (ohne .md)
+            section_heading: Überschrift, z.B. 'Notizen'
+            text: Anzuhängender Markdown-Text
+        """
+        return tools.append_to_section(config, doc_type, name, section_heading, text)
+    
+    @mcp.tool()
+    def insert_section(doc_type: str, name: str, heading: str, body: str,
+                       after_heading: str = "") -> str:
+        """Fügt einen neuen Abschnitt ein.
+        
+        Args:
+            doc_type: 'module', 'table', 'flow' oder 'note'
+            name: Name der Datei (ohne .md)
+            heading: Neue Überschrift (ohne # eine Ebene unter after_heading)
+            body: Inhalt des neuen Abschnitts
+            after_heading: Am Ende dieses Abschnitts einfügen, leer = am Dateiende
+        """
+        return tools.insert_section(config, doc_type, name, heading, body, after_heading)
+    
     @mcp.tool()
     def read_doc(doc_type: str, name: str) -> str:
         """Liest eine existierende Dokumentations-Datei.
@@ -125,13 +319,48 @@ def create_server(config: Config) -> FastMCP:
         return tools.read_doc(config, doc_type, name)
     
     @mcp.tool()
-    def list_docs(doc_type: str = "") -> str:
-        """Listet vorhandene Dokumentation auf.
+    def list_docs(doc_type: str = "", pattern: str = "", cursor: str = "",
+                  limit: int = 0, sort: str = "name") -> str:
+        """Listet vorhandene Dokumentation auf (seitenweise).
+        
+        Args:
+            doc_type: Optional - 'module', 'table', 'flow' oder 'note'. Leer = alle.
+            pattern: Optional - Teilstring im Namen
+            cursor: Fortsetzung aus der vorigen Ausgabe
+            limit: Einträge pro Seite, 0 = max_results
+            sort: 'name' oder 'mtime' (neueste zuerst)
+        """
+        return tools.list_docs(config, doc_type, pattern, cursor, limit, sort)
+    
+    @mcp.tool()
+    def search_docs(query: str, doc_type: str = "", limit: int = 0) -> str:
+        """Durchsucht die Dokumentation, sortiert nach Relevanz (BM25).
         
         Args:
+            query: Suchbegriffe (ohne Groß/Klein)
             doc_type: Optional - 'module', 'table', 'flow' oder 'note'. Leer = alle.
+            limit: Maximale Anzahl Treffer, 0 = max_results
         """
-        return tools.list_docs(config, doc_type)
+        return tools.search_docs(config, query, doc_type, limit)
+    
+    @mcp.tool()
+    def doc_backlinks(doc_type: str, name: str) -> str:
+        """Listet die Dokumente, die per [[...]] auf eine Doku-Datei verweisen.
+        
+        Args:
+            doc_type: 'module', 'table', 'flow' oder 'note'
+            name: Name der Datei (ohne .md)
+        """
+        return tools.doc_backlinks(config, doc_type, name)
+    
+    @mcp.tool()
+    def broken_links(doc_type: str = "") -> str:
+        """Findet Wiki-Links ohne Doku-Datei (mit Abgleich gegen die Module unter lib).
+        
+        Args:
+            doc_type: Optional - nur Links aus Dokumenten dieses Typs. Leer = alle.
+        """
+        return tools.broken_links(config, doc_type)
     
     @mcp.tool()
     def delete_doc(doc_type: str, name: str) -> str:
@@ -154,6 +383,14 @@ def run_server(config: Config) -> None:
     """
     mcp = create_server(config)
     
+    # Modul- und Projekt-Index einmalig beim Start aufbauen bzw. aktualisieren.
+    # Der Suchindex kann bei großen Bäumen Minuten brauchen und wird im
+    # Hintergrund aufgebaut; search_code wartet nur, wenn er noch läuft.
+    if config.lib_path.exists():
+        get_project_index(config)
+        threading.Thread(target=get_code_search, args=(config,),
+                         name="code-search-index", daemon=True).start()
+    
     if config.transport == "http":
         mcp.run(transport="http", port=config.http_port)
     else:
@@ -4,27 +4,53 @@ Eingabe (reader):
     - read_module: Modul-Code lesen
     - find_modules: Module suchen
     - module_dependencies: Abhängigkeiten anzeigen
+    - module_dependents: Verwendende Module anzeigen
+    - dependency_closure: Transitive Abhängigkeiten/Verwender
+    - impact_analysis: Betroffene Module bei Änderungen
+    - read_sub: Einzelne Subroutine lesen
+    - find_sub: Subroutinen projektweit finden
+    - search_code: Volltextsuche im Code
     - module_stats: Modul-Statistiken
+    - project_stats: Projektweite Statistiken
+    - read_modules, modules_stats, modules_dependencies: Batch-Varianten
 
 Verarbeitung (tracker):
     - check_changes: Änderungen prüfen
     - check_all_changes: Alle Module prüfen
     - mark_documented: Als dokumentiert markieren
     - unmark_documented: Markierung entfernen
+    - mark_modules_documented, unmark_modules_documented: Batch-Varianten
+    - diff_since_documented: Diff seit der letzten Dokumentation
     - list_documented: Dokumentierte Module listen
     - documentation_stats: Statistiken
+    - coverage_report: Abdeckung über alle Module unter lib
 
 Ausgabe (writer):
     - write_doc: Dokumentation schreiben
+    - write_docs: Batch-Variante
+    - patch_doc, append_to_section, insert_section: Einzelne Abschnitte ändern
     - read_doc: Dokumentation lesen
     - list_docs: Dokumentation auflisten
+    - search_docs: Volltextsuche in der Dokumentation
+    - doc_backlinks: Verweise auf eine Doku-Datei
+    - broken_links: Wiki-Links ohne Ziel
     - delete_doc: Dokumentation löschen
 """
 from .reader import (
     read_module,
     find_modules,
     module_dependencies,
+    module_dependents,
+    dependency_closure,
+    impact_analysis,
+    read_sub,
+    find_sub,
+    search_code,
     module_stats,
+    project_stats,
+    read_modules,
+    modules_stats,
+    modules_dependencies,
 )
 
 from .tracker import (
@@ -32,14 +58,26 @@ from .tracker import (
     check_all_changes,
     mark_documented,
     unmark_documented,
+    mark_modules_documented,
+    unmark_modules_documented,
+    diff_since_documented,
     list_documented,
     documentation_stats,
 )
 
+from .coverage import coverage_report
+
 from .writer import (
     write_doc,
+    write_docs,
+    patch_doc,
+    append_to_section,
+    insert_section,
     read_doc,
     list_docs,
+    search_docs,
+    doc_backlinks,
+    broken_links,
     delete_doc,
 )
 
@@ -48,17 +86,38 @@ __all__ = [
     "read_module",
     "find_modules",
     "module_dependencies",
+    "module_dependents",
+    "dependency_closure",
+    "impact_analysis",
+    "read_sub",
+    "find_sub",
+    "search_code",
     "module_stats",
+    "project_stats",
+    "read_modules",
+    "modules_stats",
+    "modules_dependencies",
     # Tracker (Verarbeitung)
     "check_changes",
     "check_all_changes",
     "mark_documented",
     "unmark_documented",
+    "mark_modules_documented",
+    "unmark_modules_documented",
+    "diff_since_documented",
     "list_documented",
     "documentation_stats",
+    "coverage_report",
     # Writer (Ausgabe)
     "write_doc",
+    "write_docs",
+    "patch_doc",
+    "append_to_section",
+    "insert_section",
     "read_doc",
     "list_docs",
+    "search_docs",
+    "doc_backlinks",
+    "broken_links",
     "delete_doc",
 ]
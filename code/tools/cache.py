@@ -0,0 +1,216 @@
+"""Geteilter Cache für geparste Module (Eingabe).
+
+read_module, module_dependencies und module_stats werden meist direkt
+hintereinander für dasselbe Modul aufgerufen. Damit Datei-I/O und
+Scanner-Durchlauf nur einmal anfallen, werden geparste Module in einem
+LRU-Cache gehalten. Gültig ist ein Eintrag, solange die stat-Signatur
+(mtime_ns, Größe, Inode) der Datei unverändert ist.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .scanner import ScanResult, SubInfo, scan
+
+
+@dataclass
+class ModuleRecord:
+    """Geparstes Modul."""
+
+    path: Path
+    signature: tuple[int, int, int]
+    content: str
+    line_offsets: list[int] = field(default_factory=list)
+    scan: ScanResult = field(default_factory=ScanResult)
+
+    @property
+    def size(self) -> int:
+        """Dateigröße in Bytes."""
+        return self.signature[1]
+
+    @property
+    def line_count(self) -> int:
+        """Anzahl Zeilen."""
+        return len(self.line_offsets)
+
+    @property
+    def packages(self) -> list[str]:
+        """Deklarierte Packages."""
+        return self.scan.packages
+
+    @property
+    def package_blocks(self) -> list[tuple[str, int, int]]:
+        """Packages mit Zeilenbereich."""
+        return self.scan.package_blocks
+
+    @property
+    def subs(self) -> list[SubInfo]:
+        """Subroutinen mit Zeilenbereich."""
+        return self.scan.subs
+
+    @property
+    def sub_names(self) -> list[str]:
+        """Namen aller Subroutinen."""
+        return self.scan.sub_names
+
+    @property
+    def uses(self) -> list[str]:
+        """use-Anweisungen."""
+        return self.scan.uses
+
+    @property
+    def requires(self) -> list[str]:
+        """require-Anweisungen."""
+        return self.scan.requires
+
+    @property
+    def parents(self) -> list[str]:
+        """Basisklassen aus use parent/base."""
+        return self.scan.parents
+
+    @property
+    def dependencies(self) -> list[str]:
+        """Sortierte, eindeutige Abhängigkeiten."""
+        return self.scan.dependencies
+
+    def slice_lines(self, start: int, end: int) -> str:
+        """Text der Zeilen start..end (1-basiert, inklusive)."""
+        offsets = self.line_offsets
+        if start < 1 or start > len(offsets):
+            return ""
+        stop = offsets[end] if end < len(offsets) else len(self.content)
+        return self.content[offsets[start - 1]:stop]
+
+    @property
+    def memory(self) -> int:
+        """Grobe Schätzung des Speicherbedarfs in Bytes."""
+        return len(self.content) + 8 * len(self.line_offsets) + 256
+
+
+def stat_signature(st: os.stat_result) -> tuple[int, int, int]:
+    """Signatur einer Datei für die Cache-Validierung."""
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _line_offsets(content: str) -> list[int]:
+    """Zeichen-Offsets aller Zeilenanfänge."""
+    if not content:
+        return []
+    offsets = [0]
+    pos = content.find("\n")
+    end = len(content) - 1
+    while pos != -1 and pos < end:
+        offsets.append(pos + 1)
+        pos = content.find("\n", pos + 1)
+    return offsets
+
+
+def parse_module(path: Path, signature: tuple[int, int, int]) -> ModuleRecord:
+    """Liest und parst eine Modul-Datei."""
+    content = path.read_text(encoding="utf-8", errors="replace")
+    return ModuleRecord(
+        path=path,
+        signature=signature,
+        content=content,
+        line_offsets=_line_offsets(content),
+        scan=scan(content),
+    )
+
+
+class ModuleCache:
+    """LRU-Cache für ModuleRecords mit Eintrags- und Speicherlimit."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, ModuleRecord] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def configure(self, max_entries: int, max_bytes: int) -> None:
+        """Setzt neue Limits und verdrängt ggf. überzählige Einträge."""
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        """Leert den Cache."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get(self, path: Path) -> Optional[ModuleRecord]:
+        """Liefert das geparste Modul, bei Bedarf neu eingelesen.
+
+        Returns:
+            ModuleRecord oder None wenn die Datei nicht existiert
+        """
+        key = str(path)
+        try:
+            signature = stat_signature(os.stat(path))
+        except OSError:
+            with self._lock:
+                self._drop(key)
+            return None
+
+        with self._lock:
+            record = self._entries.get(key)
+            if record is not None and record.signature == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return record
+            self.misses += 1
+
+        try:
+            record = parse_module(path, signature)
+        except OSError:
+            return None
+
+        with self._lock:
+            self._drop(key)
+            if record.memory <= self.max_bytes and self.max_entries > 0:
+                self._entries[key] = record
+                self._bytes += record.memory
+                self._evict()
+        return record
+
+    def _drop(self, key: str) -> None:
+        record = self._entries.pop(key, None)
+        if record is not None:
+            self._bytes -= record.memory
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, record = self._entries.popitem(last=False)
+            self._bytes -= record.memory
+
+
+_CACHE = ModuleCache()
+
+
+def get_module_record(config, module_name: str) -> Optional[ModuleRecord]:
+    """Liefert das geparste Modul aus dem prozessweiten Cache.
+
+    Args:
+        config: Konfiguration
+        module_name: Modulname
+
+    Returns:
+        ModuleRecord oder None wenn das Modul nicht existiert
+    """
+    if (_CACHE.max_entries, _CACHE.max_bytes) != (config.cache_max_entries, config.cache_max_bytes):
+        _CACHE.configure(config.cache_max_entries, config.cache_max_bytes)
+    return _CACHE.get(config.module_to_path(module_name))
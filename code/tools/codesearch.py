@@ -0,0 +1,401 @@
+"""Trigramm-Index für die Volltextsuche im Code (Eingabe).
+
+Für jede Modul-Datei werden die Byte-Trigramme des (kleingeschriebenen)
+Inhalts in einer SQLite-Datenbank unter docs_root abgelegt, kompakt pro
+Trigramm und Block von Datei-IDs als sortiertes Offset-Array. Eine Suche
+ermittelt zuerst über die Trigramme der Suchbegriffe die Kandidaten-Dateien
+und wendet erst darauf den eigentlichen Regex an. Geänderte Dateien werden
+anhand von mtime und Größe erkannt und einzeln neu indiziert; über
+get_code_search wird höchstens einmal pro REVALIDATE_INTERVAL geprüft.
+"""
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from .index import get_module_index
+
+SCHEMA_VERSION = 2
+
+# Postings liegen pro Trigramm in Blöcken zu je 2**BLOCK_BITS Datei-IDs:
+# eine Zeile (Block, Trigramm) mit den sortierten Offsets als uint16-Array
+BLOCK_BITS = 10
+
+# Gesammelte Postings, ab denen während des Indizierens geschrieben wird
+POSTINGS_BATCH = 2_000_000
+
+# Mindestabstand (Sekunden) zwischen zwei Abgleichen über get_code_search
+REVALIDATE_INTERVAL = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    module TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    block INTEGER NOT NULL,
+    tri INTEGER NOT NULL,
+    offsets BLOB NOT NULL,
+    PRIMARY KEY (block, tri)
+) WITHOUT ROWID;
+"""
+
+_META_CHARS = set(".^$*+?{}[]|()")
+_OPTIONAL_QUANTIFIERS = set("?*")
+# {m}, {m,}, {,n}, {m,n} - andernfalls ist { ein normales Zeichen
+_COUNTED_QUANTIFIER_RE = re.compile(r"\{(?=\d|,\d)\d*(?:,\d*)?\}")
+# Rest eines Escapes nach dem Backslash: \xhh, \uhhhh, \Uhhhhhhhh, \N{...},
+# Oktal/Rückverweis (Ziffern) oder ein einzelnes Zeichen (\w, \d, \b, ...)
+_ESCAPE_RE = re.compile(r"x[0-9a-fA-F]{0,2}|u[0-9a-fA-F]{0,4}|U[0-9a-fA-F]{0,8}"
+                        r"|N\{[^}]*\}|\d+|.", re.DOTALL)
+# Inline-Flag x (verbose): Leerzeichen und Kommentare sind keine Literale
+_VERBOSE_RE = re.compile(r"\(\?[a-zA-Z-]*x")
+
+
+@dataclass
+class Match:
+    """Ein Treffer mit Kontextzeilen."""
+
+    module: str
+    line: int
+    context: list[tuple[int, str]]
+
+
+def trigrams(text: str) -> set[int]:
+    """Byte-Trigramme eines Textes als Integer (ohne Groß/Klein)."""
+    data = text.lower().encode("utf-8")
+    to_int = int.from_bytes
+    return {to_int(tri, "big") for tri in {data[i:i + 3] for i in range(len(data) - 2)}}
+
+
+def required_literals(pattern: str) -> list[str]:
+    """Literale Teilstrings, die jeder Treffer eines Regex enthalten muss.
+
+    Konservativ: Bei Alternativen ('|') und im verbose-Modus ((?x)) wird
+    nichts abgeleitet, Gruppen und Zeichenklassen werden übersprungen,
+    optionale Zeichen abgeschnitten. Auch Zeichen mit Wiederholungsangabe
+    ({m,n}) gelten als optional; Escapes wie \\x24 oder \\w beenden ein Literal.
+    """
+    if "|" in pattern or _VERBOSE_RE.search(pattern):
+        return []
+    literals = []
+    current = ""
+    i = 0
+    n = len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < n:
+            nxt = pattern[i + 1]
+            if nxt.isalnum():
+                # \w, \x24, \1 ... sind keine Literale (nicht dekodiert)
+                literals.append(current)
+                current = ""
+                i = _ESCAPE_RE.match(pattern, i + 1).end()
+                continue
+            current += nxt
+            i += 2
+            continue
+        if ch == "{":
+            quantifier = _COUNTED_QUANTIFIER_RE.match(pattern, i)
+            if not quantifier:
+                current += ch
+                i += 1
+                continue
+            literals.append(current[:-1])
+            current = ""
+            i = quantifier.end()
+            continue
+        if ch in _META_CHARS:
+            if ch in _OPTIONAL_QUANTIFIERS and current:
+                current = current[:-1]
+            literals.append(current)
+            current = ""
+            if ch == "[":
+                end = pattern.find("]", i + 2)
+                i = n if end == -1 else end + 1
+                continue
+            if ch == "(":
+                depth = 0
+                while i < n:
+                    if pattern[i] == "\\":
+                        i += 2
+                        continue
+                    if pattern[i] == "(":
+                        depth += 1
+                    elif pattern[i] == ")":
+                        depth -= 1
+                        if depth == 0:
+                            break
+                    i += 1
+            i += 1
+            continue
+        current += ch
+        i += 1
+    literals.append(current)
+    return [lit for lit in literals if len(lit.encode("utf-8")) >= 3]
+
+
+class CodeSearchIndex:
+    """Persistenter Trigramm-Index über alle Module unter lib_path."""
+
+    def __init__(self, config, db_file: Path):
+        self.config = config
+        self.db_file = db_file
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._db.executescript(
+                "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS postings;"
+            )
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._db.commit()
+        self._checked = float("-inf")
+
+    def close(self) -> None:
+        """Schließt die Datenbank."""
+        with self._lock:
+            self._db.close()
+
+    def refresh(self, max_age: float = 0.0) -> int:
+        """Indiziert neue und geänderte Dateien, entfernt gelöschte.
+
+        Args:
+            max_age: Abgleich überspringen, wenn der letzte höchstens so
+                viele Sekunden zurückliegt
+
+        Returns:
+            Anzahl neu indizierter oder entfernter Dateien
+        """
+        if max_age > 0 and time.monotonic() - self._checked < max_age:
+            return 0
+        names = get_module_index(self.config).names
+        with self._lock:
+            if max_age > 0 and time.monotonic() - self._checked < max_age:
+                return 0  # anderer Thread hat inzwischen abgeglichen
+            self._checked = time.monotonic()
+            db = self._db
+            known = {
+                module: (file_id, mtime, size)
+                for file_id, module, mtime, size in db.execute(
+                    "SELECT id, module, mtime_ns, size FROM files"
+                )
+            }
+            present = set(names)
+            stale = [known[m][0] for m in known if m not in present]
+            updates = len(stale)
+            changed = []
+            for module in names:
+                path = self.config.module_to_path(module)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entry = known.get(module)
+                if entry and (entry[1], entry[2]) == (st.st_mtime_ns, st.st_size):
+                    continue
+                if entry:
+                    stale.append(entry[0])
+                changed.append((module, path, st))
+            if not stale and not changed:
+                return 0
+
+            with db:
+                # Erst entfernen: SQLite vergibt freigewordene IDs neu
+                self._remove(stale)
+                db.executemany("DELETE FROM files WHERE id = ?", ((i,) for i in stale))
+                # Blöcke ohne Postings müssen beim Einfügen nicht gelesen werden
+                filled = {row[0] for row in db.execute(
+                    "SELECT DISTINCT id >> ? FROM files", (BLOCK_BITS,))}
+                pending: dict[int, defaultdict[int, list[int]]] = {}
+                count = 0
+                for module, path, st in changed:
+                    try:
+                        content = path.read_text(encoding="utf-8", errors="replace")
+                    except OSError:
+                        continue
+                    cur = db.execute(
+                        "INSERT INTO files (module, mtime_ns, size) VALUES (?, ?, ?)",
+                        (module, st.st_mtime_ns, st.st_size),
+                    )
+                    updates += 1
+                    block, offset = divmod(cur.lastrowid, 1 << BLOCK_BITS)
+                    lists = pending.get(block)
+                    if lists is None:
+                        lists = pending[block] = defaultdict(list)
+                    tris = trigrams(content)
+                    for tri in tris:
+                        lists[tri].append(offset)
+                    count += len(tris)
+                    if count >= POSTINGS_BATCH:
+                        self._add(pending, filled)
+                        count = 0
+                self._add(pending, filled)
+            return updates
+
+    def _add(self, pending: dict[int, defaultdict[int, list[int]]], filled: set[int]) -> None:
+        """Fügt gesammelte Offsets in die Posting-Blöcke ein.
+
+        Args:
+            pending: Block -> Trigramm -> neue Offsets (wird geleert)
+            filled: Blöcke, die schon Postings haben können (wird ergänzt)
+        """
+        db = self._db
+        for block in sorted(pending):
+            lists = pending[block]
+            rows = []
+            for tri in sorted(lists):
+                offsets = array("H", lists[tri])
+                if block in filled:
+                    row = db.execute(
+                        "SELECT offsets FROM postings WHERE block = ? AND tri = ?", (block, tri)
+                    ).fetchone()
+                    if row:
+                        offsets.frombytes(row[0])
+                        offsets = array("H", sorted(offsets))
+                rows.append((block, tri, offsets.tobytes()))
+            db.executemany(
+                "INSERT OR REPLACE INTO postings (block, tri, offsets) VALUES (?, ?, ?)", rows
+            )
+            filled.add(block)
+        pending.clear()
+
+    def _remove(self, file_ids: list[int]) -> None:
+        """Entfernt Dateien aus den Posting-Blöcken (ein Durchlauf pro Block)."""
+        by_block: dict[int, set[int]] = {}
+        for file_id in file_ids:
+            block, offset = divmod(file_id, 1 << BLOCK_BITS)
+            by_block.setdefault(block, set()).add(offset)
+        for block, removed in by_block.items():
+            rows = self._db.execute(
+                "SELECT tri, offsets FROM postings WHERE block = ?", (block,)
+            ).fetchall()
+            for tri, blob in rows:
+                offsets = array("H")
+                offsets.frombytes(blob)
+                found = False
+                for offset in removed:
+                    i = bisect_left(offsets, offset)
+                    if i < len(offsets) and offsets[i] == offset:
+                        del offsets[i]
+                        found = True
+                if not found:
+                    continue
+                if offsets:
+                    self._db.execute(
+                        "UPDATE postings SET offsets = ? WHERE block = ? AND tri = ?",
+                        (offsets.tobytes(), block, tri),
+                    )
+                else:
+                    self._db.execute(
+                        "DELETE FROM postings WHERE block = ? AND tri = ?", (block, tri)
+                    )
+
+    def candidates(self, literals: list[str]) -> list[str]:
+        """Module, die alle Trigramme der Literale enthalten (sortiert)."""
+        wanted: set[int] = set()
+        for literal in literals:
+            wanted |= trigrams(literal)
+        with self._lock:
+            if not wanted:
+                return sorted(row[0] for row in self._db.execute("SELECT module FROM files"))
+            placeholders = ",".join("?" * len(wanted))
+            blocks = [row[0] for row in self._db.execute("SELECT DISTINCT id >> ? FROM files",
+                                                         (BLOCK_BITS,))]
+            file_ids = []
+            for block in blocks:
+                rows = self._db.execute(
+                    f"SELECT offsets FROM postings WHERE block = ? AND tri IN ({placeholders})",
+                    (block, *wanted),
+                ).fetchall()
+                if len(rows) < len(wanted):
+                    continue
+                found = None
+                for (blob,) in sorted(rows, key=lambda row: len(row[0])):
+                    offsets = array("H")
+                    offsets.frombytes(blob)
+                    found = set(offsets) if found is None else found.intersection(offsets)
+                    if not found:
+                        break
+                base = block << BLOCK_BITS
+                file_ids.extend(base + offset for offset in found or ())
+            modules = []
+            for i in range(0, len(file_ids), 500):
+                chunk = file_ids[i:i + 500]
+                modules.extend(row[0] for row in self._db.execute(
+                    f"SELECT module FROM files WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ))
+            return sorted(modules)
+
+    def search(self, query: str, regex: bool = False, context: int = 1,
+               limit: int = 0) -> Iterator[Match]:
+        """Sucht im Code (ohne Groß/Klein).
+
+        Args:
+            query: Suchtext oder Regex
+            regex: query als regulären Ausdruck behandeln
+            context: Anzahl Kontextzeilen vor/nach dem Treffer
+            limit: Maximale Anzahl Treffer, 0 = unbegrenzt
+
+        Raises:
+            re.error: Bei ungültigem Regex
+        """
+        pattern = re.compile(query if regex else re.escape(query), re.IGNORECASE)
+        literals = required_literals(query) if regex else [query]
+        found = 0
+        for module in self.candidates(literals):
+            try:
+                text = self.config.module_to_path(module).read_text(
+                    encoding="utf-8", errors="replace"
+                )
+            except OSError:
+                continue
+            lines = text.splitlines()
+            for lineno, line in enumerate(lines, start=1):
+                if not pattern.search(line):
+                    continue
+                first = max(1, lineno - context)
+                last = min(len(lines), lineno + context)
+                yield Match(module, lineno, [(i, lines[i - 1]) for i in range(first, last + 1)])
+                found += 1
+                if limit and found >= limit:
+                    return
+
+
+_INDEXES: dict[tuple, CodeSearchIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_code_search(config, refresh: bool = True) -> CodeSearchIndex:
+    """Liefert den (prozessweit geteilten) Suchindex für eine Konfiguration.
+
+    Args:
+        config: Konfiguration
+        refresh: Vor der Rückgabe inkrementell aktualisieren
+    """
+    key = (str(config.lib_path), config.file_extension, config.module_separator,
+           str(config.index_dir))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = CodeSearchIndex(config, config.index_dir / "code_search.db")
+            _INDEXES[key] = index
+    if refresh:
+        index.refresh(max_age=REVALIDATE_INTERVAL)
+    return index
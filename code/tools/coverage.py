@@ -0,0 +1,216 @@
+"""Dokumentations-Abdeckung (Verarbeitung).
+
+Verknüpft drei Quellen: alle Module unter lib (Modul-Index, per os.scandir
+und Verzeichnis-mtimes inkrementell aktuell gehalten), die Records des
+Trackers und die Dateien im Doku-Ordner `modules/`. Daraus ergeben sich
+
+- dokumentiert: markiert und seitdem unverändert
+- veraltet: markiert, aber seitdem geändert
+- nicht erfasst: nie markiert
+- verwaist: Doku-Dateien ohne Modul und Markierungen ohne Modul
+
+Ob ein markiertes Modul veraltet ist, entscheidet der stat-Schnellpfad
+des Trackers. Als veraltet erkannte Module werden mit Hash und stat-
+Signatur unter docs_root gemerkt und erst nach einer weiteren Änderung
+(oder neuer Markierung) erneut gehasht.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .index import get_module_index
+from .persist import load_json, write_json_atomic
+from .store import open_store
+from .tracker import check_records, stat_fields
+from .writer import sanitize_filename
+
+CACHE_VERSION = 1
+
+CATEGORIES = ("documented", "stale", "untracked", "orphaned")
+
+_TITLES = {
+    "documented": "DOKUMENTIERT",
+    "stale": "VERALTET",
+    "untracked": "NICHT ERFASST",
+    "orphaned": "VERWAIST",
+}
+
+
+@dataclass
+class Coverage:
+    """Ergebnis eines Abgleichs (alle Listen sortiert)."""
+
+    total: int = 0
+    documented: list[str] = field(default_factory=list)
+    stale: list[str] = field(default_factory=list)
+    untracked: list[str] = field(default_factory=list)
+    orphaned_docs: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    # Module mit Datei im Doku-Ordner modules/
+    with_doc: set[str] = field(default_factory=set)
+
+    def entries(self, category: str) -> list[str]:
+        """Ausgabezeilen einer Kategorie."""
+        if category == "orphaned":
+            return ([f"modules/{stem}.md (kein Modul)" for stem in self.orphaned_docs]
+                    + [f"{name} (markiert, Modul fehlt)" for name in self.missing])
+        names = getattr(self, category)
+        if category == "untracked":
+            return [f"{n} (Doku vorhanden)" if n in self.with_doc else n for n in names]
+        return list(names)
+
+
+class CoverageIndex:
+    """Gecachter Abgleich von lib, Tracker und Doku-Ordner."""
+
+    def __init__(self, config, cache_file: Path):
+        self.config = config
+        self.cache_file = cache_file
+        # Modulname -> [Hash des Records, mtime_ns, Größe, Inode]
+        self._stale: dict[str, list] = {}
+        self._lock = threading.Lock()
+        data = load_json(cache_file, {})
+        if data.get("version") == CACHE_VERSION:
+            self._stale = data.get("stale", {})
+
+    def _doc_stems(self) -> set[str]:
+        folder = self.config.docs_root / "modules"
+        try:
+            with os.scandir(folder) as it:
+                return {e.name[:-3] for e in it if e.name.endswith(".md") and e.is_file()}
+        except OSError:
+            return set()
+
+    def refresh(self) -> Coverage:
+        """Gleicht den aktuellen Stand ab.
+
+        Returns:
+            Coverage
+        """
+        names = get_module_index(self.config).names
+        store = open_store(self.config)
+        records = store.load()
+        doc_stems = self._doc_stems()
+
+        with self._lock:
+            coverage = Coverage(total=len(names))
+            present = set(names)
+            pending: dict[str, dict] = {}
+            signatures: dict[str, dict] = {}
+            stale: dict[str, list] = {}
+            for name, record in records.items():
+                if name not in present:
+                    coverage.missing.append(name)
+                    continue
+                try:
+                    sig = stat_fields(os.stat(self.config.module_to_path(name)))
+                except OSError:
+                    coverage.missing.append(name)
+                    continue
+                key = [record["hash"], sig["mtime_ns"], sig["size"], sig["inode"]]
+                if self._stale.get(name) == key:
+                    coverage.stale.append(name)
+                    stale[name] = key
+                else:
+                    pending[name] = record
+                    signatures[name] = key
+
+            refreshed = {}
+            for name, status, updated in check_records(self.config, pending):
+                if status is None:
+                    coverage.missing.append(name)
+                elif status:
+                    coverage.documented.append(name)
+                else:
+                    coverage.stale.append(name)
+                    stale[name] = signatures[name]
+                if updated is not None:
+                    refreshed[name] = updated
+
+            coverage.untracked = [n for n in names if n not in records]
+            stem_to_module = {sanitize_filename(n): n for n in names}
+            coverage.with_doc = {stem_to_module[s] for s in doc_stems if s in stem_to_module}
+            coverage.orphaned_docs = sorted(s for s in doc_stems if s not in stem_to_module)
+            for names_list in (coverage.documented, coverage.stale, coverage.missing):
+                names_list.sort()
+
+            if stale != self._stale:
+                self._stale = stale
+                write_json_atomic(self.cache_file, {"version": CACHE_VERSION, "stale": stale})
+
+        if refreshed:
+            # Inhalt gleich, nur stat neu: Signatur im Tracker nachführen
+            store.update(refreshed)
+        return coverage
+
+
+_INDEXES: dict[tuple, CoverageIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_coverage(config) -> Coverage:
+    """Aktueller Abgleich über den (prozessweit geteilten) Coverage-Index."""
+    key = (str(config.lib_path), str(config.docs_root), str(config.index_dir))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = CoverageIndex(config, config.index_dir / "coverage.json")
+            _INDEXES[key] = index
+    return index.refresh()
+
+
+def _percent(part: int, total: int) -> str:
+    return f"{100 * part / total:.1f}%" if total else "-"
+
+
+def coverage_report(config, category: str = "", offset: int = 0, limit: int = 0) -> str:
+    """Zeigt, welche Module dokumentiert, veraltet oder nie erfasst sind.
+
+    Args:
+        config: Konfiguration
+        category: 'documented', 'stale', 'untracked' oder 'orphaned'.
+            Leer = Übersicht mit veralteten, nicht erfassten und verwaisten
+        offset: Anzahl zu überspringender Einträge pro Liste
+        limit: Einträge pro Liste, 0 = max_results
+
+    Returns:
+        Zusammenfassung und seitenweise Listen
+    """
+    if category and category not in CATEGORIES:
+        return f"Ungültige Kategorie '{category}'. Erlaubt: {list(CATEGORIES)}"
+    if not config.lib_path.exists():
+        return f"lib-Verzeichnis nicht gefunden: {config.lib_path}"
+
+    coverage = get_coverage(config)
+    limit = limit if limit > 0 else config.max_results
+    offset = max(offset, 0)
+    untracked_with_doc = sum(1 for n in coverage.untracked if n in coverage.with_doc)
+
+    result = [
+        "Dokumentations-Abdeckung",
+        "=" * 30,
+        f"Module unter lib: {coverage.total}",
+        f"Dokumentiert: {len(coverage.documented)} "
+        f"({_percent(len(coverage.documented), coverage.total)})",
+        f"Veraltet: {len(coverage.stale)}",
+        f"Nicht erfasst: {len(coverage.untracked)} (davon {untracked_with_doc} mit Doku-Datei)",
+        f"Verwaiste Doku-Dateien: {len(coverage.orphaned_docs)}",
+        f"Markiert, aber Modul fehlt: {len(coverage.missing)}",
+    ]
+
+    for name in [category] if category else ["stale", "untracked", "orphaned"]:
+        entries = coverage.entries(name)
+        if not entries:
+            continue
+        page = entries[offset:offset + limit]
+        result.append(f"\n{_TITLES[name]} ({len(entries)}):")
+        for entry in page:
+            result.append(f"  {entry}")
+        remaining = len(entries) - offset - len(page)
+        if remaining > 0:
+            result.append(f"  ... {remaining} weitere (offset={offset + len(page)})")
+
+    return "\n".join(result)
@@ -0,0 +1,476 @@
+"""Metadaten-Index der Dokumentation (Ausgabe).
+
+Hält für jede Doku-Datei unter `<docs_root>/<typ>s/` Name, Typ, Größe,
+mtime, die Felder des YAML-Front-Matters, die Ziele der Wiki-Links
+(`[[Modul::Name]]`) und (bei Modul-Dokus) den Hash des Modul-Quelltexts
+zum Zeitpunkt des Schreibens. Die Rückverweise werden daraus im Speicher
+abgeleitet, ohne eine Datei zu lesen. write_doc/delete_doc
+pflegen den Index direkt; Änderungen von außen (z.B. durch Obsidian)
+werden beim Abgleich per os.scandir über mtime und Größe jeder Datei
+erkannt, gelesen werden nur neue und geänderte Dateien. Über get_doc_index
+wird höchstens einmal pro REVALIDATE_INTERVAL abgeglichen. Der Stand liegt
+in einer SQLite-Datenbank unter `<docs_root>/.index/docs.db`, eine Zeile
+pro Datei; Änderungen schreiben nur die betroffenen Zeilen. Eine ältere
+`docs.json` wird beim ersten Öffnen übernommen und gelöscht.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+from .persist import load_json
+
+SCHEMA_VERSION = 1
+
+# Version der früheren docs.json, die beim ersten Öffnen übernommen wird
+LEGACY_INDEX_VERSION = 2
+
+# Mindestabstand (Sekunden) zwischen zwei Abgleichen über get_doc_index
+REVALIDATE_INTERVAL = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS docs (
+    key TEXT PRIMARY KEY,
+    entry TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+SORT_ORDERS = ("name", "mtime")
+
+# [[Ziel]], [[Ziel#Abschnitt]], [[Ziel|Alias]], auch als Einbettung ![[...]]
+_LINK_RE = re.compile(r"\[\[([^\[\]|#\n]*)(?:#[^\[\]|\n]*)?(?:\|[^\[\]\n]*)?\]\]")
+
+
+def parse_front_matter(content: str) -> dict:
+    """Liest das YAML-Front-Matter (--- ... ---) am Dateianfang.
+
+    Returns:
+        Felder als dict, leer ohne (gültiges) Front-Matter
+    """
+    if not content.startswith("---"):
+        return {}
+    lines = content.split("\n")
+    if lines[0].rstrip() != "---":
+        return {}
+    for i, line in enumerate(lines[1:], start=1):
+        if line.rstrip() in ("---", "..."):
+            try:
+                data = yaml.safe_load("\n".join(lines[1:i]))
+            except yaml.YAMLError:
+                return {}
+            if not isinstance(data, dict):
+                return {}
+            return _json_value(data)
+    return {}
+
+
+def _json_value(value):
+    """Macht YAML-Werte JSON-tauglich (Datumsangaben etc. als Text, auch verschachtelt)."""
+    if isinstance(value, dict):
+        return {str(k): _json_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_json_value(v) for v in value]
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    return str(value)
+
+
+def parse_links(content: str) -> list[str]:
+    """Ziele aller Wiki-Links (ohne Abschnitt/Alias, ohne Duplikate)."""
+    targets = []
+    for match in _LINK_RE.finditer(content):
+        target = match.group(1).strip()
+        if target and target not in targets:
+            targets.append(target)
+    return targets
+
+
+def link_key(target: str) -> str:
+    """Vergleichsschlüssel eines Link-Ziels oder Dateinamens.
+
+    Wie in Obsidian zählt nur der Dateiname (ohne Pfad und .md, ohne
+    Groß/Klein); `::` wird wie beim Schreiben zu `_`.
+    """
+    target = target.strip()
+    if target.lower().endswith(".md"):
+        target = target[:-3]
+    target = target.rsplit("/", 1)[-1]
+    return target.replace("::", "_").replace("\\", "_").casefold()
+
+
+@dataclass
+class DocEntry:
+    """Metadaten einer Doku-Datei."""
+
+    doc_type: str
+    name: str
+    size: int
+    mtime_ns: int
+    meta: dict
+    source_hash: Optional[str] = None
+    links: list[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        """Eindeutiger Schlüssel 'typ/name'."""
+        return f"{self.doc_type}/{self.name}"
+
+
+class DocIndex:
+    """Index aller Doku-Dateien eines docs_root."""
+
+    def __init__(self, docs_root: Path, doc_types: list[str], db_file: Path):
+        self.docs_root = docs_root
+        self.doc_types = list(doc_types)
+        self.db_file = db_file
+        self._entries: dict[str, DocEntry] = {}
+        self._sorted: dict[str, list[tuple]] = {}
+        # Link-Schlüssel -> verweisende Einträge (None = neu aufbauen)
+        self._backlinks: Optional[dict[str, list[tuple[DocEntry, str]]]] = None
+        # Seit dem letzten Speichern geänderte oder entfernte Schlüssel
+        self._dirty: set[str] = set()
+        # Zählt jede Änderung, damit abgeleitete Indizes erkennen, ob sie
+        # sich neu abgleichen müssen
+        self.generation = 0
+        self._checked = float("-inf")
+        self._lock = threading.Lock()
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._load()
+
+    def close(self) -> None:
+        """Schließt die Datenbank."""
+        with self._lock:
+            self._db.close()
+
+    def folder(self, doc_type: str) -> Path:
+        """Ordner eines Doku-Typs."""
+        return self.docs_root / f"{doc_type}s"
+
+    def _load(self) -> None:
+        db = self._db
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            db.executescript("DROP TABLE IF EXISTS meta; DROP TABLE IF EXISTS docs;")
+            db.executescript(_SCHEMA)
+            db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            db.commit()
+        row = db.execute("SELECT value FROM meta WHERE key = 'docs_root'").fetchone()
+        if row is None or row[0] != str(self.docs_root):
+            # Neu oder verschobener docs_root: Einträge passen nicht mehr
+            with db:
+                db.execute("DELETE FROM docs")
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('docs_root', ?)",
+                           (str(self.docs_root),))
+            self._migrate_json()
+            return
+        self._entries = {
+            key: DocEntry(**json.loads(entry))
+            for key, entry in db.execute("SELECT key, entry FROM docs")
+        }
+
+    def _migrate_json(self) -> None:
+        """Übernimmt eine vorhandene docs.json (samt Quell-Hashes) einmalig."""
+        legacy = self.db_file.with_name("docs.json")
+        data = load_json(legacy, {})
+        if (
+            data.get("version") == LEGACY_INDEX_VERSION
+            and data.get("docs_root") == str(self.docs_root)
+        ):
+            self._entries = {
+                key: DocEntry(**entry) for key, entry in data.get("docs", {}).items()
+            }
+            self._dirty.update(self._entries)
+            self._save()
+        try:
+            legacy.unlink()
+        except OSError:
+            pass
+
+    def _save(self) -> None:
+        """Schreibt nur die geänderten Einträge."""
+        dirty, self._dirty = self._dirty, set()
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO docs (key, entry) VALUES (?, ?)",
+                ((key, json.dumps(vars(self._entries[key]), separators=(",", ":")))
+                 for key in dirty if key in self._entries),
+            )
+            self._db.executemany(
+                "DELETE FROM docs WHERE key = ?",
+                ((key,) for key in dirty if key not in self._entries),
+            )
+
+    def _scan_folder(self, doc_type: str) -> bool:
+        """Gleicht einen Ordner ab; unveränderte Dateien werden nicht gelesen.
+
+        Returns:
+            True wenn sich Einträge geändert haben
+        """
+        changed = False
+        prefix = f"{doc_type}/"
+        known = {k: e for k, e in self._entries.items() if k.startswith(prefix)}
+        found = set()
+        try:
+            with os.scandir(self.folder(doc_type)) as it:
+                for item in it:
+                    if not item.name.endswith(".md") or item.name.startswith("."):
+                        continue
+                    try:
+                        st = item.stat()
+                    except OSError:
+                        continue
+                    key = prefix + item.name[:-3]
+                    found.add(key)
+                    entry = known.get(key)
+                    if entry and (entry.mtime_ns, entry.size) == (st.st_mtime_ns, st.st_size):
+                        continue
+                    try:
+                        content = Path(item.path).read_text(encoding="utf-8", errors="replace")
+                    except OSError:
+                        continue
+                    self._entries[key] = DocEntry(
+                        doc_type, item.name[:-3], st.st_size, st.st_mtime_ns,
+                        parse_front_matter(content),
+                        entry.source_hash if entry else None,
+                        parse_links(content),
+                    )
+                    self._dirty.add(key)
+                    changed = True
+        except OSError:
+            pass
+        for key in known.keys() - found:
+            del self._entries[key]
+            self._dirty.add(key)
+            changed = True
+        return changed
+
+    def refresh(self, max_age: float = 0.0) -> bool:
+        """Gleicht alle Typ-Ordner ab (auch direkt bearbeitete Dateien).
+
+        Ordner-mtimes reichen nicht: Editoren speichern meist in die
+        bestehende Datei, das ändert nur deren mtime.
+
+        Args:
+            max_age: Abgleich überspringen, wenn der letzte höchstens so
+                viele Sekunden zurückliegt
+
+        Returns:
+            True wenn sich der Index geändert hat
+        """
+        if max_age > 0 and time.monotonic() - self._checked < max_age:
+            return False
+        with self._lock:
+            if max_age > 0 and time.monotonic() - self._checked < max_age:
+                return False  # anderer Thread hat inzwischen abgeglichen
+            self._checked = time.monotonic()
+            changed = False
+            for doc_type in self.doc_types:
+                changed |= self._scan_folder(doc_type)
+            if changed:
+                self._sorted.clear()
+                self._backlinks = None
+                self.generation += 1
+                self._save()
+            return changed
+
+    def put(self, doc_type: str, name: str, path: Path, content: str,
+            source_hash: Optional[str] = None) -> DocEntry:
+        """Trägt eine gerade geschriebene Datei ein."""
+        return self.put_many([(doc_type, name, path, content, source_hash)])[0]
+
+    def put_many(self, docs: list[tuple[str, str, Path, str, Optional[str]]]) -> list[DocEntry]:
+        """Trägt mehrere geschriebene Dateien ein und speichert nur einmal.
+
+        Args:
+            docs: (Typ, Name, Pfad, Inhalt, Quell-Hash)
+        """
+        entries = []
+        for doc_type, name, path, content, source_hash in docs:
+            st = os.stat(path)
+            entries.append(DocEntry(doc_type, name, st.st_size, st.st_mtime_ns,
+                                    parse_front_matter(content), source_hash,
+                                    parse_links(content)))
+        with self._lock:
+            for entry in entries:
+                self._entries[entry.key] = entry
+                self._dirty.add(entry.key)
+            self._touch()
+        return entries
+
+    def remove(self, doc_type: str, name: str) -> None:
+        """Entfernt eine gelöschte Datei."""
+        key = f"{doc_type}/{name}"
+        with self._lock:
+            self._entries.pop(key, None)
+            self._dirty.add(key)
+            self._touch()
+
+    def _touch(self) -> None:
+        self._sorted.clear()
+        self._backlinks = None
+        self.generation += 1
+        self._save()
+
+    def get(self, doc_type: str, name: str) -> Optional[DocEntry]:
+        """Eintrag einer Datei oder None."""
+        return self._entries.get(f"{doc_type}/{name}")
+
+    def entries(self, doc_type: str = "") -> list[DocEntry]:
+        """Alle Einträge (optional eines Typs), sortiert nach Typ und Name."""
+        return [entry for _, entry in self._sorted_items("name")
+                if not doc_type or entry.doc_type == doc_type]
+
+    def _backlink_map(self) -> dict[str, list[tuple[DocEntry, str]]]:
+        with self._lock:
+            if self._backlinks is None:
+                backlinks: dict[str, list[tuple[DocEntry, str]]] = {}
+                for entry in self._entries.values():
+                    for target in entry.links:
+                        backlinks.setdefault(link_key(target), []).append((entry, target))
+                self._backlinks = backlinks
+            return self._backlinks
+
+    def backlinks(self, name: str) -> list[tuple[DocEntry, str]]:
+        """Dokumente, die auf eine Datei verweisen.
+
+        Args:
+            name: Dateiname (ohne .md) oder Link-Ziel
+
+        Returns:
+            (verweisender Eintrag, Link-Ziel wie geschrieben), sortiert
+        """
+        found = self._backlink_map().get(link_key(name), [])
+        return sorted(found, key=lambda item: self._sort_key(item[0], "name"))
+
+    def broken_links(self, doc_type: str = "") -> list[tuple[DocEntry, str]]:
+        """Links, zu denen es keine Doku-Datei gibt.
+
+        Args:
+            doc_type: Nur Links aus Dokumenten dieses Typs, leer = alle
+
+        Returns:
+            (verweisender Eintrag, Link-Ziel wie geschrieben), sortiert
+        """
+        with self._lock:
+            existing = {link_key(entry.name) for entry in self._entries.values()}
+        return [(entry, target) for entry in self.entries(doc_type)
+                for target in entry.links if link_key(target) not in existing]
+
+    def _sort_key(self, entry: DocEntry, sort: str) -> tuple:
+        try:
+            type_rank = self.doc_types.index(entry.doc_type)
+        except ValueError:
+            type_rank = len(self.doc_types)
+        if sort == "mtime":
+            return (-entry.mtime_ns, type_rank, entry.name)
+        return (type_rank, entry.name)
+
+    def _sorted_items(self, sort: str) -> list[tuple[tuple, DocEntry]]:
+        with self._lock:
+            items = self._sorted.get(sort)
+            if items is None:
+                items = sorted(((self._sort_key(e, sort), e) for e in self._entries.values()),
+                               key=lambda item: item[0])
+                self._sorted[sort] = items
+            return items
+
+    def cursor_for(self, entry: DocEntry, sort: str = "name") -> str:
+        """Cursor, der hinter diesem Eintrag fortsetzt."""
+        if sort == "mtime":
+            return f"{entry.mtime_ns}|{entry.key}"
+        return entry.key
+
+    def _decode_cursor(self, cursor: str, sort: str) -> Optional[tuple]:
+        try:
+            if sort == "mtime":
+                mtime, key = cursor.split("|", 1)
+                doc_type, name = key.split("/", 1)
+                entry = DocEntry(doc_type, name, 0, int(mtime), {})
+            else:
+                doc_type, name = cursor.split("/", 1)
+                entry = DocEntry(doc_type, name, 0, 0, {})
+        except ValueError:
+            return None
+        return self._sort_key(entry, sort)
+
+    def page(self, doc_type: str = "", pattern: str = "", cursor: str = "",
+             limit: int = 30, sort: str = "name") -> tuple[list[DocEntry], int, int]:
+        """Eine Seite gefilterter, sortierter Einträge.
+
+        Args:
+            doc_type: Nur dieser Typ, leer = alle
+            pattern: Teilstring im Namen (ohne Groß/Klein)
+            cursor: Fortsetzung hinter diesem Cursor (aus dem vorigen Aufruf)
+            limit: Einträge pro Seite
+            sort: 'name' (Typ, Name) oder 'mtime' (neueste zuerst)
+
+        Returns:
+            (Einträge, Anzahl aller Treffer, Anzahl Treffer nach dieser Seite)
+
+        Raises:
+            ValueError: Bei ungültigem Cursor
+        """
+        items = self._sorted_items(sort)
+        needle = pattern.lower()
+
+        def matches(entry: DocEntry) -> bool:
+            return ((not doc_type or entry.doc_type == doc_type)
+                    and (not needle or needle in entry.name.lower()))
+
+        start = 0
+        if cursor:
+            position = self._decode_cursor(cursor, sort)
+            if position is None:
+                raise ValueError(f"Ungültiger Cursor: {cursor}")
+            start = bisect_right(items, position, key=lambda item: item[0])
+
+        total = 0
+        page = []
+        for i, (_, entry) in enumerate(items):
+            if not matches(entry):
+                continue
+            total += 1
+            if i >= start and len(page) < limit:
+                page.append(entry)
+        remaining = sum(1 for _, e in items[start:] if matches(e)) - len(page)
+        return page, total, remaining
+
+
+_INDEXES: dict[tuple, DocIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_doc_index(config, refresh: bool = True) -> DocIndex:
+    """Liefert den (prozessweit geteilten) Doku-Index für eine Konfiguration.
+
+    Args:
+        config: Konfiguration
+        refresh: Vorher mit den Typ-Ordnern abgleichen (höchstens einmal
+            pro REVALIDATE_INTERVAL)
+    """
+    key = (str(config.docs_root), tuple(config.doc_types), str(config.index_dir))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = DocIndex(config.docs_root, config.doc_types, config.index_dir / "docs.db")
+            _INDEXES[key] = index
+    if refresh:
+        index.refresh(max_age=REVALIDATE_INTERVAL)
+    return index
@@ -0,0 +1,261 @@
+"""Volltextsuche in der Dokumentation (Ausgabe).
+
+Invertierter Index über alle Doku-Dateien mit BM25-Ranking, abgelegt in
+einer SQLite-Datenbank unter `<docs_root>/.index/doc_search.db`: pro
+Dokument Länge und Stand (mtime, Größe), pro Term die Dokumente mit
+Häufigkeit. write_doc/delete_doc aktualisieren den Index direkt; von
+außen geänderte Dateien werden beim nächsten Suchen über den Doku-Index
+(docindex.py) erkannt und einzeln neu indiziert. Für die Schnipsel werden
+nur die Dateien der besten Treffer gelesen.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .docindex import DocEntry, DocIndex, get_doc_index
+
+SCHEMA_VERSION = 1
+
+# BM25-Parameter
+K1 = 1.2
+B = 0.75
+
+SNIPPET_WIDTH = 160
+
+# Unterstrich trennt wie ::, damit Order_Base (Dateiname) auch "order" trifft
+_TOKEN_RE = re.compile(r"[^\W_]{2,}")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    doc_type TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+"""
+
+
+def tokenize(text: str) -> list[str]:
+    """Zerlegt Text in kleingeschriebene Wörter (mind. 2 Zeichen, ohne _)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class DocHit:
+    """Ein Suchtreffer."""
+
+    key: str
+    score: float
+    line: int = 0
+    snippet: str = ""
+
+
+class DocSearchIndex:
+    """Persistenter BM25-Index über die Dokumentation."""
+
+    def __init__(self, docs_root: Path, db_file: Path):
+        self.docs_root = docs_root
+        self.db_file = db_file
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._generation: Optional[int] = None
+        self._db = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._db.executescript(
+                "DROP TABLE IF EXISTS docs; DROP TABLE IF EXISTS postings;"
+            )
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._db.commit()
+
+    def close(self) -> None:
+        """Schließt die Datenbank."""
+        with self._lock:
+            self._db.close()
+
+    def _path(self, entry: DocEntry) -> Path:
+        return self.docs_root / f"{entry.doc_type}s" / f"{entry.name}.md"
+
+    def _remove(self, key: str) -> None:
+        row = self._db.execute("SELECT id FROM docs WHERE key = ?", (key,)).fetchone()
+        if row:
+            self._db.execute("DELETE FROM postings WHERE doc_id = ?", (row[0],))
+            self._db.execute("DELETE FROM docs WHERE id = ?", (row[0],))
+
+    def _insert(self, entry: DocEntry, content: str) -> None:
+        # Der Name zählt mit, damit 'Order::Base' auch ohne Nennung im Text trifft
+        terms = Counter(tokenize(entry.name) + tokenize(content))
+        cur = self._db.execute(
+            "INSERT INTO docs (key, doc_type, length, mtime_ns, size) VALUES (?, ?, ?, ?, ?)",
+            (entry.key, entry.doc_type, sum(terms.values()), entry.mtime_ns, entry.size),
+        )
+        self._db.executemany(
+            "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+            ((term, cur.lastrowid, tf) for term, tf in terms.items()),
+        )
+
+    def put(self, entry: DocEntry, content: str, generation: Optional[int] = None) -> None:
+        """Indiziert ein gerade geschriebenes Dokument.
+
+        Args:
+            entry: Eintrag aus dem Doku-Index
+            content: Inhalt der Datei
+            generation: Stand des Doku-Index nach dem Eintragen. War der
+                Suchindex direkt davor abgeglichen, bleibt er es.
+        """
+        self.put_many([(entry, content)], generation)
+
+    def put_many(self, docs: list[tuple[DocEntry, str]], generation: Optional[int] = None) -> None:
+        """Indiziert mehrere Dokumente in einer Transaktion (generation wie bei put)."""
+        with self._lock, self._db:
+            for entry, content in docs:
+                self._remove(entry.key)
+                self._insert(entry, content)
+            self._advance(generation)
+
+    def remove(self, doc_type: str, name: str, generation: Optional[int] = None) -> None:
+        """Entfernt ein gelöschtes Dokument (generation wie bei put)."""
+        with self._lock, self._db:
+            self._remove(f"{doc_type}/{name}")
+            self._advance(generation)
+
+    def _advance(self, generation: Optional[int]) -> None:
+        # Nur die eigene Änderung dazwischen: kein erneuter Abgleich nötig
+        if generation is not None and self._generation == generation - 1:
+            self._generation = generation
+
+    def sync(self, doc_index: DocIndex) -> int:
+        """Gleicht den Index mit dem Doku-Index ab (nur nach dessen Änderungen).
+
+        Returns:
+            Anzahl neu indizierter oder entfernter Dokumente
+        """
+        with self._lock:
+            if self._generation == doc_index.generation:
+                return 0
+            generation = doc_index.generation
+            entries = {entry.key: entry for entry in doc_index.entries()}
+            known = {
+                key: (mtime, size)
+                for key, mtime, size in self._db.execute("SELECT key, mtime_ns, size FROM docs")
+            }
+            updates = 0
+            with self._db:
+                for key in known.keys() - entries.keys():
+                    self._remove(key)
+                    updates += 1
+                for key, entry in entries.items():
+                    if known.get(key) == (entry.mtime_ns, entry.size):
+                        continue
+                    try:
+                        content = self._path(entry).read_text(encoding="utf-8", errors="replace")
+                    except OSError:
+                        continue
+                    self._remove(key)
+                    self._insert(entry, content)
+                    updates += 1
+            self._generation = generation
+            return updates
+
+    def search(self, query: str, doc_type: str = "", limit: int = 10) -> tuple[list[DocHit], int]:
+        """Sucht Dokumente nach BM25.
+
+        Args:
+            query: Suchbegriffe
+            doc_type: Nur dieser Typ, leer = alle
+            limit: Maximale Anzahl Treffer
+
+        Returns:
+            (beste Treffer absteigend nach Score, Anzahl aller Treffer)
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return [], 0
+        with self._lock:
+            count, total_length = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs"
+            ).fetchone()
+            if not count:
+                return [], 0
+            avgdl = total_length / count
+            scores: dict[str, float] = {}
+            for term in terms:
+                rows = self._db.execute(
+                    "SELECT d.key, d.doc_type, d.length, p.tf FROM postings p "
+                    "JOIN docs d ON d.id = p.doc_id WHERE p.term = ?",
+                    (term,),
+                ).fetchall()
+                if not rows:
+                    continue
+                idf = math.log(1 + (count - len(rows) + 0.5) / (len(rows) + 0.5))
+                for key, dtype, length, tf in rows:
+                    if doc_type and dtype != doc_type:
+                        continue
+                    norm = tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avgdl))
+                    scores[key] = scores.get(key, 0.0) + idf * norm
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        hits = [DocHit(key, score) for key, score in best]
+        for hit in hits:
+            self._add_snippet(hit, terms)
+        return hits, len(scores)
+
+    def _add_snippet(self, hit: DocHit, terms: list[str]) -> None:
+        """Zeile mit den meisten Suchbegriffen als Schnipsel."""
+        doc_type, name = hit.key.split("/", 1)
+        path = self.docs_root / f"{doc_type}s" / f"{name}.md"
+        try:
+            lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            return
+        wanted = set(terms)
+        best_count = 0
+        for lineno, line in enumerate(lines, start=1):
+            found = len(wanted.intersection(tokenize(line)))
+            if found > best_count:
+                best_count = found
+                hit.line = lineno
+                hit.snippet = line.strip()
+        if len(hit.snippet) > SNIPPET_WIDTH:
+            hit.snippet = hit.snippet[:SNIPPET_WIDTH - 3] + "..."
+
+
+_INDEXES: dict[tuple, DocSearchIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_doc_search(config, refresh: bool = True) -> DocSearchIndex:
+    """Liefert den (prozessweit geteilten) Suchindex der Dokumentation.
+
+    Args:
+        config: Konfiguration
+        refresh: Vorher mit dem Doku-Index abgleichen
+    """
+    key = (str(config.docs_root), str(config.index_dir))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = DocSearchIndex(config.docs_root, config.index_dir / "doc_search.db")
+            _INDEXES[key] = index
+    if refresh:
+        index.sync(get_doc_index(config))
+    return index
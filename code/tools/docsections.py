@@ -0,0 +1,142 @@
+"""Abschnitte von Doku-Dateien (Ausgabe).
+
+Zerlegt Markdown anhand der Überschriften (`#` bis `######`, nicht in
+Code-Blöcken oder im Front-Matter) in Abschnitte mit Zeichen-Offsets. Ein
+Abschnitt reicht bis zur nächsten Überschrift gleicher oder höherer
+Ebene, umfasst also seine Unterabschnitte. Die Offsets werden pro Datei
+gecacht und über die stat-Signatur validiert, so dass patch_doc & Co.
+eine Datei nur lesen, aber nicht erneut zerlegen müssen.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from .cache import stat_signature
+
+_HEADING_RE = re.compile(r"(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
+_FENCE_RE = re.compile(r"(`{3,}|~{3,})")
+
+MAX_CACHED_FILES = 256
+
+
+@dataclass(frozen=True)
+class Section:
+    """Ein Abschnitt: Überschrift und Offsets im Dateiinhalt."""
+
+    level: int
+    title: str
+    line: int
+    start: int       # Anfang der Überschriftszeile
+    body_start: int  # erstes Zeichen nach der Überschriftszeile
+    end: int         # Anfang der nächsten Überschrift gleicher/höherer Ebene
+
+
+def normalize_heading(heading: str) -> str:
+    """Vergleichsform einer Überschrift (ohne #, Backticks, Groß/Klein)."""
+    return heading.strip().lstrip("#").replace("`", "").strip().casefold()
+
+
+def parse_sections(content: str) -> list[Section]:
+    """Alle Abschnitte in Dokument-Reihenfolge."""
+    found: list[tuple[int, str, int, int, int]] = []
+    fence = ""
+    offset = 0
+    lines = content.splitlines(keepends=True)
+    in_front_matter = bool(lines) and lines[0].rstrip() == "---"
+    for lineno, line in enumerate(lines, start=1):
+        start, offset = offset, offset + len(line)
+        text = line.rstrip("\r\n")
+        if in_front_matter:
+            if lineno > 1 and text.rstrip() in ("---", "..."):
+                in_front_matter = False
+            continue
+        stripped = text.lstrip()
+        fence_match = _FENCE_RE.match(stripped)
+        if fence_match:
+            marker = fence_match.group(1)
+            if not fence:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = ""
+            continue
+        if fence or len(text) - len(stripped) > 3:
+            continue
+        match = _HEADING_RE.match(stripped)
+        if match:
+            found.append((len(match.group(1)), match.group(2), lineno, start, offset))
+
+    sections = []
+    for i, (level, title, lineno, start, body_start) in enumerate(found):
+        end = len(content)
+        for other in found[i + 1:]:
+            if other[0] <= level:
+                end = other[3]
+                break
+        sections.append(Section(level, title, lineno, start, body_start, end))
+    return sections
+
+
+def find_section(sections: list[Section], heading: str) -> Section:
+    """Sucht einen Abschnitt nach Überschrift.
+
+    Args:
+        sections: Ergebnis von parse_sections
+        heading: Titel, optional mit führenden # (dann nur diese Ebene)
+
+    Raises:
+        LookupError: Wenn kein oder mehr als ein Abschnitt passt
+    """
+    stripped = heading.strip()
+    level = len(stripped) - len(stripped.lstrip("#"))
+    wanted = normalize_heading(stripped)
+    matches = [s for s in sections
+               if normalize_heading(s.title) == wanted and (not level or s.level == level)]
+    if not matches:
+        raise LookupError(f"Abschnitt nicht gefunden: {heading}")
+    if len(matches) > 1:
+        lines = ", ".join(str(s.line) for s in matches)
+        raise LookupError(f"Abschnitt '{heading}' ist mehrdeutig (Zeilen {lines})")
+    return matches[0]
+
+
+_CACHE: OrderedDict[str, tuple[tuple[int, int, int], list[Section]]] = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def read_sections(path: Path) -> tuple[str, list[Section]]:
+    """Liest eine Doku-Datei samt Abschnitten (Abschnitte aus dem Cache).
+
+    Raises:
+        OSError: Wenn die Datei nicht gelesen werden kann
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        signature = stat_signature(os.fstat(f.fileno()))
+        content = f.read()
+    key = str(path)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+        if cached and cached[0] == signature:
+            _CACHE.move_to_end(key)
+            return content, cached[1]
+    sections = parse_sections(content)
+    remember(path, sections)
+    return content, sections
+
+
+def remember(path: Path, sections: list[Section]) -> None:
+    """Legt die Abschnitte einer gerade geschriebenen Datei im Cache ab."""
+    try:
+        signature = stat_signature(os.stat(path))
+    except OSError:
+        return
+    key = str(path)
+    with _CACHE_LOCK:
+        _CACHE[key] = (signature, sections)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > MAX_CACHED_FILES:
+            _CACHE.popitem(last=False)
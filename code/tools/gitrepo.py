@@ -0,0 +1,127 @@
+"""Blob-Hashes aus einem git-Checkout (Verarbeitung).
+
+Liegt lib in einem git-Repository, kennt git die Blob-SHAs aller
+versionierten Dateien bereits: `git ls-files -s` liefert sie aus dem
+Index, ein einziges `git diff --name-only` (nutzt git's stat-Cache) nennt
+die Dateien, deren Arbeitskopie davon abweicht. Nur diese sowie
+unversionierte Dateien werden per `git hash-object --stdin-paths`
+gehasht. Ohne git (oder außerhalb eines Repositories) wird der Blob-Hash
+in Python berechnet; er ist identisch, solange keine git-Filter
+(z.B. Zeilenende-Konvertierung) greifen.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional
+
+_ROOTS: dict[str, Optional[Path]] = {}
+_ROOTS_LOCK = threading.Lock()
+
+
+def _git(root: Path, *args: str, stdin: Optional[str] = None) -> Optional[str]:
+    """Führt git im Repository aus, None bei Fehlern."""
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(root), *args],
+            input=stdin,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout
+
+
+def repo_root(path: Path) -> Optional[Path]:
+    """Wurzel des git-Repositories, in dem `path` liegt (gecacht).
+
+    Returns:
+        Pfad oder None außerhalb eines Repositories bzw. ohne git
+    """
+    key = str(path)
+    with _ROOTS_LOCK:
+        if key in _ROOTS:
+            return _ROOTS[key]
+    root = None
+    if path.is_dir():
+        out = _git(path, "rev-parse", "--show-toplevel")
+        if out and out.strip():
+            root = Path(out.strip()).resolve()
+    with _ROOTS_LOCK:
+        _ROOTS[key] = root
+    return root
+
+
+def blob_hash(path: Path) -> Optional[str]:
+    """git-Blob-SHA einer Datei, in Python berechnet (ohne git-Filter)."""
+    try:
+        size = os.path.getsize(path)
+        digest = hashlib.sha1(f"blob {size}\0".encode())
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def blob_hashes(root: Path, scope: Path, paths: list[Path],
+                trust_index: bool = True) -> Optional[dict[Path, str]]:
+    """Aktuelle Blob-SHAs mehrerer Dateien unterhalb von `scope`.
+
+    Args:
+        root: Wurzel des Repositories (siehe repo_root)
+        scope: Verzeichnis, auf das sich ls-files/diff beschränken (lib)
+        paths: Dateien
+        trust_index: SHAs aus dem Index übernehmen, wenn git die Datei
+            als unverändert meldet. False hasht alle Dateien neu.
+
+    Returns:
+        Pfad -> SHA (fehlende Dateien fehlen), None wenn git scheitert
+    """
+    if not paths:
+        return {}
+    rels = {path: os.path.relpath(path.resolve(), root) for path in paths}
+    scope_rel = os.path.relpath(scope.resolve(), root)
+
+    index: dict[str, str] = {}
+    if trust_index:
+        out = _git(root, "ls-files", "-s", "-z", "--", scope_rel)
+        if out is None:
+            return None
+        for entry in out.split("\0"):
+            if "\t" not in entry:
+                continue
+            meta, rel = entry.split("\t", 1)
+            parts = meta.split()
+            if len(parts) == 3 and parts[2] == "0":
+                index[rel] = parts[1]
+        if index:
+            out = _git(root, "diff", "--name-only", "-z", "--", scope_rel)
+            if out is None:
+                return None
+            for rel in out.split("\0"):
+                index.pop(rel, None)
+
+    result: dict[Path, str] = {}
+    to_hash = []
+    for path, rel in rels.items():
+        sha = index.get(rel)
+        if sha is not None:
+            result[path] = sha
+        elif path.is_file() and "\n" not in rel:
+            to_hash.append(path)
+
+    if to_hash:
+        out = _git(root, "hash-object", "--stdin-paths",
+                   stdin="".join(f"{rels[path]}\n" for path in to_hash))
+        if out is None:
+            return None
+        for path, sha in zip(to_hash, out.split()):
+            result[path] = sha
+    return result
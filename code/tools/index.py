@@ -0,0 +1,198 @@
+"""Persistenter Modul-Index (Eingabe).
+
+Hält die Liste aller Module unter lib_path vor, damit find_modules nicht
+bei jedem Aufruf den ganzen Baum per rglob durchlaufen muss.
+
+Gespeichert wird pro Verzeichnis dessen mtime sowie die enthaltenen
+Modul-Dateien und Unterverzeichnisse. Beim Aktualisieren wird nur jedes
+Verzeichnis per stat() geprüft; neu eingelesen werden ausschließlich
+Verzeichnisse, deren mtime sich geändert hat. Für die Suche wird aus der
+sortierten Namensliste ein Trigramm-Index aufgebaut.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .persist import load_json, write_json_atomic
+
+INDEX_VERSION = 1
+
+
+def _trigrams(text: str) -> set[str]:
+    """Alle Trigramme eines (kleingeschriebenen) Textes."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ModuleIndex:
+    """Index aller Modulnamen eines lib-Verzeichnisses."""
+
+    def __init__(self, lib_path: Path, extension: str, separator: str, index_file: Path):
+        self.lib_path = lib_path
+        self.extension = extension
+        self.separator = separator
+        self.index_file = index_file
+        # relativer Verzeichnispfad ("" = lib) -> {"mtime", "files", "dirs"}
+        self._dirs: dict[str, dict] = {}
+        self._names: list[str] = []
+        self._name_set: set[str] = set()
+        self._lower: list[str] = []
+        self._trigram_map: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Lädt den gespeicherten Verzeichnis-Stand (falls passend)."""
+        data = load_json(self.index_file, {})
+        if (
+            data.get("version") == INDEX_VERSION
+            and data.get("lib_path") == str(self.lib_path)
+            and data.get("extension") == self.extension
+        ):
+            self._dirs = data.get("dirs", {})
+            self._rebuild()
+
+    def _save(self) -> None:
+        write_json_atomic(self.index_file, {
+            "version": INDEX_VERSION,
+            "lib_path": str(self.lib_path),
+            "extension": self.extension,
+            "dirs": self._dirs,
+        })
+
+    def _scan_dir(self, rel: str, mtime: int) -> dict:
+        """Liest ein einzelnes Verzeichnis ein (nicht rekursiv)."""
+        files = []
+        dirs = []
+        path = self.lib_path / rel if rel else self.lib_path
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    elif entry.name.endswith(self.extension) and entry.is_file():
+                        files.append(entry.name[:-len(self.extension)])
+                except OSError:
+                    continue
+        return {"mtime": mtime, "files": sorted(files), "dirs": sorted(dirs)}
+
+    def refresh(self) -> bool:
+        """Aktualisiert den Index anhand der Verzeichnis-mtimes.
+
+        Returns:
+            True wenn sich der Index geändert hat
+        """
+        with self._lock:
+            old = self._dirs
+            new: dict[str, dict] = {}
+            changed = False
+            stack = [""]
+            while stack:
+                rel = stack.pop()
+                path = self.lib_path / rel if rel else self.lib_path
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    changed = True
+                    continue
+                entry = old.get(rel)
+                if entry is None or entry["mtime"] != mtime:
+                    try:
+                        entry = self._scan_dir(rel, mtime)
+                    except OSError:
+                        changed = True
+                        continue
+                    changed = True
+                new[rel] = entry
+                for d in entry["dirs"]:
+                    stack.append(f"{rel}/{d}" if rel else d)
+            if len(new) != len(old):
+                changed = True
+            if changed:
+                self._dirs = new
+                self._rebuild()
+                self._save()
+            return changed
+
+    def _rebuild(self) -> None:
+        """Baut Namensliste und Trigramm-Index aus dem Verzeichnis-Stand."""
+        sep = self.separator
+        names = []
+        for rel, entry in self._dirs.items():
+            prefix = rel.replace("/", sep) + sep if rel else ""
+            names.extend(prefix + f for f in entry["files"])
+        names.sort()
+        lower = [n.lower() for n in names]
+        trigram_map: dict[str, list[int]] = {}
+        for i, name in enumerate(lower):
+            for tri in _trigrams(name):
+                trigram_map.setdefault(tri, []).append(i)
+        self._names = names
+        self._name_set = set(names)
+        self._lower = lower
+        self._trigram_map = trigram_map
+
+    @property
+    def names(self) -> list[str]:
+        """Alle Modulnamen, sortiert."""
+        return self._names
+
+    def __contains__(self, module_name: str) -> bool:
+        return module_name in self._name_set
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def search(self, pattern: str) -> list[str]:
+        """Findet alle Module, deren Name das Muster enthält (ohne Groß/Klein).
+
+        Pfad-Schreibweise ('Order/Valid') und Dateiendung werden akzeptiert.
+        """
+        query = pattern.lower()
+        if query.endswith(self.extension.lower()):
+            query = query[:-len(self.extension)]
+        query = query.replace("/", self.separator)
+        lower = self._lower
+
+        if len(query) < 3:
+            return [self._names[i] for i, n in enumerate(lower) if query in n]
+
+        candidates: Optional[set[int]] = None
+        for tri in sorted(_trigrams(query), key=lambda t: len(self._trigram_map.get(t, ()))):
+            postings = self._trigram_map.get(tri)
+            if not postings:
+                return []
+            candidates = set(postings) if candidates is None else candidates.intersection(postings)
+            if not candidates:
+                return []
+        return [self._names[i] for i in sorted(candidates) if query in lower[i]]
+
+
+_INDEXES: dict[tuple, ModuleIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_module_index(config, refresh: bool = True) -> ModuleIndex:
+    """Liefert den (prozessweit geteilten) Modul-Index für eine Konfiguration.
+
+    Args:
+        config: Konfiguration
+        refresh: Vor der Rückgabe inkrementell aktualisieren
+    """
+    key = (str(config.lib_path), config.file_extension, config.module_separator,
+           str(config.index_dir))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = ModuleIndex(
+                config.lib_path,
+                config.file_extension,
+                config.module_separator,
+                config.index_dir / "modules.json",
+            )
+            _INDEXES[key] = index
+    if refresh:
+        index.refresh()
+    return index
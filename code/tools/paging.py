@@ -0,0 +1,149 @@
+"""Zeilenweises Lesen großer Module (Eingabe).
+
+Für jede Datei wird einmalig eine Tabelle der Byte-Offsets aller
+Zeilenanfänge per mmap erstellt und (gültig bis zur nächsten Änderung der
+stat-Signatur) zwischengespeichert. Einzelne Zeilenbereiche lassen sich
+damit direkt aus der gemappten Datei schneiden, ohne die Datei komplett
+zu lesen oder zu dekodieren.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .cache import stat_signature
+
+MAX_TABLES = 1024
+
+
+@dataclass
+class LineTable:
+    """Byte-Offsets der Zeilenanfänge einer Datei."""
+
+    signature: tuple[int, int, int]
+    offsets: array
+
+    @property
+    def size(self) -> int:
+        """Dateigröße in Bytes."""
+        return self.signature[1]
+
+    @property
+    def line_count(self) -> int:
+        """Anzahl Zeilen."""
+        return len(self.offsets)
+
+    def line_end(self, line: int) -> int:
+        """Byte-Offset hinter Zeile `line` (1-basiert)."""
+        return self.offsets[line] if line < len(self.offsets) else self.size
+
+
+@dataclass
+class Page:
+    """Ausschnitt einer Datei."""
+
+    text: str
+    start: int
+    end: int
+    total: int
+    truncated: bool = False
+
+    @property
+    def has_more(self) -> bool:
+        """Folgen weitere Zeilen nach diesem Ausschnitt?"""
+        return self.end < self.total
+
+
+def _build_table(path: Path, signature: tuple[int, int, int]) -> LineTable:
+    offsets = array("Q")
+    size = signature[1]
+    if size:
+        offsets.append(0)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = mm.find(b"\n")
+            while pos != -1 and pos + 1 < size:
+                offsets.append(pos + 1)
+                pos = mm.find(b"\n", pos + 1)
+    return LineTable(signature, offsets)
+
+
+_TABLES: OrderedDict[str, LineTable] = OrderedDict()
+_TABLES_LOCK = threading.Lock()
+
+
+def get_line_table(path: Path) -> Optional[LineTable]:
+    """Liefert die (gecachte) Zeilentabelle einer Datei.
+
+    Returns:
+        LineTable oder None wenn die Datei nicht existiert
+    """
+    key = str(path)
+    try:
+        signature = stat_signature(os.stat(path))
+    except OSError:
+        return None
+    with _TABLES_LOCK:
+        table = _TABLES.get(key)
+        if table is not None and table.signature == signature:
+            _TABLES.move_to_end(key)
+            return table
+    try:
+        table = _build_table(path, signature)
+    except (OSError, ValueError):
+        return None
+    with _TABLES_LOCK:
+        _TABLES[key] = table
+        while len(_TABLES) > MAX_TABLES:
+            _TABLES.popitem(last=False)
+    return table
+
+
+def read_lines(path: Path, start: int = 1, end: int = 0,
+               max_chars: int = 0) -> Optional[Page]:
+    """Liest einen Zeilenbereich über mmap.
+
+    Args:
+        path: Datei
+        start: Erste Zeile (1-basiert)
+        end: Letzte Zeile (inklusive), 0 = bis Dateiende
+        max_chars: Budget für den Ausschnitt (Bytes), 0 = unbegrenzt.
+            Reicht das Budget nicht, endet der Ausschnitt an der letzten
+            vollständigen Zeile; eine einzelne zu lange Zeile wird gekürzt.
+
+    Returns:
+        Page oder None wenn die Datei nicht existiert
+    """
+    table = get_line_table(path)
+    if table is None:
+        return None
+
+    total = table.line_count
+    start = max(start, 1)
+    end = total if end <= 0 else min(end, total)
+    if start > end:
+        return Page("", start, start - 1, total)
+
+    begin = table.offsets[start - 1]
+    stop = table.line_end(end)
+    truncated = False
+    if max_chars > 0 and stop - begin > max_chars:
+        # letzte Zeile, die noch vollständig ins Budget passt
+        last = bisect_right(table.offsets, begin + max_chars) - 1
+        if last >= start and table.line_end(last) - begin <= max_chars:
+            end = last
+            stop = table.line_end(last)
+        else:
+            end = start
+            stop = begin + max_chars
+            truncated = True
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[begin:stop].decode("utf-8", errors="replace")
+    return Page(text, start, end, total, truncated)
@@ -0,0 +1,147 @@
+"""Hilfsfunktionen für persistente Index-Dateien.
+
+Indizes werden als JSON unter docs_root abgelegt und wie Doku-Dateien atomar
+(Temp-Datei + rename) geschrieben, damit parallele Leser nie eine
+halb geschriebene Datei sehen.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+
+def load_json(path: Path, default: Any = None) -> Any:
+    """Lädt eine JSON-Datei, bei Fehlern oder fehlender Datei `default`."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return default
+
+
+def write_json_atomic(path: Path, data: Any, indent: Optional[int] = None) -> None:
+    """Schreibt JSON atomar über eine Temp-Datei im Zielverzeichnis.
+
+    Ohne indent kompakt, mit indent eingerückt und nach Schlüsseln sortiert.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            if indent is None:
+                json.dump(data, f, separators=(",", ":"))
+            else:
+                json.dump(data, f, indent=indent, sort_keys=True)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+FSYNC_POLICIES = ("none", "file", "batch")
+
+
+def fsync_dir(path: Path) -> None:
+    """Schreibt einen Verzeichniseintrag (z.B. nach rename) auf die Platte."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class AtomicWriter:
+    """Schreibt Dateien atomar (Temp-Datei + rename) mit fsync-Strategie.
+
+    - none: kein fsync, das Betriebssystem schreibt irgendwann
+    - file: jede Datei samt Verzeichniseintrag sofort nach dem Schreiben
+    - batch: alle Temp-Dateien erst schreiben, dann gemeinsam syncen und
+      umbenennen, jedes Verzeichnis nur einmal syncen
+
+    Als Kontextmanager: commit() am Ende, bei Fehlern abort(). `written`
+    enthält die bereits veröffentlichten Zieldateien, auch nach einem Fehler.
+    """
+
+    def __init__(self, fsync: str = "none"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Ungültige fsync-Strategie '{fsync}'. Erlaubt: {list(FSYNC_POLICIES)}")
+        self.fsync = fsync
+        self._pending: list[tuple[str, Path]] = []
+        self.written: list[Path] = []
+
+    def __enter__(self) -> "AtomicWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def add(self, path: Path, data: bytes) -> None:
+        """Schreibt eine Datei (bei 'batch' erst mit commit() sichtbar)."""
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if self.fsync == "file":
+                    f.flush()
+                    os.fsync(f.fileno())
+            if self.fsync == "batch":
+                self._pending.append((tmp, path))
+                return
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self.written.append(path)
+        if self.fsync == "file":
+            fsync_dir(path.parent)
+
+    def commit(self) -> None:
+        """Synct und veröffentlicht die zurückgehaltenen Dateien ('batch')."""
+        pending, self._pending = self._pending, []
+        try:
+            for tmp, _ in pending:
+                fd = os.open(tmp, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+        except BaseException:
+            self._pending = pending
+            self.abort()
+            raise
+        for i, (tmp, path) in enumerate(pending):
+            try:
+                os.replace(tmp, path)
+            except BaseException:
+                self._pending = pending[i:]
+                self.abort()
+                raise
+            self.written.append(path)
+        for folder in {path.parent for _, path in pending}:
+            fsync_dir(folder)
+
+    def abort(self) -> None:
+        """Verwirft die zurückgehaltenen Temp-Dateien."""
+        pending, self._pending = self._pending, []
+        for tmp, _ in pending:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
@@ -0,0 +1,393 @@
+"""Projektweiter Modul-Index (Eingabe).
+
+Hält für jedes Modul unter lib_path eine kompakte Zusammenfassung aus dem
+Scanner (Zeilen, Packages, Abhängigkeiten, Subs mit Zeilenbereich) und
+daraus den
+Abhängigkeitsgraphen in beide Richtungen sowie einen Sub-Index
+(Name -> Modul, Zeilen). Der Stand wird unter docs_root persistiert und bei
+jeder Abfrage inkrementell aktualisiert: Module werden nur neu gescannt,
+wenn sich mtime oder Größe der Datei geändert haben; größere Mengen
+werden parallel in einem Prozess-Pool gescannt. Über get_project_index
+wird höchstens einmal pro REVALIDATE_INTERVAL geprüft, damit Abfragen
+wie module_dependents nicht jedes Mal alle Module stat-en. Transitive Hüllen
+werden pro Modul zwischengespeichert, bis sich der Graph ändert.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .index import get_module_index
+from .persist import load_json, write_json_atomic
+from .scanner import scan
+
+INDEX_VERSION = 5
+
+# Ab dieser Anzahl zu scannender Dateien lohnt sich der Prozess-Pool
+PARALLEL_THRESHOLD = 64
+
+# Mindestabstand (Sekunden) zwischen zwei Abgleichen über get_project_index
+REVALIDATE_INTERVAL = 1.0
+
+DIRECTIONS = ("dependencies", "dependents")
+
+
+def _summarize(path: Path) -> Optional[dict]:
+    """Scannt eine Modul-Datei und liefert ihre Zusammenfassung.
+
+    Läuft ggf. in einem Worker-Prozess, daher None statt Exception.
+    """
+    try:
+        result = scan(path.read_text(encoding="utf-8", errors="replace"))
+    except OSError:
+        return None
+    return {
+        "lines": result.line_count,
+        "packages": result.packages,
+        "deps": result.dependencies,
+        "subs": [[sub.name, sub.start, sub.end] for sub in result.subs],
+    }
+
+
+def _summarize_all(paths: list[Path], workers: int) -> list[Optional[dict]]:
+    """Scannt mehrere Dateien, bei großen Mengen im Prozess-Pool."""
+    if workers > 1 and len(paths) >= PARALLEL_THRESHOLD:
+        chunksize = max(1, len(paths) // (workers * 4))
+        try:
+            # Aufrufer sind Server-Threads: nicht aus einem Prozess mit
+            # Threads heraus forken
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            context = multiprocessing.get_context(method)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                return list(pool.map(_summarize, paths, chunksize=chunksize))
+        except (OSError, BrokenProcessPool):
+            pass  # z.B. keine Prozesse erlaubt: sequentiell weiter
+    return [_summarize(path) for path in paths]
+
+
+class ProjectIndex:
+    """Zusammenfassungen aller Module und Abhängigkeitsgraph."""
+
+    def __init__(self, config, index_file: Path):
+        self.config = config
+        self.index_file = index_file
+        # Modulname -> {"sig": [mtime_ns, size], "lines": n, "packages": [...],
+        #               "deps": [...], "subs": [[name, start, end]]}
+        self._modules: dict[str, dict] = {}
+        self._dependents: dict[str, set[str]] = {}
+        # Subname -> {Modulname, ...}
+        self._subs: dict[str, set[str]] = {}
+        # (Modul, Richtung, max_depth) -> {Modul: Tiefe}
+        self._closures: dict[tuple, dict[str, int]] = {}
+        # Zeitpunkt des letzten Abgleichs (time.monotonic)
+        self._checked = float("-inf")
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        data = load_json(self.index_file, {})
+        if (
+            data.get("version") == INDEX_VERSION
+            and data.get("lib_path") == str(self.config.lib_path)
+        ):
+            self._modules = data.get("modules", {})
+            for name, entry in self._modules.items():
+                self._link(name, entry)
+
+    def _save(self) -> None:
+        write_json_atomic(self.index_file, {
+            "version": INDEX_VERSION,
+            "lib_path": str(self.config.lib_path),
+            "modules": self._modules,
+        })
+
+    def _link(self, name: str, entry: dict) -> None:
+        for dep in entry["deps"]:
+            self._dependents.setdefault(dep, set()).add(name)
+        for sub in entry["subs"]:
+            self._subs.setdefault(sub[0], set()).add(name)
+
+    def _unlink(self, name: str, entry: dict) -> None:
+        for reverse, keys in ((self._dependents, entry["deps"]),
+                              (self._subs, [sub[0] for sub in entry["subs"]])):
+            for key in keys:
+                names = reverse.get(key)
+                if names is not None:
+                    names.discard(name)
+                    if not names:
+                        del reverse[key]
+
+    def refresh(self, max_age: float = 0.0) -> bool:
+        """Scannt neue und geänderte Module, entfernt gelöschte.
+
+        Args:
+            max_age: Abgleich überspringen, wenn der letzte höchstens so
+                viele Sekunden zurückliegt
+
+        Returns:
+            True wenn sich der Index geändert hat
+        """
+        if max_age > 0 and time.monotonic() - self._checked < max_age:
+            return False
+        names = get_module_index(self.config).names
+        with self._lock:
+            if max_age > 0 and time.monotonic() - self._checked < max_age:
+                return False  # anderer Thread hat inzwischen abgeglichen
+            self._checked = time.monotonic()
+            changed = False
+            present = set(names)
+            for name in [n for n in self._modules if n not in present]:
+                self._unlink(name, self._modules.pop(name))
+                changed = True
+
+            pending = []
+            for name in names:
+                path = self.config.module_to_path(name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                sig = [st.st_mtime_ns, st.st_size]
+                entry = self._modules.get(name)
+                if entry is None or entry["sig"] != sig:
+                    pending.append((name, path, sig))
+
+            summaries = _summarize_all([path for _, path, _ in pending], self.config.workers)
+            for (name, _, sig), summary in zip(pending, summaries):
+                if summary is None:
+                    continue
+                entry = self._modules.get(name)
+                if entry is not None:
+                    self._unlink(name, entry)
+                entry = {"sig": sig, **summary}
+                self._modules[name] = entry
+                self._link(name, entry)
+                changed = True
+
+            if changed:
+                self._closures.clear()
+                self._save()
+            return changed
+
+    def __contains__(self, module_name: str) -> bool:
+        return module_name in self._modules
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def summaries(self) -> Iterator[tuple[str, dict]]:
+        """Alle Module mit ihrer Zusammenfassung (sortiert nach Name)."""
+        for name in sorted(self._modules):
+            yield name, self._modules[name]
+
+    def fan_in(self, module_name: str) -> int:
+        """Anzahl der Module im Projekt, die das Modul verwenden."""
+        return len(self._dependents.get(module_name, ()))
+
+    def fan_out(self, module_name: str) -> int:
+        """Anzahl der Projekt-Module, die das Modul verwendet."""
+        return sum(1 for dep in self.dependencies(module_name) if dep in self._modules)
+
+    def dependencies(self, module_name: str) -> list[str]:
+        """Direkte Abhängigkeiten eines Moduls."""
+        entry = self._modules.get(module_name)
+        return list(entry["deps"]) if entry else []
+
+    def dependents(self, module_name: str) -> list[str]:
+        """Module, die das Modul direkt verwenden (sortiert)."""
+        return sorted(self._dependents.get(module_name, ()))
+
+    def find_sub(self, sub_name: str) -> list[tuple[str, str, int, int]]:
+        """Sucht eine Sub projektweit.
+
+        Exakte Treffer haben Vorrang; sonst wird ohne Groß/Klein nach
+        Teilstrings gesucht.
+
+        Returns:
+            Liste (Modul, Sub, Startzeile, Endzeile), sortiert
+        """
+        with self._lock:
+            if sub_name in self._subs:
+                names = {sub_name}
+            else:
+                needle = sub_name.lower()
+                names = {n for n in self._subs if needle in n.lower()}
+            hits = []
+            for name in names:
+                for module in self._subs[name]:
+                    for sub, start, end in self._modules[module]["subs"]:
+                        if sub == name:
+                            hits.append((module, sub, start, end))
+        return sorted(hits)
+
+    def _neighbours(self, module_name: str, direction: str) -> Iterable[str]:
+        if direction == "dependents":
+            return self._dependents.get(module_name, ())
+        entry = self._modules.get(module_name)
+        return entry["deps"] if entry else ()
+
+    def _walk(self, starts: Iterable[str], direction: str, max_depth: int) -> dict[str, int]:
+        """Breitensuche ab mehreren Startmodulen.
+
+        Returns:
+            Erreichte Module (ohne Startmodule) mit Abstand in Hops
+        """
+        seen = set(starts)
+        frontier = list(seen)
+        reached: dict[str, int] = {}
+        level = 0
+        while frontier and (max_depth <= 0 or level < max_depth):
+            level += 1
+            following = []
+            for name in frontier:
+                for neighbour in self._neighbours(name, direction):
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        reached[neighbour] = level
+                        following.append(neighbour)
+            frontier = following
+        return reached
+
+    def closure(self, module_name: str, direction: str = "dependencies",
+                max_depth: int = 0) -> dict[str, int]:
+        """Transitive Hülle der Abhängigkeiten bzw. der Verwender.
+
+        Args:
+            module_name: Startmodul
+            direction: 'dependencies' oder 'dependents'
+            max_depth: Maximale Tiefe, 0 = unbegrenzt
+
+        Returns:
+            Erreichte Module mit Abstand in Hops
+        """
+        key = (module_name, direction, max_depth)
+        with self._lock:
+            cached = self._closures.get(key)
+            if cached is None:
+                cached = self._walk([module_name], direction, max_depth)
+                self._closures[key] = cached
+            return cached
+
+    def affected(self, module_names: Iterable[str]) -> dict[str, int]:
+        """Alle Module, die (transitiv) von den angegebenen Modulen abhängen."""
+        with self._lock:
+            return self._walk(module_names, "dependents", 0)
+
+    def propagate(self, module_names: Iterable[str]) -> dict[str, tuple[int, str]]:
+        """Verwender geänderter Module mit Abstand und auslösendem Modul.
+
+        Eine Breitensuche mit allen Startmodulen gleichzeitig; jedes Modul
+        wird dem nächstgelegenen Startmodul zugeordnet (bei gleichem
+        Abstand dem alphabetisch ersten). Das Ergebnis wird bis zur
+        nächsten Änderung des Graphen zwischengespeichert.
+
+        Returns:
+            Modul -> (Abstand in Hops, geändertes Startmodul), ohne Startmodule
+        """
+        sources = tuple(sorted(set(module_names)))
+        key = (sources, "propagate", 0)
+        with self._lock:
+            cached = self._closures.get(key)
+            if cached is not None:
+                return cached
+            seen = set(sources)
+            frontier = [(name, name) for name in sources]
+            reached: dict[str, tuple[int, str]] = {}
+            level = 0
+            while frontier:
+                level += 1
+                following = []
+                for name, origin in frontier:
+                    for neighbour in sorted(self._dependents.get(name, ())):
+                        if neighbour not in seen:
+                            seen.add(neighbour)
+                            reached[neighbour] = (level, origin)
+                            following.append((neighbour, origin))
+                frontier = following
+            self._closures[key] = reached
+            return reached
+
+    def cycles(self, module_names: Iterable[str]) -> list[list[str]]:
+        """Zyklen (starke Zusammenhangskomponenten) innerhalb einer Modulmenge.
+
+        Iterative Tarjan-Variante, berücksichtigt nur Kanten zwischen den
+        angegebenen Modulen.
+        """
+        nodes = set(module_names)
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        components: list[list[str]] = []
+        counter = 0
+
+        for root in sorted(nodes):
+            if root in index:
+                continue
+            work = [(root, iter(self._neighbours(root, "dependencies")))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, neighbours = work[-1]
+                advanced = False
+                for neighbour in neighbours:
+                    if neighbour not in nodes:
+                        continue
+                    if neighbour not in index:
+                        index[neighbour] = low[neighbour] = counter
+                        counter += 1
+                        stack.append(neighbour)
+                        on_stack.add(neighbour)
+                        work.append((neighbour, iter(self._neighbours(neighbour, "dependencies"))))
+                        advanced = True
+                        break
+                    if neighbour in on_stack:
+                        low[node] = min(low[node], index[neighbour])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self._neighbours(node, "dependencies"):
+                        components.append(sorted(component))
+        return sorted(components)
+
+
+_INDEXES: dict[tuple, ProjectIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_project_index(config, refresh: bool = True) -> ProjectIndex:
+    """Liefert den (prozessweit geteilten) Projekt-Index für eine Konfiguration.
+
+    Args:
+        config: Konfiguration
+        refresh: Vor der Rückgabe inkrementell aktualisieren
+    """
+    key = (str(config.lib_path), config.file_extension, config.module_separator,
+           str(config.index_dir))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = ProjectIndex(config, config.index_dir / "project.json")
+            _INDEXES[key] = index
+    if refresh:
+        index.refresh(max_age=REVALIDATE_INTERVAL)
+    return index
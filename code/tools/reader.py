@@ -4,34 +4,65 @@ Funktionen zum Lesen und Analysieren von Quellcode.
 """
 from __future__ import annotations
 
+import dataclasses
+import math
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
 
+from .cache import get_module_record
+from .codesearch import get_code_search
+from .index import get_module_index
+from .paging import read_lines
+from .project import DIRECTIONS, get_project_index
 
-def read_module(config, module_name: str) -> str:
+
+def read_module(config, module_name: str, start_line: int = 0, end_line: int = 0) -> str:
     """Liest ein Modul und gibt den Inhalt zurück.
     
+    Große Module werden seitenweise ausgeliefert: Ohne Zeilenangabe kommt
+    der Anfang bis max_file_size, mit start_line/end_line der gewünschte
+    Ausschnitt. Die Ausgabe nennt dann die Zeile, mit der es weitergeht.
+    
     Args:
         config: Konfiguration
         module_name: Modulname (z.B. 'Order::Validation')
+        start_line: Erste Zeile (1-basiert), 0 = Dateianfang
+        end_line: Letzte Zeile (inklusive), 0 = so weit das Budget reicht
         
     Returns:
         Dateiinhalt oder Fehlermeldung
     """
     full_path = config.module_to_path(module_name)
 
-    if not full_path.exists():
+    try:
+        size = full_path.stat().st_size
+    except OSError:
         return f"Modul nicht gefunden: {module_name}\nErwarteter Pfad: {full_path}"
 
-    content = full_path.read_text(encoding="utf-8", errors="replace")
+    paged = start_line > 0 or end_line > 0
+    if not paged and size <= config.max_file_size:
+        record = get_module_record(config, module_name)
+        if record is not None:
+            return record.content
 
-    if len(content) > config.max_file_size:
-        content = (
-            content[:config.max_file_size] + 
-            f"\n\n... (gekürzt, Datei hat {len(content)} Zeichen)"
-        )
+    page = read_lines(full_path, start_line, end_line, config.max_file_size)
+    if page is None:
+        return f"Modul nicht gefunden: {module_name}\nErwarteter Pfad: {full_path}"
+    if page.start > page.total:
+        return f"Zeile {page.start} existiert nicht, {module_name} hat {page.total} Zeilen"
+    if page.end < page.start:
+        return f"Ungültiger Bereich: end_line {end_line} liegt vor start_line {page.start}"
 
-    return content
+    parts = [f"Zeilen {page.start}-{page.end} von {page.total}"]
+    if page.truncated:
+        parts.append(f"Zeile {page.start} nach {config.max_file_size} Zeichen abgeschnitten")
+    if page.has_more:
+        parts.append(f"weiter mit start_line={page.end + 1}")
+    prefix = "gekürzt, " if page.truncated or page.has_more else ""
+    
+    return page.text + f"\n\n... ({prefix}" + ", ".join(parts) + ")"
 
 
 def find_modules(config, pattern: str) -> str:
@@ -49,19 +80,13 @@ def find_modules(config, pattern: str) -> str:
     if not lib_path.exists():
         return f"lib-Verzeichnis nicht gefunden: {lib_path}"
     
-    ext = config.file_extension
-    # Suche nach Pattern im Dateinamen ODER im Pfad
-    all_files = list(lib_path.rglob(f"*{ext}"))
-    matches = [f for f in all_files if pattern.lower() in str(f).lower()]
+    # Suche über den persistenten Modul-Index statt rglob
+    matches = get_module_index(config).search(pattern)
 
     if not matches:
         return f"Keine Module gefunden für: {pattern}"
 
-    modules = []
-    for m in sorted(matches)[:config.max_results]:
-        modules.append(config.path_to_module(m))
-
-    result = "\n".join(modules)
+    result = "\n".join(matches[:config.max_results])
     if len(matches) > config.max_results:
         result += f"\n\n... und {len(matches) - config.max_results} weitere"
     
@@ -78,18 +103,12 @@ def module_dependencies(config, module_name: str) -> str:
     Returns:
         Liste der Abhängigkeiten oder Fehlermeldung
     """
-    full_path = config.module_to_path(module_name)
+    record = get_module_record(config, module_name)
 
-    if not full_path.exists():
+    if record is None:
         return f"Modul nicht gefunden: {module_name}"
 
-    content = full_path.read_text(encoding="utf-8", errors="replace")
-
-    # Regex für use/require Statements (Perl)
-    uses = re.findall(r'^use\s+([\w:]+)', content, re.MULTILINE)
-    requires = re.findall(r'^require\s+([\w:]+)', content, re.MULTILINE)
-
-    deps = sorted(set(uses + requires))
+    deps = record.dependencies
 
     if not deps:
         return "Keine Abhängigkeiten gefunden"
@@ -97,6 +116,241 @@ def module_dependencies(config, module_name: str) -> str:
     return "\n".join(deps)
 
 
+def module_dependents(config, module_name: str) -> str:
+    """Zeigt welche Module ein Modul verwenden ("Verwendet von").
+    
+    Args:
+        config: Konfiguration
+        module_name: Modulname
+        
+    Returns:
+        Liste der verwendenden Module oder Fehlermeldung
+    """
+    if not config.lib_path.exists():
+        return f"lib-Verzeichnis nicht gefunden: {config.lib_path}"
+    
+    dependents = get_project_index(config).dependents(module_name)
+    
+    if not dependents:
+        return f"Keine Module verwenden {module_name}"
+    
+    return "\n".join(dependents)
+
+
+def _format_levels(config, reached: dict[str, int], index) -> list[str]:
+    """Formatiert erreichte Module gruppiert nach Abstand (Hops)."""
+    internal = sorted((d, n) for n, d in reached.items() if n in index)
+    external = sorted(n for n in reached if n not in index)
+    
+    result = []
+    level = 0
+    for depth, name in internal[:config.max_results]:
+        if depth != level:
+            level = depth
+            result.append(f"Ebene {depth}:")
+        result.append(f"  {name}")
+    if len(internal) > config.max_results:
+        result.append(f"  ... und {len(internal) - config.max_results} weitere")
+    if external:
+        result.append(f"\nExtern ({len(external)}): " + ", ".join(external))
+    return result
+
+
+def dependency_closure(config, module_name: str, direction: str = "dependencies",
+                       max_depth: int = 0) -> str:
+    """Zeigt die transitive Hülle der Abhängigkeiten oder Verwender.
+    
+    Args:
+        config: Konfiguration
+        module_name: Modulname
+        direction: 'dependencies' (was braucht das Modul) oder
+            'dependents' (wer braucht das Modul)
+        max_depth: Maximale Tiefe in Hops, 0 = unbegrenzt
+        
+    Returns:
+        Module gruppiert nach Abstand, externe Module und Zyklen
+    """
+    if direction not in DIRECTIONS:
+        return f"Ungültige Richtung '{direction}'. Erlaubt: {list(DIRECTIONS)}"
+    if not config.lib_path.exists():
+        return f"lib-Verzeichnis nicht gefunden: {config.lib_path}"
+    
+    index = get_project_index(config)
+    if module_name not in index:
+        return f"Modul nicht gefunden: {module_name}"
+    
+    reached = index.closure(module_name, direction, max_depth)
+    label = "Abhängigkeiten" if direction == "dependencies" else "Verwender"
+    limit = f", max. Tiefe {max_depth}" if max_depth > 0 else ""
+    
+    if not reached:
+        return f"Keine transitiven {label} für {module_name}{limit}"
+    
+    result = [f"Transitive {label} von {module_name} ({len(reached)}{limit}):"]
+    result.extend(_format_levels(config, reached, index))
+    
+    cycles = index.cycles([module_name, *reached])
+    if cycles:
+        result.append(f"\nZYKLEN ({len(cycles)}):")
+        for cycle in cycles:
+            result.append("  ↻ " + " -> ".join(cycle + cycle[:1]))
+    
+    return "\n".join(result)
+
+
+def _resolve_module(config, name: str) -> str:
+    """Akzeptiert Modulnamen oder Dateipfade (relativ zu Projekt oder lib)."""
+    if not name.endswith(config.file_extension):
+        return name
+    path = Path(name)
+    if not path.is_absolute():
+        candidate = config.project_root / path
+        path = candidate if candidate.is_relative_to(config.lib_path) else config.lib_path / path
+    try:
+        return config.path_to_module(path)
+    except ValueError:
+        return name
+
+
+def impact_analysis(config, changed: list[str]) -> str:
+    """Zeigt welche Module von Änderungen an mehreren Modulen betroffen sind.
+    
+    Args:
+        config: Konfiguration
+        changed: Geänderte Module (Modulnamen oder Dateipfade)
+        
+    Returns:
+        Betroffene Module gruppiert nach Abstand
+    """
+    if not changed:
+        return "Keine Module angegeben"
+    if not config.lib_path.exists():
+        return f"lib-Verzeichnis nicht gefunden: {config.lib_path}"
+    
+    index = get_project_index(config)
+    modules = sorted({_resolve_module(config, name) for name in changed})
+    unknown = [m for m in modules if m not in index]
+    affected = index.affected(modules)
+    
+    result = [f"Geändert ({len(modules)}): " + ", ".join(modules)]
+    if unknown:
+        result.append(f"Nicht im Projekt ({len(unknown)}): " + ", ".join(unknown))
+    if not affected:
+        result.append("\nKeine weiteren Module betroffen")
+    else:
+        result.append(f"\nBetroffen ({len(affected)}):")
+        result.extend(_format_levels(config, affected, index))
+    
+    return "\n".join(result)
+
+
+def read_sub(config, module_name: str, sub_name: str) -> str:
+    """Liest eine einzelne Subroutine eines Moduls.
+    
+    Args:
+        config: Konfiguration
+        module_name: Modulname
+        sub_name: Name der Subroutine
+        
+    Returns:
+        Code der Sub(s) mit Zeilenangabe oder Fehlermeldung
+    """
+    record = get_module_record(config, module_name)
+
+    if record is None:
+        return f"Modul nicht gefunden: {module_name}"
+
+    subs = [
+        s for s in record.subs
+        if s.name == sub_name or s.name.rsplit("::", 1)[-1] == sub_name
+    ]
+    if not subs:
+        available = record.sub_names
+        result = f"Sub '{sub_name}' nicht gefunden in {module_name}"
+        if available:
+            result += "\nVorhanden: " + ", ".join(available[:20])
+            if len(available) > 20:
+                result += f" ... und {len(available) - 20} weitere"
+        return result
+
+    parts = []
+    for sub in subs:
+        code = record.slice_lines(sub.start, sub.end)
+        if len(code) > config.max_file_size:
+            code = (
+                code[:config.max_file_size] +
+                f"\n\n... (gekürzt, weiter mit read_module und start_line)"
+            )
+        parts.append(f"# {module_name}::{sub.name} (Zeilen {sub.start}-{sub.end})\n{code}")
+    
+    return "\n\n".join(parts)
+
+
+def find_sub(config, sub_name: str) -> str:
+    """Findet Subroutinen projektweit.
+    
+    Args:
+        config: Konfiguration
+        sub_name: Name der Subroutine (exakt oder Teil des Namens)
+        
+    Returns:
+        Liste 'Modul::Sub (Zeilen a-b)' oder Fehlermeldung
+    """
+    if not config.lib_path.exists():
+        return f"lib-Verzeichnis nicht gefunden: {config.lib_path}"
+    
+    hits = get_project_index(config).find_sub(sub_name)
+    
+    if not hits:
+        return f"Keine Subs gefunden für: {sub_name}"
+    
+    result = [
+        f"{module}::{sub} (Zeilen {start}-{end})"
+        for module, sub, start, end in hits[:config.max_results]
+    ]
+    if len(hits) > config.max_results:
+        result.append(f"\n... und {len(hits) - config.max_results} weitere")
+    
+    return "\n".join(result)
+
+
+def search_code(config, query: str, regex: bool = False) -> str:
+    """Durchsucht den Code aller Module (ohne Groß/Klein).
+    
+    Args:
+        config: Konfiguration
+        query: Suchtext
+        regex: query als regulären Ausdruck behandeln
+        
+    Returns:
+        Treffer mit Modul, Zeilennummer und Kontext oder Fehlermeldung
+    """
+    if not query:
+        return "Kein Suchbegriff angegeben"
+    if not config.lib_path.exists():
+        return f"lib-Verzeichnis nicht gefunden: {config.lib_path}"
+    
+    index = get_code_search(config)
+    try:
+        matches = list(index.search(query, regex, limit=config.max_results + 1))
+    except re.error as e:
+        return f"Ungültiger regulärer Ausdruck: {e}"
+    
+    if not matches:
+        return f"Keine Treffer für: {query}"
+    
+    result = []
+    for match in matches[:config.max_results]:
+        result.append(f"{match.module}:{match.line}")
+        for lineno, line in match.context:
+            marker = ">" if lineno == match.line else " "
+            result.append(f"  {marker}{lineno:5d} | {line}")
+    if len(matches) > config.max_results:
+        result.append(f"\n... weitere Treffer (max. {config.max_results})")
+    
+    return "\n".join(result)
+
+
 def module_stats(config, module_name: str) -> str:
     """Gibt Statistiken über ein Modul aus.
     
@@ -107,24 +361,19 @@ def module_stats(config, module_name: str) -> str:
     Returns:
         Statistiken (Zeilen, Funktionen, etc.)
     """
-    full_path = config.module_to_path(module_name)
+    record = get_module_record(config, module_name)
 
-    if not full_path.exists():
+    if record is None:
         return f"Modul nicht gefunden: {module_name}"
 
-    content = full_path.read_text(encoding="utf-8", errors="replace")
-    lines = content.splitlines()
-    
-    # Perl-spezifische Patterns
-    subs = re.findall(r'^sub\s+(\w+)', content, re.MULTILINE)
-    packages = re.findall(r'^package\s+([\w:]+)', content, re.MULTILINE)
+    subs = record.sub_names
     
     stats = [
         f"Modul: {module_name}",
-        f"Pfad: {full_path}",
-        f"Zeilen: {len(lines)}",
-        f"Zeichen: {len(content)}",
-        f"Packages: {len(packages)}",
+        f"Pfad: {record.path}",
+        f"Zeilen: {record.line_count}",
+        f"Zeichen: {len(record.content)}",
+        f"Packages: {len(record.packages)}",
         f"Subroutines: {len(subs)}",
     ]
     
@@ -134,3 +383,138 @@ def module_stats(config, module_name: str) -> str:
             stats.append(f"  ... und {len(subs) - 20} weitere")
     
     return "\n".join(stats)
+
+
+def _distribution(values: list[int]) -> str:
+    """Formatiert Min/Median/P90/Max/Mittel einer Werteliste."""
+    ordered = sorted(values)
+    n = len(ordered)
+    median = ordered[n // 2] if n % 2 else (ordered[n // 2 - 1] + ordered[n // 2]) / 2
+    # Nearest-Rank: kleinster Wert, unter dem mindestens 90% liegen (>= Median)
+    p90 = ordered[math.ceil(0.9 * n) - 1]
+    mean = sum(ordered) / n
+    return f"{ordered[0]:>7} {median:>8g} {p90:>7} {ordered[-1]:>7} {mean:>8.1f}"
+
+
+def project_stats(config, top: int = 10) -> str:
+    """Gibt projektweite Statistiken über alle Module aus.
+    
+    Args:
+        config: Konfiguration
+        top: Anzahl der Einträge in den Top-Listen
+        
+    Returns:
+        Summen, Verteilungen und Top-Listen (Größe, Vernetzung)
+    """
+    if not config.lib_path.exists():
+        return f"lib-Verzeichnis nicht gefunden: {config.lib_path}"
+    
+    index = get_project_index(config)
+    if not len(index):
+        return "Keine Module gefunden"
+    
+    rows = []
+    for name, entry in index.summaries():
+        rows.append((
+            name,
+            entry["lines"],
+            len(entry["subs"]),
+            len(entry["packages"]),
+            index.fan_in(name),
+            index.fan_out(name),
+        ))
+    
+    columns = list(zip(*rows))
+    result = [
+        "Projekt-Statistik",
+        "=" * 30,
+        f"Module: {len(rows)}",
+        f"Zeilen: {sum(columns[1])}",
+        f"Subroutines: {sum(columns[2])}",
+        f"Packages: {sum(columns[3])}",
+        f"Interne Abhängigkeiten: {sum(columns[5])}",
+        "",
+        f"{'Verteilung':<14} {'Min':>7} {'Median':>8} {'P90':>7} {'Max':>7} {'Mittel':>8}",
+    ]
+    for label, values in zip(("Zeilen", "Subs", "Packages", "Fan-in", "Fan-out"), columns[1:]):
+        result.append(f"  {label:<12} " + _distribution(list(values)))
+    
+    result.append("\nGrößte Module (Zeilen):")
+    for name, lines, *_ in sorted(rows, key=lambda r: (-r[1], r[0]))[:top]:
+        result.append(f"  {lines:>7}  {name}")
+    
+    result.append("\nAm stärksten vernetzt (Fan-in + Fan-out):")
+    connected = sorted(rows, key=lambda r: (-(r[4] + r[5]), r[0]))[:top]
+    for name, _, _, _, fan_in, fan_out in connected:
+        result.append(f"  {fan_in + fan_out:>7}  {name} (in {fan_in} / out {fan_out})")
+    
+    return "\n".join(result)
+
+
+# === Batch-Varianten ===
+
+
+def _run_batch(config, module_names: list[str], func: Callable[[str], str]) -> str:
+    """Führt ein Einzel-Tool für mehrere Module parallel aus.
+    
+    Doppelte Namen werden entfernt, die Reihenfolge bleibt erhalten.
+    Verarbeitet werden höchstens max_results Module.
+    """
+    names = list(dict.fromkeys(n for n in module_names if n))
+    if not names:
+        return "Keine Module angegeben"
+    
+    skipped = len(names) - config.max_results
+    names = names[:config.max_results]
+    
+    workers = max(1, min(config.workers, len(names)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outputs = list(pool.map(func, names))
+    
+    result = [f"=== {name} ===\n{output}" for name, output in zip(names, outputs)]
+    if skipped > 0:
+        result.append(f"... {skipped} weitere Module nicht verarbeitet (max. {config.max_results})")
+    
+    return "\n\n".join(result)
+
+
+def read_modules(config, module_names: list[str], max_chars: int = 0) -> str:
+    """Liest mehrere Module in einem Aufruf.
+    
+    Args:
+        config: Konfiguration
+        module_names: Modulnamen
+        max_chars: Budget pro Modul in Zeichen, 0 = max_file_size
+        
+    Returns:
+        Inhalte aller Module (jeweils gekürzt wie bei read_module)
+    """
+    budget = max_chars if max_chars > 0 else config.max_file_size
+    module_config = dataclasses.replace(config, max_file_size=budget)
+    return _run_batch(config, module_names, lambda name: read_module(module_config, name))
+
+
+def modules_stats(config, module_names: list[str]) -> str:
+    """Gibt Statistiken für mehrere Module in einem Aufruf aus.
+    
+    Args:
+        config: Konfiguration
+        module_names: Modulnamen
+        
+    Returns:
+        Statistiken aller Module
+    """
+    return _run_batch(config, module_names, lambda name: module_stats(config, name))
+
+
+def modules_dependencies(config, module_names: list[str]) -> str:
+    """Zeigt die Abhängigkeiten mehrerer Module in einem Aufruf.
+    
+    Args:
+        config: Konfiguration
+        module_names: Modulnamen
+        
+    Returns:
+        Abhängigkeiten aller Module
+    """
+    return _run_batch(config, module_names, lambda name: module_dependencies(config, name))
@@ -0,0 +1,252 @@
+"""Zeilenbasierter Perl-Scanner (Eingabe).
+
+Ein einziger Durchlauf über den Quelltext liefert Packages und Subs mit
+Zeilenbereich, use/require-Anweisungen, Basisklassen aus
+`use parent`/`use base` sowie die POD-Blöcke. POD, Heredocs und alles
+nach `__END__`/`__DATA__` werden dabei nicht als Code gewertet.
+
+Der Scanner ist bewusst heuristisch: Er versteht kein vollständiges Perl,
+sondern zählt geschweifte Klammern außerhalb von Strings und Kommentaren.
+Kommt die Zählung durcheinander (z.B. durch Klammern in Regexen), beendet
+ein `}` bzw. das nächste `sub` in Spalte 0 die offene Sub.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Optional
+
+_PACKAGE_RE = re.compile(r'^\s*package\s+([A-Za-z_]\w*(?:::\w+)*)')
+_SUB_RE = re.compile(r'^(\s*)sub\s+([A-Za-z_]\w*(?:::\w+)*)')
+_USE_RE = re.compile(r'^\s*use\s+([A-Za-z_]\w*(?:::\w+)*)')
+_REQUIRE_RE = re.compile(r'\brequire\s+([A-Za-z_]\w*(?:::\w+)*)')
+_HEREDOC_RE = re.compile(r'<<(~?)(?:"(\w+)"|\'(\w+)\'|([A-Za-z_]\w*))')
+_VERSION_RE = re.compile(r'^v\d+$')
+_USE_PARENT_RE = re.compile(r'^\s*use\s+(?:parent|base)\b')
+_PARENT_WORD_RE = re.compile(r'[A-Za-z_]\w*(?:::\w+)*')
+_CLOSE_RE = re.compile(r'^\}\s*(?:#.*)?$')
+_POD_START_RE = re.compile(r'^=[A-Za-z]')
+
+
+@dataclass
+class SubInfo:
+    """Subroutine mit Zeilenbereich (1-basiert, inklusive)."""
+
+    name: str
+    start: int
+    end: int
+    package: str = ""
+
+
+@dataclass
+class ScanResult:
+    """Ergebnis eines Scanner-Durchlaufs."""
+
+    packages: list[str] = field(default_factory=list)
+    subs: list[SubInfo] = field(default_factory=list)
+    uses: list[str] = field(default_factory=list)
+    requires: list[str] = field(default_factory=list)
+    parents: list[str] = field(default_factory=list)
+    pod: list[tuple[int, int]] = field(default_factory=list)
+    # (Package, Startzeile, Endzeile): bis zur nächsten package-Anweisung
+    package_blocks: list[tuple[str, int, int]] = field(default_factory=list)
+    line_count: int = 0
+
+    @property
+    def sub_names(self) -> list[str]:
+        """Namen aller Subs in Dateireihenfolge."""
+        return [s.name for s in self.subs]
+
+    @property
+    def dependencies(self) -> list[str]:
+        """Sortierte, eindeutige Abhängigkeiten (use, require, Basisklassen)."""
+        return sorted(set(self.uses + self.requires + self.parents))
+
+    @property
+    def pod_lines(self) -> int:
+        """Anzahl Zeilen in POD-Blöcken."""
+        return sum(end - start + 1 for start, end in self.pod)
+
+
+def _split_code(line: str) -> tuple[str, int, str]:
+    """Trennt Kommentare ab und zählt Klammern außerhalb von Strings.
+
+    Returns:
+        (Code ohne Kommentar, Saldo aus '{' und '}',
+         Code mit durch Leerzeichen ersetztem String-Inhalt)
+    """
+    depth = 0
+    quote = ""
+    prev = ""
+    bare = []
+    i = 0
+    n = len(line)
+    while i < n:
+        ch = line[i]
+        if quote:
+            if ch == "\\":
+                bare.append("  ")
+                i += 2
+                prev = ""
+                continue
+            if ch == quote:
+                quote = ""
+                bare.append(ch)
+            else:
+                bare.append(" ")
+            prev = ch
+            i += 1
+            continue
+        if ch == "\\":
+            # \{ in Regexen, \" oder \# zählen weder als Klammer noch als Quote
+            bare.append(line[i:i + 2])
+            i += 2
+            prev = ""
+            continue
+        if ch == "#" and prev != "$":
+            return line[:i], depth, "".join(bare)
+        if ch in "\"'" and prev != "$":
+            quote = ch
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+        bare.append(ch)
+        prev = ch
+        i += 1
+    return line, depth, "".join(bare)
+
+
+def _parent_names(statement: str) -> list[str]:
+    """Basisklassen aus einer `use parent`/`use base` Anweisung."""
+    body = _USE_PARENT_RE.sub("", statement).replace("-norequire", " ")
+    return [w for w in _PARENT_WORD_RE.findall(body) if w not in ("qw", "q")]
+
+
+def scan(text: str) -> ScanResult:
+    """Scannt Perl-Quelltext in einem Durchlauf.
+
+    Args:
+        text: Dateiinhalt
+
+    Returns:
+        ScanResult mit Packages, Subs, Abhängigkeiten und POD-Blöcken
+    """
+    result = ScanResult()
+    lines = text.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    result.line_count = len(lines)
+
+    package = ""
+    open_sub: Optional[SubInfo] = None
+    depth = 0
+    seen_brace = False
+    last_code = 0
+    pod_start = 0
+    heredocs: list[tuple[str, bool]] = []
+    parent_buffer = ""
+    data_section = False
+
+    def close_sub(end: int) -> None:
+        nonlocal open_sub
+        open_sub.end = max(open_sub.start, end)
+        result.subs.append(open_sub)
+        open_sub = None
+
+    for lineno, line in enumerate(lines, start=1):
+        line = line.rstrip("\r")
+
+        # Heredoc-Inhalt überspringen
+        if heredocs:
+            tag, indented = heredocs[0]
+            if (line.strip() if indented else line) == tag:
+                heredocs.pop(0)
+            continue
+
+        # POD-Blöcke
+        if pod_start:
+            if line.startswith("=cut"):
+                result.pod.append((pod_start, lineno))
+                pod_start = 0
+            continue
+        if _POD_START_RE.match(line):
+            pod_start = lineno
+            continue
+
+        if data_section:
+            continue
+        if line.startswith(("__END__", "__DATA__")):
+            data_section = True
+            continue
+
+        code, delta, bare = _split_code(line)
+        if not code.strip():
+            continue
+
+        # Mehrzeilige use parent/base Anweisung
+        if parent_buffer:
+            parent_buffer += " " + code
+            if ";" in code:
+                result.parents.extend(_parent_names(parent_buffer.split(";", 1)[0]))
+                parent_buffer = ""
+
+        m = _SUB_RE.match(code)
+        if m and open_sub is not None and not m.group(1):
+            # Klammerzählung ist aus dem Tritt: neue Sub in Spalte 0
+            close_sub(last_code)
+        if m and open_sub is None:
+            open_sub = SubInfo(m.group(2), lineno, lineno, package)
+            depth = 0
+            seen_brace = False
+            if code.rstrip().endswith(";") and "{" not in code:
+                # Vorwärtsdeklaration: sub foo;
+                close_sub(lineno)
+
+        m = _PACKAGE_RE.match(code)
+        if m:
+            package = m.group(1)
+            result.packages.append(package)
+            if result.package_blocks:
+                name, start, _ = result.package_blocks[-1]
+                result.package_blocks[-1] = (name, start, lineno - 1)
+            result.package_blocks.append((package, lineno, len(lines)))
+
+        m = _USE_RE.match(code)
+        if m and not _VERSION_RE.match(m.group(1)):
+            name = m.group(1)
+            result.uses.append(name)
+            if name in ("parent", "base"):
+                statement = code.strip()
+                if ";" in statement:
+                    result.parents.extend(_parent_names(statement.split(";", 1)[0]))
+                else:
+                    parent_buffer = statement
+
+        # Nur außerhalb von Strings: "bitte require X" ist keine Abhängigkeit
+        for name in _REQUIRE_RE.findall(bare):
+            result.requires.append(name)
+
+        for m in _HEREDOC_RE.finditer(code):
+            tag = m.group(2) or m.group(3) or m.group(4)
+            indented = bool(m.group(1))
+            # Nur echte Heredocs: Endmarke muss noch folgen
+            rest = islice(lines, lineno, None)
+            if any((l.strip() if indented else l.rstrip("\r")) == tag for l in rest):
+                heredocs.append((tag, indented))
+
+        last_code = lineno
+        if open_sub is not None:
+            if "{" in code:
+                seen_brace = True
+            depth += delta
+            if seen_brace and (depth <= 0 or _CLOSE_RE.match(code)):
+                close_sub(lineno)
+
+    if pod_start:
+        result.pod.append((pod_start, len(lines)))
+    if open_sub is not None:
+        close_sub(last_code)
+
+    return result
@@ -0,0 +1,59 @@
+"""Inhaltsadressierter Snapshot-Speicher (Verarbeitung).
+
+Beim Markieren wird der Inhalt eines Moduls zlib-komprimiert unter
+`<docs_root>/.snapshots/<ab>/<rest>.z` abgelegt, benannt nach dem SHA-256
+des Inhalts. Gleiche Inhalte werden so nur einmal gespeichert, der Record
+im Tracker verweist über den Schlüssel auf seinen Snapshot.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Optional
+
+
+class SnapshotStore:
+    """Snapshots als komprimierte Dateien, adressiert über ihren Hash."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key[2:]}.z"
+
+    def put(self, data: bytes) -> str:
+        """Speichert einen Inhalt (falls noch nicht vorhanden).
+
+        Returns:
+            Schlüssel (SHA-256, hex)
+        """
+        key = hashlib.sha256(data).hexdigest()
+        path = self._path(key)
+        if path.exists():
+            return key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(data, 6))
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return key
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Liest einen Snapshot, None wenn er fehlt oder beschädigt ist."""
+        try:
+            return zlib.decompress(self._path(key).read_bytes())
+        except (OSError, zlib.error):
+            return None
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
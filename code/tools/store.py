@@ -0,0 +1,256 @@
+"""Speicher für die Tracking-Records (Verarbeitung).
+
+Zwei Backends mit derselben Schnittstelle, gewählt über `tracker.backend`:
+
+- json: Die bisherige `.module_hashes.json` unter docs_root. Der Inhalt
+  wird im Speicher gehalten und per stat-Vergleich revalidiert; jede
+  Änderung schreibt die ganze Datei atomar unter einer Dateisperre neu.
+- sqlite: `.module_hashes.db` unter docs_root (WAL). Einzelne Records
+  werden über den Primärschlüssel gelesen, Batch-Änderungen laufen in
+  einer Transaktion; mehrere Server-Instanzen überschreiben sich nicht
+  gegenseitig. Eine vorhandene JSON-Datei wird beim ersten Öffnen
+  einmalig übernommen und danach in `.module_hashes.json.migrated`
+  umbenannt.
+
+Ein Record ist ein dict mit mindestens "hash" (siehe tracker.py).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Mapping, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from .cache import stat_signature
+from .persist import write_json_atomic
+
+BACKENDS = ("json", "sqlite")
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS modules (
+    name TEXT PRIMARY KEY,
+    record TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Exklusive, beratende Sperre über eine Lock-Datei (ohne fcntl: keine)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _normalize(record) -> dict:
+    """Ältere Hash-Dateien speichern nur den Hash als String."""
+    return record if isinstance(record, dict) else {"hash": record}
+
+
+class JsonStore:
+    """Records in einer JSON-Datei (Modulname -> Record).
+
+    Der Inhalt bleibt im Speicher und wird nur neu gelesen, wenn sich die
+    stat-Signatur der Datei geändert hat (z.B. durch eine andere Instanz).
+    Schreibzugriffe laufen unter einer Lock-Datei (flock), lesen den
+    aktuellen Stand nach, wenden die Änderungen an und ersetzen die Datei
+    atomar.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock_file = path.with_name(path.name + ".lock")
+        self._lock = threading.Lock()
+        self._records: dict[str, dict] = {}
+        self._names: Optional[list[str]] = None
+        self._signature: Optional[tuple] = None
+        self._loaded = False
+
+    def _stat(self) -> Optional[tuple]:
+        try:
+            return stat_signature(os.stat(self.path))
+        except FileNotFoundError:
+            return None
+
+    def _revalidate(self) -> None:
+        """Liest die Datei neu, falls sie sich geändert hat (unter _lock)."""
+        signature = self._stat()
+        if self._loaded and signature == self._signature:
+            return
+        records = {}
+        if signature is not None:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            records = {name: _normalize(record) for name, record in data.items()}
+        self._records = records
+        self._names = None
+        self._signature = signature
+        self._loaded = True
+
+    def load(self) -> dict[str, dict]:
+        """Alle Records."""
+        with self._lock:
+            self._revalidate()
+            return dict(self._records)
+
+    def get(self, module_name: str) -> Optional[dict]:
+        """Record eines Moduls oder None."""
+        with self._lock:
+            self._revalidate()
+            return self._records.get(module_name)
+
+    def names(self) -> list[str]:
+        """Sortierte Namen aller erfassten Module."""
+        with self._lock:
+            self._revalidate()
+            if self._names is None:
+                self._names = sorted(self._records)
+            return list(self._names)
+
+    def count(self) -> int:
+        """Anzahl erfasster Module."""
+        with self._lock:
+            self._revalidate()
+            return len(self._records)
+
+    def update(self, changes: Mapping[str, Optional[dict]]) -> None:
+        """Schreibt mehrere Records auf einmal, None entfernt einen Record."""
+        if not changes:
+            return
+        with self._lock, _file_lock(self.lock_file):
+            self._revalidate()
+            records = dict(self._records)
+            for name, record in changes.items():
+                if record is None:
+                    records.pop(name, None)
+                else:
+                    records[name] = record
+            write_json_atomic(self.path, records, indent=2)
+            self._records = records
+            self._names = None
+            self._signature = self._stat()
+
+
+class SqliteStore:
+    """Records in einer SQLite-Datenbank (WAL)."""
+
+    def __init__(self, path: Path, legacy_file: Optional[Path] = None):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            with self._db:
+                self._db.executescript(_SCHEMA)
+                self._db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        if legacy_file is not None:
+            self._migrate(legacy_file)
+
+    def _migrate(self, legacy_file: Path) -> None:
+        """Übernimmt eine vorhandene JSON-Hash-Datei (einmalig)."""
+        if not legacy_file.exists():
+            return
+        records = JsonStore(legacy_file).load()
+        with self._lock, self._db:
+            # Bereits vorhandene Einträge (z.B. von einer anderen Instanz)
+            # haben Vorrang vor dem alten Stand
+            self._db.executemany(
+                "INSERT OR IGNORE INTO modules (name, record) VALUES (?, ?)",
+                ((name, json.dumps(record)) for name, record in records.items()),
+            )
+        try:
+            os.replace(legacy_file, legacy_file.with_name(legacy_file.name + ".migrated"))
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """Schließt die Datenbank."""
+        with self._lock:
+            self._db.close()
+
+    def load(self) -> dict[str, dict]:
+        """Alle Records."""
+        with self._lock:
+            rows = self._db.execute("SELECT name, record FROM modules").fetchall()
+        return {name: json.loads(record) for name, record in rows}
+
+    def get(self, module_name: str) -> Optional[dict]:
+        """Record eines Moduls oder None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT record FROM modules WHERE name = ?", (module_name,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def names(self) -> list[str]:
+        """Sortierte Namen aller erfassten Module."""
+        with self._lock:
+            rows = self._db.execute("SELECT name FROM modules ORDER BY name").fetchall()
+        return [row[0] for row in rows]
+
+    def count(self) -> int:
+        """Anzahl erfasster Module."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM modules").fetchone()[0]
+
+    def update(self, changes: Mapping[str, Optional[dict]]) -> None:
+        """Schreibt mehrere Records in einer Transaktion, None entfernt einen Record."""
+        if not changes:
+            return
+        upserts = [(name, json.dumps(record)) for name, record in changes.items()
+                   if record is not None]
+        deletes = [(name,) for name, record in changes.items() if record is None]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO modules (name, record) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET record = excluded.record",
+                upserts,
+            )
+            self._db.executemany("DELETE FROM modules WHERE name = ?", deletes)
+
+
+_STORES: dict[tuple, JsonStore | SqliteStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def open_store(config):
+    """Liefert den Record-Speicher für das konfigurierte Backend.
+
+    Die Speicher werden prozessweit pro Datei geteilt, so bleibt der
+    Stand im laufenden Server resident.
+
+    Raises:
+        ValueError: Bei unbekanntem Backend
+    """
+    backend = config.tracker_backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unbekanntes Tracker-Backend: {backend}")
+    key = (backend, str(config.tracker_db if backend == "sqlite" else config.hash_file))
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if backend == "json":
+            if store is None:
+                store = JsonStore(config.hash_file)
+                _STORES[key] = store
+        elif store is None or not store.path.exists():
+            store = SqliteStore(config.tracker_db, config.hash_file)
+            _STORES[key] = store
+    return store
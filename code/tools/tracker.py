@@ -1,59 +1,372 @@
 """Änderungs-Tracking-Tools (Verarbeitung).
 
 Funktionen zur Verfolgung von Code-Änderungen via Hashes.
+
+Pro Modul wird neben dem Hash die stat-Signatur (mtime_ns, Größe, Inode)
+gespeichert. Stimmt die Signatur noch, gilt das Modul ohne Lesen als
+unverändert; erst bei abweichender Signatur (oder im paranoid-Modus)
+wird der Inhalt neu gehasht. Gehasht wird blockweise im Binärmodus,
+bei check_all_changes parallel in einem Thread-Pool (performance.workers).
+Die Records liegen je nach tracker.backend in JSON oder SQLite (store.py).
+
+Mit tracker.mode "git" wird statt MD5 der git-Blob-SHA gespeichert
+(Record mit "algo": "git"), den git für versionierte, unveränderte
+Dateien ohne erneutes Lesen liefert (gitrepo.py). Außerhalb eines
+Repositories wird weiter per MD5 gehasht.
+
+Zusätzlich speichert jeder Record Hashes pro Sub und pro Package-Block
+(Code außerhalb von Subs). check_changes nennt damit bei Änderungen die
+geänderten, neuen und entfernten Subs samt aktuellem Zeilenbereich.
+Außerdem wird beim Markieren ein Snapshot des Inhalts abgelegt
+(snapshots.py), gegen den diff_since_documented einen Diff erzeugt.
 """
 from __future__ import annotations
 
+import difflib
+import fnmatch
 import hashlib
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+from .cache import ModuleRecord, get_module_record
+from .gitrepo import blob_hash, blob_hashes, repo_root
+from .index import get_module_index
+from .project import get_project_index
+from .scanner import SubInfo
+from .snapshots import SnapshotStore
+from .store import open_store
+
+HASH_CHUNK_SIZE = 1024 * 1024
 
-def _load_hashes(config) -> dict:
-    """Lädt die gespeicherten Hashes."""
-    if config.hash_file.exists():
-        return json.loads(config.hash_file.read_text(encoding="utf-8"))
-    return {}
 
+def compute_hash(filepath: Path) -> Optional[str]:
+    """Berechnet den MD5-Hash einer Datei (blockweise, ohne Dekodieren)."""
+    digest = hashlib.md5()
+    try:
+        with open(filepath, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
 
-def _save_hashes(config, hashes: dict) -> None:
-    """Speichert die Hashes."""
-    config.hash_file.parent.mkdir(parents=True, exist_ok=True)
-    config.hash_file.write_text(json.dumps(hashes, indent=2, sort_keys=True), encoding="utf-8")
 
+def _legacy_text_hash(filepath: Path) -> Optional[str]:
+    """Hash der alten Hash-Dateien: über den dekodierten Text.
 
-def _compute_hash(filepath: Path) -> Optional[str]:
-    """Berechnet den MD5-Hash einer Datei."""
-    if not filepath.exists():
+    Zeilenenden werden dabei zu LF, ungültige Bytes zu U+FFFD; für CRLF-
+    oder Latin-1-Module weicht er daher vom Byte-Hash ab.
+    """
+    try:
+        content = filepath.read_text(encoding="utf-8", errors="replace")
+    except OSError:
         return None
-    content = filepath.read_text(encoding="utf-8", errors="replace")
     return hashlib.md5(content.encode()).hexdigest()
 
 
-def check_changes(config, module_name: str) -> str:
+def stat_fields(st: os.stat_result) -> dict:
+    """stat-Signatur (mtime_ns, Größe, Inode) für einen Record."""
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "inode": st.st_ino}
+
+
+def _make_record(filepath: Path) -> Optional[dict]:
+    """Erzeugt einen Record (Hash + stat-Signatur) für eine Datei."""
+    try:
+        # stat vor dem Lesen: ändert sich die Datei währenddessen, wird
+        # beim nächsten Check sicherheitshalber neu gehasht
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    current_hash = compute_hash(filepath)
+    if current_hash is None:
+        return None
+    return {"hash": current_hash, **stat_fields(st)}
+
+
+def _short_hash(text: str) -> str:
+    """Kurzer Hash für Sub- und Package-Blöcke."""
+    return hashlib.md5(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _sub_keys(subs: list[SubInfo]) -> list[tuple[str, SubInfo]]:
+    """Eindeutige Schlüssel für Subs (bei Namensgleichheit mit Package)."""
+    keys = []
+    seen: set[str] = set()
+    for sub in subs:
+        key = sub.name
+        if key in seen and sub.package:
+            key = f"{sub.package}::{sub.name}"
+        base, n = key, 2
+        while key in seen:
+            key = f"{base}#{n}"
+            n += 1
+        seen.add(key)
+        keys.append((key, sub))
+    return keys
+
+
+def _structure(module: ModuleRecord) -> dict[str, dict[str, str]]:
+    """Hashes pro Sub und pro Package-Block.
+    
+    Ein Package-Block umfasst den Code des Packages außerhalb von Subs
+    (use-Anweisungen, Variablen, POD), damit Änderungen daran getrennt
+    von den Subs erkannt werden.
+    """
+    lines = module.content.split("\n")
+    in_sub = [False] * (len(lines) + 1)
+    subs = {}
+    for key, sub in _sub_keys(module.subs):
+        subs[key] = _short_hash(module.slice_lines(sub.start, sub.end))
+        for lineno in range(sub.start, min(sub.end, len(lines)) + 1):
+            in_sub[lineno] = True
+    packages = {}
+    for name, start, end in module.package_blocks:
+        text = "\n".join(lines[i - 1] for i in range(start, min(end, len(lines)) + 1)
+                         if not in_sub[i])
+        packages[name] = _short_hash(text)
+    return {"subs": subs, "packages": packages}
+
+
+def _structure_changes(config, module_name: str, record: dict) -> list[str]:
+    """Beschreibt geänderte, neue und entfernte Subs gegenüber dem Record."""
+    if "subs" not in record:
+        return []
+    module = get_module_record(config, module_name)
+    if module is None:
+        return []
+    current = _structure(module)
+    ranges = {key: (sub.start, sub.end) for key, sub in _sub_keys(module.subs)}
+    old_subs, new_subs = record["subs"], current["subs"]
+    
+    changed = [k for k in new_subs if k in old_subs and new_subs[k] != old_subs[k]]
+    added = [k for k in new_subs if k not in old_subs]
+    removed = sorted(k for k in old_subs if k not in new_subs)
+    packages = [p for p, h in current["packages"].items()
+                if record.get("packages", {}).get(p) != h]
+    
+    result = []
+    for title, keys, sign in (("Geänderte Subs", changed, "~"), ("Neue Subs", added, "+")):
+        if keys:
+            result.append(f"  {title} ({len(keys)}):")
+            for key in keys:
+                start, end = ranges[key]
+                result.append(f"    {sign} {key} (Zeilen {start}-{end})")
+    if removed:
+        result.append(f"  Entfernte Subs ({len(removed)}):")
+        for key in removed:
+            result.append(f"    - {key}")
+    if packages:
+        result.append(f"  Package-Code außerhalb von Subs geändert: {', '.join(packages)}")
+    return result
+
+
+def _same_stat(record: dict, fields: dict) -> bool:
+    """Stimmt die gespeicherte stat-Signatur noch?"""
+    return all(record.get(k) == v for k, v in fields.items())
+
+
+def _git_blobs(config, paths: list[Path],
+               trust_index: bool = True) -> Optional[dict[Path, str]]:
+    """Blob-SHAs über git, None außerhalb eines Repositories."""
+    root = repo_root(config.lib_path)
+    if root is None:
+        return None
+    return blob_hashes(root, config.lib_path, paths, trust_index)
+
+
+def _check_record(filepath: Path, record: dict,
+                  paranoid: bool = False) -> tuple[Optional[bool], Optional[dict]]:
+    """Vergleicht eine Datei mit ihrem gespeicherten Record.
+    
+    Returns:
+        (unverändert?, aktualisierter Record). unverändert? ist None, wenn
+        die Datei fehlt. Ein aktualisierter Record wird geliefert, wenn der
+        Inhalt gleich, die stat-Signatur aber neu ist.
+    """
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None, None
+    fields = stat_fields(st)
+    same_stat = _same_stat(record, fields)
+    if same_stat and not paranoid:
+        return True, None
+    
+    current_hash = compute_hash(filepath)
+    if current_hash is None:
+        return None, None
+    if current_hash != record["hash"]:
+        if "mtime_ns" not in record and _legacy_text_hash(filepath) == record["hash"]:
+            # Record aus einer alten Hash-Datei, Inhalt unverändert:
+            # auf Byte-Hash und stat-Signatur umstellen
+            return True, {**record, "hash": current_hash, **fields}
+        return False, None
+    return True, None if same_stat else {**record, **fields}
+
+
+def check_records(config, hashes: dict[str, dict],
+                  paranoid: bool = False) -> list[tuple[str, Optional[bool], Optional[dict]]]:
+    """Prüft viele Records parallel (gemeinsame Engine für Tool und CLI).
+    
+    Returns:
+        (Modulname, unverändert?, aktualisierter Record), sortiert nach Name
+    """
+    items = sorted(hashes.items())
+    if not items:
+        return []
+    
+    # Records mit git-Blob-SHA: stat-Schnellpfad, der Rest gesammelt über git
+    results: dict[str, tuple[Optional[bool], Optional[dict]]] = {}
+    git_pending = []
+    for module_name, record in items:
+        if record.get("algo") != "git":
+            continue
+        path = config.module_to_path(module_name)
+        try:
+            fields = stat_fields(os.stat(path))
+        except OSError:
+            results[module_name] = (None, None)
+            continue
+        same_stat = _same_stat(record, fields)
+        if same_stat and not paranoid:
+            results[module_name] = (True, None)
+        else:
+            git_pending.append((module_name, path, record, fields, same_stat))
+    
+    if git_pending:
+        shas = _git_blobs(config, [entry[1] for entry in git_pending], trust_index=not paranoid)
+        for module_name, path, record, fields, same_stat in git_pending:
+            current = blob_hash(path) if shas is None else shas.get(path)
+            if current is None:
+                results[module_name] = (None, None)
+            elif current != record["hash"]:
+                results[module_name] = (False, None)
+            else:
+                results[module_name] = (True, None if same_stat else {**record, **fields})
+    
+    def check(item: tuple[str, dict]) -> tuple[str, Optional[bool], Optional[dict]]:
+        module_name, record = item
+        return (module_name, *_check_record(config.module_to_path(module_name), record, paranoid))
+    
+    rest = [item for item in items if item[0] not in results]
+    checked = [(name, *results[name]) for name in results]
+    if rest:
+        workers = max(1, min(config.workers, len(rest)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            checked.extend(pool.map(check, rest))
+    return sorted(checked, key=lambda entry: entry[0])
+
+
+def _expand_patterns(patterns: list[str], names: list[str]) -> tuple[list[str], list[str]]:
+    """Löst Glob-Muster (z.B. 'Order::*') gegen bekannte Modulnamen auf.
+    
+    Namen ohne Platzhalter werden unverändert übernommen.
+    
+    Returns:
+        (Modulnamen ohne Duplikate, Muster ohne Treffer)
+    """
+    resolved: dict[str, None] = {}
+    unmatched = []
+    for pattern in patterns:
+        if not any(ch in pattern for ch in "*?["):
+            resolved[pattern] = None
+            continue
+        hits = [name for name in names if fnmatch.fnmatchcase(name, pattern)]
+        if not hits:
+            unmatched.append(pattern)
+        resolved.update(dict.fromkeys(hits))
+    return list(resolved), unmatched
+
+
+def _hash_records(config, module_names: list[str], paths: list[Path]) -> dict[str, Optional[dict]]:
+    """Records (Hash + stat-Signatur) ohne Sub-Hashes."""
+    if config.tracker_mode == "git":
+        stats = {}
+        for path in paths:
+            try:
+                stats[path] = stat_fields(os.stat(path))
+            except OSError:
+                pass
+        shas = _git_blobs(config, list(stats))
+        if shas is not None:
+            return {
+                name: {"hash": shas[path], "algo": "git", **stats[path]}
+                if path in stats and path in shas else None
+                for name, path in zip(module_names, paths)
+            }
+    
+    workers = max(1, min(config.workers, len(paths)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(module_names, pool.map(_make_record, paths)))
+
+
+def _make_records(config, module_names: list[str]) -> dict[str, Optional[dict]]:
+    """Erzeugt Records für mehrere Module (None = nicht gefunden).
+    
+    Im Modus "git" mit dem Blob-SHA aus git, sonst (oder außerhalb eines
+    Repositories) mit parallel berechnetem MD5. Dazu kommen die Hashes
+    pro Sub und Package-Block sowie der Schlüssel des Snapshots.
+    """
+    if not module_names:
+        return {}
+    paths = [config.module_to_path(name) for name in module_names]
+    
+    records = _hash_records(config, module_names, paths)
+    snapshots = SnapshotStore(config.snapshot_dir)
+    
+    def add_structure(name: str) -> None:
+        module = get_module_record(config, name)
+        if module is None:
+            return
+        records[name].update(_structure(module))
+        try:
+            records[name]["snapshot"] = snapshots.put(module.path.read_bytes())
+        except OSError:
+            pass
+    
+    marked = [name for name, record in records.items() if record is not None]
+    if marked:
+        workers = max(1, min(config.workers, len(marked)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(add_structure, marked))
+    return records
+
+
+def check_changes(config, module_name: str, paranoid: bool = False) -> str:
     """Prüft ob sich ein Modul seit der letzten Dokumentation geändert hat.
     
     Args:
         config: Konfiguration
         module_name: Modulname
+        paranoid: Immer neu hashen, auch bei unveränderter stat-Signatur
         
     Returns:
         Status-Meldung
     """
     full_path = config.module_to_path(module_name)
-    current_hash = _compute_hash(full_path)
     
-    if current_hash is None:
+    if not full_path.exists():
         return f"Modul nicht gefunden: {module_name}"
 
-    hashes = _load_hashes(config)
-    stored_hash = hashes.get(module_name)
+    store = open_store(config)
+    record = store.get(module_name)
 
-    if stored_hash is None:
+    if record is None:
         return f"{module_name}: Noch nie dokumentiert"
-    elif stored_hash != current_hash:
-        return f"{module_name}: GEÄNDERT seit letzter Dokumentation"
+    
+    _, unchanged, refreshed = check_records(config, {module_name: record}, paranoid)[0]
+    if unchanged is None:
+        return f"Modul nicht gefunden: {module_name}"
+    if refreshed is not None:
+        store.update({module_name: refreshed})
+    
+    if not unchanged:
+        return "\n".join([
+            f"{module_name}: GEÄNDERT seit letzter Dokumentation",
+            *_structure_changes(config, module_name, record),
+        ])
     else:
         return f"{module_name}: Unverändert"
 
@@ -68,15 +381,12 @@ def mark_documented(config, module_name: str) -> str:
     Returns:
         Bestätigung oder Fehlermeldung
     """
-    full_path = config.module_to_path(module_name)
-    current_hash = _compute_hash(full_path)
+    record = _make_records(config, [module_name])[module_name]
     
-    if current_hash is None:
+    if record is None:
         return f"Modul nicht gefunden: {module_name}"
 
-    hashes = _load_hashes(config)
-    hashes[module_name] = current_hash
-    _save_hashes(config, hashes)
+    open_store(config).update({module_name: record})
 
     return f"{module_name}: Als dokumentiert markiert"
 
@@ -91,27 +401,99 @@ def unmark_documented(config, module_name: str) -> str:
     Returns:
         Bestätigung oder Fehlermeldung
     """
-    hashes = _load_hashes(config)
+    store = open_store(config)
     
-    if module_name not in hashes:
+    if store.get(module_name) is None:
         return f"{module_name}: War nicht als dokumentiert markiert"
     
-    del hashes[module_name]
-    _save_hashes(config, hashes)
+    store.update({module_name: None})
     
     return f"{module_name}: Markierung entfernt"
 
 
-def check_all_changes(config) -> str:
+def mark_modules_documented(config, module_names: list[str]) -> str:
+    """Markiert mehrere Module auf einmal als dokumentiert.
+    
+    Die Dateien werden parallel gehasht, alle Records in einem Schritt
+    gespeichert. Glob-Muster wie 'Order::*' werden gegen alle Module
+    unter lib aufgelöst.
+    
+    Args:
+        config: Konfiguration
+        module_names: Modulnamen oder Glob-Muster
+        
+    Returns:
+        Zusammenfassung
+    """
+    names = get_module_index(config).names
+    module_names, unmatched = _expand_patterns(module_names, names)
+    records = _make_records(config, module_names)
+    marked = {name: record for name, record in records.items() if record is not None}
+    missing = [name for name, record in records.items() if record is None] + unmatched
+    
+    open_store(config).update(marked)
+    
+    result = []
+    if marked:
+        result.append(f"Als dokumentiert markiert ({len(marked)}):")
+        for m in marked:
+            result.append(f"  ✓ {m}")
+    if missing:
+        result.append(f"\nNICHT GEFUNDEN ({len(missing)}):")
+        for m in missing:
+            result.append(f"  ✗ {m}")
+    
+    return "\n".join(result).lstrip("\n") if result else "Keine Module angegeben"
+
+
+def unmark_modules_documented(config, module_names: list[str]) -> str:
+    """Entfernt die Dokumentations-Markierung für mehrere Module auf einmal.
+    
+    Glob-Muster wie 'Order::*' werden gegen die markierten Module aufgelöst.
+    
+    Args:
+        config: Konfiguration
+        module_names: Modulnamen oder Glob-Muster
+        
+    Returns:
+        Zusammenfassung
+    """
+    store = open_store(config)
+    tracked = store.names()
+    module_names, unmatched = _expand_patterns(module_names, tracked)
+    tracked_set = set(tracked)
+    removed = [name for name in module_names if name in tracked_set]
+    skipped = [name for name in module_names if name not in tracked_set] + unmatched
+    
+    store.update(dict.fromkeys(removed))
+    
+    result = []
+    if removed:
+        result.append(f"Markierung entfernt ({len(removed)}):")
+        for m in removed:
+            result.append(f"  ✓ {m}")
+    if skipped:
+        result.append(f"\nNICHT MARKIERT ({len(skipped)}):")
+        for m in skipped:
+            result.append(f"  ✗ {m}")
+    
+    return "\n".join(result).lstrip("\n") if result else "Keine Module angegeben"
+
+
+def check_all_changes(config, paranoid: bool = False, propagate: bool = False) -> str:
     """Prüft alle dokumentierten Module auf Änderungen.
     
     Args:
         config: Konfiguration
+        paranoid: Immer neu hashen, auch bei unveränderter stat-Signatur
+        propagate: Auch unveränderte Module melden, die (transitiv) ein
+            geändertes Modul verwenden (über use/require/Basisklassen)
         
     Returns:
         Zusammenfassung der Änderungen
     """
-    hashes = _load_hashes(config)
+    store = open_store(config)
+    hashes = store.load()
     
     if not hashes:
         return "Keine Module als dokumentiert markiert"
@@ -119,23 +501,40 @@ def check_all_changes(config) -> str:
     changed = []
     unchanged = []
     missing = []
+    refreshed = {}
     
-    for module_name, stored_hash in sorted(hashes.items()):
-        full_path = config.module_to_path(module_name)
-        current_hash = _compute_hash(full_path)
-        
-        if current_hash is None:
+    for module_name, status, updated in check_records(config, hashes, paranoid):
+        if status is None:
             missing.append(module_name)
-        elif current_hash != stored_hash:
+        elif not status:
             changed.append(module_name)
         else:
             unchanged.append(module_name)
+        if updated is not None:
+            refreshed[module_name] = updated
+    
+    if refreshed:
+        # Inhalt gleich, nur stat neu: Signatur merken, damit beim
+        # nächsten Mal nicht erneut gehasht werden muss
+        store.update(refreshed)
+    
+    indirect = []
+    if propagate and changed:
+        reached = get_project_index(config).propagate(changed)
+        indirect = sorted(
+            (reached[m][0], m, reached[m][1]) for m in unchanged if m in reached
+        )
+        unchanged = [m for m in unchanged if m not in reached]
     
     result = []
     if changed:
         result.append(f"GEÄNDERT ({len(changed)}):")
         for m in changed:
             result.append(f"  ⚠ {m}")
+    if indirect:
+        result.append(f"\nABHÄNGIGKEIT GEÄNDERT ({len(indirect)}):")
+        for hops, m, origin in indirect:
+            result.append(f"  ⤷ {m} ({hops} {'Hop' if hops == 1 else 'Hops'} über {origin})")
     if missing:
         result.append(f"\nNICHT GEFUNDEN ({len(missing)}):")
         for m in missing:
@@ -146,6 +545,47 @@ def check_all_changes(config) -> str:
     return "\n".join(result) if result else "Keine Module dokumentiert"
 
 
+def diff_since_documented(config, module_name: str, context: int = 3) -> str:
+    """Zeigt die Änderungen eines Moduls seit der letzten Dokumentation.
+    
+    Args:
+        config: Konfiguration
+        module_name: Modulname
+        context: Anzahl Kontextzeilen im Diff
+        
+    Returns:
+        Unified Diff (dokumentierter Stand -> aktueller Stand) oder Meldung
+    """
+    record = open_store(config).get(module_name)
+    if record is None:
+        return f"{module_name}: Noch nie dokumentiert"
+    if "snapshot" not in record:
+        return f"{module_name}: Kein Snapshot gespeichert, bitte neu markieren"
+    
+    old = SnapshotStore(config.snapshot_dir).get(record["snapshot"])
+    if old is None:
+        return f"{module_name}: Snapshot fehlt oder ist beschädigt"
+    try:
+        new = config.module_to_path(module_name).read_bytes()
+    except OSError:
+        return f"Modul nicht gefunden: {module_name}"
+    if old == new:
+        return f"{module_name}: Unverändert"
+    
+    diff = "".join(difflib.unified_diff(
+        old.decode("utf-8", errors="replace").splitlines(keepends=True),
+        new.decode("utf-8", errors="replace").splitlines(keepends=True),
+        fromfile=f"{module_name} (dokumentiert)",
+        tofile=f"{module_name} (aktuell)",
+        n=max(context, 0),
+    ))
+    if not diff:
+        return f"{module_name}: Nur Änderungen an nicht dekodierbaren Bytes"
+    if len(diff) > config.max_file_size:
+        diff = diff[:config.max_file_size] + "\n\n... (gekürzt)"
+    return diff
+
+
 def list_documented(config) -> str:
     """Listet alle als dokumentiert markierten Module.
     
@@ -155,12 +595,12 @@ def list_documented(config) -> str:
     Returns:
         Liste der Module
     """
-    hashes = _load_hashes(config)
+    names = open_store(config).names()
     
-    if not hashes:
+    if not names:
         return "Keine Module als dokumentiert markiert"
     
-    return "\n".join(sorted(hashes.keys()))
+    return "\n".join(names)
 
 
 def documentation_stats(config) -> str:
@@ -172,7 +612,7 @@ def documentation_stats(config) -> str:
     Returns:
         Statistik-Übersicht
     """
-    hashes = _load_hashes(config)
+    tracked = open_store(config).count()
     
     # Zähle Doku-Dateien
     doc_counts = {}
@@ -188,7 +628,7 @@ def documentation_stats(config) -> str:
     result = [
         "Dokumentations-Statistik",
         "=" * 30,
-        f"Verfolgte Module: {len(hashes)}",
+        f"Verfolgte Module: {tracked}",
         f"Dokumentationen: {total_docs}",
         "",
         "Nach Typ:",
@@ -1,10 +1,31 @@
 """Dokumentations-Schreib-Tools (Ausgabe).
 
 Funktionen zum Schreiben und Lesen von Dokumentation.
+
+write_doc und delete_doc pflegen den Metadaten-Index (docindex.py), aus
+dem list_docs seitenweise liest und der auch die Wiki-Links für
+doc_backlinks und broken_links enthält, sowie den Suchindex (docsearch.py)
+für search_docs. patch_doc, append_to_section und insert_section ändern
+einzelne Abschnitte (docsections.py), statt die ganze Datei zu ersetzen.
+Geschrieben wird immer atomar über eine Temp-Datei (fsync laut
+`docs.fsync`); Dateien mit unverändertem Inhalt werden nicht angefasst.
 """
 from __future__ import annotations
 
+import os
+import threading
 from pathlib import Path
+from typing import Optional
+
+from .docindex import SORT_ORDERS, DocIndex, get_doc_index, link_key
+from .docsearch import DocSearchIndex, get_doc_search
+from .docsections import find_section, parse_sections, read_sections, remember
+from .index import get_module_index
+from .persist import AtomicWriter
+from .tracker import compute_hash
+
+# Abschnitts-Änderungen lesen und schreiben dieselbe Datei
+_EDIT_LOCK = threading.Lock()
 
 
 def write_doc(config, doc_type: str, name: str, content: str) -> str:
@@ -22,15 +43,130 @@ def write_doc(config, doc_type: str, name: str, content: str) -> str:
     if doc_type not in config.doc_types:
         return f"Ungültiger Typ '{doc_type}'. Erlaubt: {config.doc_types}"
 
-    folder = config.docs_root / f"{doc_type}s"
-    folder.mkdir(parents=True, exist_ok=True)
+    written, _ = _write_docs(config, [(doc_type, name, content)])
+    filepath = _doc_file(config, doc_type, name)
+    return f"Geschrieben: {filepath}" if written else f"Unverändert: {filepath}"
 
-    # Dateiname bereinigen
-    safe_name = sanitize_filename(name)
-    filepath = folder / f"{safe_name}.md"
 
-    filepath.write_text(content, encoding="utf-8")
-    return f"Geschrieben: {filepath}"
+def write_docs(config, docs: list[dict]) -> str:
+    """Schreibt mehrere Dokumentations-Dateien in einem Aufruf.
+
+    Args:
+        config: Konfiguration
+        docs: Einträge mit 'doc_type', 'name' und 'content'. Bei
+            gleichem Ziel gewinnt der letzte Eintrag.
+
+    Returns:
+        Zusammenfassung: geschrieben, unverändert, fehlerhaft
+    """
+    valid = []
+    errors = []
+    for i, doc in enumerate(docs, start=1):
+        if not isinstance(doc, dict) or not all(
+            isinstance(doc.get(key), str) for key in ("doc_type", "name", "content")
+        ):
+            errors.append(f"#{i}: 'doc_type', 'name' und 'content' erforderlich")
+        elif doc["doc_type"] not in config.doc_types:
+            errors.append(f"#{i}: Ungültiger Typ '{doc['doc_type']}'. Erlaubt: {config.doc_types}")
+        else:
+            valid.append((doc["doc_type"], doc["name"], doc["content"]))
+
+    written, unchanged = _write_docs(config, valid) if valid else ([], [])
+    result = [f"Geschrieben: {len(written)}, unverändert: {len(unchanged)}, Fehler: {len(errors)}"]
+    root = config.docs_root
+    result.extend(f"  + {path.relative_to(root)}" for path in written)
+    result.extend(f"  = {path.relative_to(root)}" for path in unchanged)
+    result.extend(f"  ! {error}" for error in errors)
+    return "\n".join(result)
+
+
+def _doc_file(config, doc_type: str, name: str) -> Path:
+    """Pfad der Doku-Datei (Name bereinigt)."""
+    return config.docs_root / f"{doc_type}s" / f"{sanitize_filename(name)}.md"
+
+
+def _unchanged(path: Path, data: bytes) -> bool:
+    """Liegt genau dieser Inhalt schon auf der Platte? (erst Größe, dann Inhalt)"""
+    try:
+        return os.stat(path).st_size == len(data) and path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def _write_docs(config, docs: list[tuple[str, str, str]]) -> tuple[list[Path], list[Path]]:
+    """Schreibt Doku-Dateien atomar und pflegt Doku- und Suchindex.
+
+    Args:
+        config: Konfiguration
+        docs: (Typ, Name, Inhalt), Typen bereits geprüft
+
+    Returns:
+        (geschriebene, unveränderte Dateien)
+    """
+    index = get_doc_index(config)
+    search = get_doc_search(config)
+    planned: dict[Path, tuple[str, str, str]] = {}
+    for doc_type, name, content in docs:
+        planned[_doc_file(config, doc_type, name)] = (doc_type, name, content)
+
+    unchanged = []
+    out = AtomicWriter(config.docs_fsync)
+    try:
+        with out:
+            for filepath, (_, _, content) in planned.items():
+                data = content.encode("utf-8")
+                if _unchanged(filepath, data):
+                    unchanged.append(filepath)
+                    continue
+                filepath.parent.mkdir(parents=True, exist_ok=True)
+                out.add(filepath, data)
+    finally:
+        # Auch nach einem Fehler: bereits geschriebene Dateien eintragen
+        _index_docs(config, index, search, planned, out.written, unchanged)
+    return out.written, unchanged
+
+
+def _index_docs(config, index: DocIndex, search: DocSearchIndex,
+                planned: dict[Path, tuple[str, str, str]],
+                written: list[Path], unchanged: list[Path]) -> None:
+    """Trägt geschriebene und unveränderte Doku-Dateien in Doku- und Suchindex ein."""
+    stems: dict[str, list[str]] = {}
+    kept = set(unchanged)
+    updates = []
+    for filepath in written + unchanged:
+        doc_type, name, content = planned[filepath]
+        source_hash = _source_hash(config, doc_type, name, stems)
+        entry = index.get(doc_type, filepath.stem)
+        if filepath in kept and entry is not None and entry.source_hash == source_hash:
+            continue
+        updates.append((doc_type, filepath.stem, filepath, content, source_hash))
+    if updates:
+        entries = index.put_many(updates)
+        search.put_many([(entry, update[3]) for entry, update in zip(entries, updates)],
+                        index.generation)
+
+
+def _source_hash(config, doc_type: str, name: str,
+                 stems: dict[str, list[str]]) -> Optional[str]:
+    """Hash des dokumentierten Moduls (nur für Modul-Dokus).
+
+    Args:
+        stems: Module nach Dateinamen-Schreibweise, wird beim ersten
+            Bedarf gefüllt und für den ganzen Stapel wiederverwendet
+    """
+    if doc_type != "module":
+        return None
+    path = config.module_to_path(name)
+    if not path.is_file():
+        # Name in Dateinamen-Schreibweise (Order_Validation)
+        if not stems:
+            for module in get_module_index(config).names:
+                stems.setdefault(sanitize_filename(module), []).append(module)
+        modules = stems.get(sanitize_filename(name), [])
+        if len(modules) != 1:
+            return None
+        path = config.module_to_path(modules[0])
+    return compute_hash(path)
 
 
 def read_doc(config, doc_type: str, name: str) -> str:
@@ -56,47 +192,286 @@ def read_doc(config, doc_type: str, name: str) -> str:
     return filepath.read_text(encoding="utf-8")
 
 
-def list_docs(config, doc_type: str = "") -> str:
-    """Listet vorhandene Dokumentation auf.
+def _splice(head: str, block: str, tail: str) -> str:
+    """Setzt Kopf, Block und Rest zusammen, getrennt durch je eine Leerzeile."""
+    result = head.rstrip("\n") + "\n" if head.strip("\n") else ""
+    block = block.strip("\n")
+    if block:
+        result += ("\n" if result else "") + block + "\n"
+    if tail:
+        result += ("\n" if result else "") + tail
+    return result
+
+
+def _edit_section(config, doc_type: str, name: str, edit) -> str:
+    """Liest eine Doku-Datei, wendet `edit(content, sections)` an und speichert.
+
+    `edit` liefert (neuer Inhalt, Meldung) oder wirft LookupError.
+    """
+    if doc_type not in config.doc_types:
+        return f"Ungültiger Typ '{doc_type}'. Erlaubt: {config.doc_types}"
+
+    safe_name = sanitize_filename(name)
+    filepath = config.docs_root / f"{doc_type}s" / f"{safe_name}.md"
+    with _EDIT_LOCK:
+        try:
+            content, sections = read_sections(filepath)
+        except FileNotFoundError:
+            return f"Dokumentation nicht gefunden: {filepath}"
+        try:
+            new_content, message = edit(content, sections)
+        except LookupError as e:
+            return str(e)
+        _write_docs(config, [(doc_type, name, new_content)])
+        remember(filepath, parse_sections(new_content))
+    return f"{message}: {filepath}"
+
+
+def patch_doc(config, doc_type: str, name: str, section_heading: str, new_body: str) -> str:
+    """Ersetzt den Inhalt eines Abschnitts, der Rest der Datei bleibt.
+
+    Args:
+        config: Konfiguration
+        doc_type: 'module', 'table', 'flow' oder 'note'
+        name: Name der Datei (ohne .md)
+        section_heading: Überschrift, z.B. 'Zweck' oder '## Zweck'
+            (mit # nur auf dieser Ebene)
+        new_body: Neuer Inhalt unter der Überschrift (ersetzt auch
+            Unterabschnitte)
+
+    Returns:
+        Bestätigung oder Fehlermeldung
+    """
+    def edit(content, sections):
+        section = find_section(sections, section_heading)
+        new_content = _splice(content[:section.body_start], new_body, content[section.end:])
+        return new_content, f"Abschnitt '{section.title}' ersetzt"
+
+    return _edit_section(config, doc_type, name, edit)
+
+
+def append_to_section(config, doc_type: str, name: str, section_heading: str, text: str) -> str:
+    """Hängt Text an das Ende eines Abschnitts an (nach seinen Unterabschnitten).
+
+    Args:
+        config: Konfiguration
+        doc_type: 'module', 'table', 'flow' oder 'note'
+        name: Name der Datei (ohne .md)
+        section_heading: Überschrift, z.B. 'Notizen' oder '## Notizen'
+        text: Anzuhängender Markdown-Text
+
+    Returns:
+        Bestätigung oder Fehlermeldung
+    """
+    def edit(content, sections):
+        section = find_section(sections, section_heading)
+        new_content = _splice(content[:section.end], text, content[section.end:])
+        return new_content, f"An Abschnitt '{section.title}' angehängt"
+
+    return _edit_section(config, doc_type, name, edit)
+
+
+def insert_section(config, doc_type: str, name: str, heading: str, body: str,
+                   after_heading: str = "") -> str:
+    """Fügt einen neuen Abschnitt ein.
+
+    Args:
+        config: Konfiguration
+        doc_type: 'module', 'table', 'flow' oder 'note'
+        name: Name der Datei (ohne .md)
+        heading: Neue Überschrift, z.B. '### `neue_sub($x)`'. Ohne #
+            eine Ebene unter after_heading bzw. '##' am Dateiende.
+        body: Inhalt des neuen Abschnitts
+        after_heading: Einfügen am Ende dieses Abschnitts (innerhalb),
+            leer = am Dateiende
+
+    Returns:
+        Bestätigung oder Fehlermeldung
+    """
+    def edit(content, sections):
+        line = heading.strip()
+        position = len(content)
+        level = 2
+        if after_heading:
+            section = find_section(sections, after_heading)
+            position = section.end
+            level = min(section.level + 1, 6)
+        if not line.startswith("#"):
+            line = f"{'#' * level} {line}"
+        text = body.strip("\n")
+        block = f"{line}\n\n{text}" if text else line
+        new_content = _splice(content[:position], block, content[position:])
+        return new_content, f"Abschnitt '{line.lstrip('#').strip()}' eingefügt"
+
+    return _edit_section(config, doc_type, name, edit)
+
+
+def list_docs(config, doc_type: str = "", pattern: str = "", cursor: str = "",
+              limit: int = 0, sort: str = "name") -> str:
+    """Listet vorhandene Dokumentation auf (seitenweise).
     
     Args:
         config: Konfiguration
         doc_type: Optional - 'module', 'table', 'flow' oder 'note'. Leer = alle.
+        pattern: Optional - Teilstring im Namen (ohne Groß/Klein)
+        cursor: Fortsetzung aus der vorigen Ausgabe
+        limit: Einträge pro Seite, 0 = max_results
+        sort: 'name' (nach Typ und Name) oder 'mtime' (neueste zuerst)
         
     Returns:
         Liste der Dokumente oder Fehlermeldung
     """
-    if doc_type:
-        if doc_type not in config.doc_types:
-            return f"Ungültiger Typ '{doc_type}'. Erlaubt: {config.doc_types}"
-        folder = config.docs_root / f"{doc_type}s"
-        if not folder.exists():
-            return f"Keine Dokumentation vom Typ: {doc_type}"
-        files = sorted(folder.glob("*.md"))
+    if doc_type and doc_type not in config.doc_types:
+        return f"Ungültiger Typ '{doc_type}'. Erlaubt: {config.doc_types}"
+    if sort not in SORT_ORDERS:
+        return f"Ungültige Sortierung '{sort}'. Erlaubt: {list(SORT_ORDERS)}"
+    if not config.docs_root.exists():
+        return "Dokumentationsverzeichnis existiert noch nicht"
+
+    index = get_doc_index(config)
+    if doc_type and not index.folder(doc_type).exists():
+        return f"Keine Dokumentation vom Typ: {doc_type}"
+
+    limit = limit if limit > 0 else config.max_results
+    try:
+        page, total, remaining = index.page(doc_type, pattern, cursor, limit, sort)
+    except ValueError as e:
+        return str(e)
+    if not total:
+        return f"Keine Dokumentation gefunden: {pattern}" if pattern else "Keine Dokumentation vorhanden"
+
+    result = []
+    if doc_type or sort != "name":
+        for entry in page:
+            result.append(entry.name if doc_type else f"{entry.doc_type}: {entry.name}")
     else:
-        if not config.docs_root.exists():
-            return "Dokumentationsverzeichnis existiert noch nicht"
-        files = sorted(config.docs_root.rglob("*.md"))
-
-    if not files:
-        return "Keine Dokumentation vorhanden"
-
-    # Gruppiert nach Typ ausgeben
-    if not doc_type:
-        result = []
-        for dt in config.doc_types:
-            folder = config.docs_root / f"{dt}s"
-            if folder.exists():
-                type_files = sorted(folder.glob("*.md"))
-                if type_files:
-                    result.append(f"\n{dt.upper()}S ({len(type_files)}):")
-                    for f in type_files[:15]:
-                        result.append(f"  - {f.stem}")
-                    if len(type_files) > 15:
-                        result.append(f"  ... und {len(type_files) - 15} weitere")
-        return "\n".join(result) if result else "Keine Dokumentation vorhanden"
+        # Gruppiert nach Typ ausgeben
+        counts: dict[str, int] = {}
+        needle = pattern.lower()
+        for entry in index.entries():
+            if needle in entry.name.lower():
+                counts[entry.doc_type] = counts.get(entry.doc_type, 0) + 1
+        current = None
+        for entry in page:
+            if entry.doc_type != current:
+                current = entry.doc_type
+                result.append(f"\n{current.upper()}S ({counts[current]}):")
+            result.append(f"  - {entry.name}")
     
-    return "\n".join(f.stem for f in files[:50])
+    if remaining > 0 and page:
+        next_cursor = index.cursor_for(page[-1], sort)
+        result.append(f"\n... {remaining} weitere (weiter mit cursor='{next_cursor}')")
+    return "\n".join(result)
+
+
+def search_docs(config, query: str, doc_type: str = "", limit: int = 0) -> str:
+    """Durchsucht die Dokumentation, sortiert nach Relevanz (BM25).
+
+    Args:
+        config: Konfiguration
+        query: Suchbegriffe (ohne Groß/Klein)
+        doc_type: Optional - 'module', 'table', 'flow' oder 'note'. Leer = alle.
+        limit: Maximale Anzahl Treffer, 0 = max_results
+
+    Returns:
+        Dokumente mit Score und passender Zeile oder Fehlermeldung
+    """
+    if not query.strip():
+        return "Kein Suchbegriff angegeben"
+    if doc_type and doc_type not in config.doc_types:
+        return f"Ungültiger Typ '{doc_type}'. Erlaubt: {config.doc_types}"
+    if not config.docs_root.exists():
+        return "Dokumentationsverzeichnis existiert noch nicht"
+
+    limit = limit if limit > 0 else config.max_results
+    hits, total = get_doc_search(config).search(query, doc_type, limit)
+    if not hits:
+        return f"Keine Treffer für: {query}"
+
+    result = [f"Treffer für '{query}' ({total} Dokumente):"]
+    for hit in hits:
+        result.append(f"\n{hit.key} (Score {hit.score:.2f})")
+        if hit.snippet:
+            result.append(f"  {hit.line}: {hit.snippet}")
+    if total > len(hits):
+        result.append(f"\n... {total - len(hits)} weitere (max. {limit})")
+    return "\n".join(result)
+
+
+def doc_backlinks(config, doc_type: str, name: str) -> str:
+    """Listet die Dokumente, die per [[...]] auf eine Doku-Datei verweisen.
+
+    Args:
+        config: Konfiguration
+        doc_type: 'module', 'table', 'flow' oder 'note'
+        name: Name der Datei (ohne .md), z.B. 'Order::Base'
+
+    Returns:
+        Verweisende Dokumente oder Fehlermeldung
+    """
+    if doc_type not in config.doc_types:
+        return f"Ungültiger Typ '{doc_type}'. Erlaubt: {config.doc_types}"
+    if not config.docs_root.exists():
+        return "Dokumentationsverzeichnis existiert noch nicht"
+
+    safe_name = sanitize_filename(name)
+    index = get_doc_index(config)
+    backlinks = index.backlinks(safe_name)
+    key = f"{doc_type}/{safe_name}"
+    missing = "" if index.get(doc_type, safe_name) else " (Datei fehlt)"
+    if not backlinks:
+        return f"Keine Verweise auf {key}{missing}"
+
+    result = [f"Verweise auf {key}{missing} ({len(backlinks)}):"]
+    for entry, target in backlinks:
+        result.append(f"  - {entry.doc_type}: {entry.name} ([[{target}]])")
+    return "\n".join(result)
+
+
+def broken_links(config, doc_type: str = "") -> str:
+    """Findet Wiki-Links, zu denen es keine Doku-Datei gibt.
+
+    Link-Ziele werden zusätzlich mit den Modulen unter lib abgeglichen:
+    so lässt sich unterscheiden, ob nur die Doku eines existierenden
+    Moduls fehlt oder das Ziel gar nicht existiert.
+
+    Args:
+        config: Konfiguration
+        doc_type: Optional - nur Links aus Dokumenten dieses Typs. Leer = alle.
+
+    Returns:
+        Defekte Links gruppiert oder Fehlermeldung
+    """
+    if doc_type and doc_type not in config.doc_types:
+        return f"Ungültiger Typ '{doc_type}'. Erlaubt: {config.doc_types}"
+    if not config.docs_root.exists():
+        return "Dokumentationsverzeichnis existiert noch nicht"
+
+    broken = get_doc_index(config).broken_links(doc_type)
+    if not broken:
+        return "Keine defekten Links"
+
+    modules = {}
+    if config.lib_path.exists():
+        modules = {link_key(m): m for m in get_module_index(config).names}
+    undocumented, unknown = [], []
+    for entry, target in broken:
+        module = modules.get(link_key(target))
+        if module:
+            undocumented.append(f"{entry.key} -> [[{target}]] (Modul {module})")
+        else:
+            unknown.append(f"{entry.key} -> [[{target}]]")
+
+    sources = len({entry.key for entry, _ in broken})
+    result = [f"Defekte Links: {len(broken)} in {sources} Dokumenten"]
+    for title, lines in (("MODUL OHNE DOKU", undocumented), ("NICHT GEFUNDEN", unknown)):
+        if not lines:
+            continue
+        result.append(f"\n{title} ({len(lines)}):")
+        result.extend(f"  {line}" for line in lines[:config.max_results])
+        if len(lines) > config.max_results:
+            result.append(f"  ... {len(lines) - config.max_results} weitere")
+    return "\n".join(result)
 
 
 def delete_doc(config, doc_type: str, name: str) -> str:
@@ -119,7 +494,11 @@ def delete_doc(config, doc_type: str, name: str) -> str:
     if not filepath.exists():
         return f"Dokumentation nicht gefunden: {filepath}"
 
+    index = get_doc_index(config)
+    search = get_doc_search(config)
     filepath.unlink()
+    index.remove(doc_type, safe_name)
+    search.remove(doc_type, safe_name, index.generation)
     return f"Gelöscht: {filepath}"
 
 
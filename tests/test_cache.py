@@ -0,0 +1,71 @@
+"""Tests für tools/cache.py (Modul-Cache)."""
+import pytest
+from code.tools.cache import ModuleCache, get_module_record
+
+
+class TestModuleCache:
+    """Tests für ModuleCache."""
+    
+    def test_parse_record(self, config):
+        """Modul wird vollständig geparst."""
+        cache = ModuleCache()
+        record = cache.get(config.module_to_path("Order::Validation"))
+        assert record.packages == ["Order::Validation"]
+        assert record.sub_names == ["validate_order", "validate_payment"]
+        assert "Order::Base" in record.dependencies
+        assert record.line_count == 17
+        assert record.line_offsets[1] == len("package Order::Validation;\n")
+    
+    def test_hit_on_unchanged_file(self, config):
+        """Zweiter Zugriff ohne erneutes Parsen."""
+        cache = ModuleCache()
+        path = config.module_to_path("Order::Base")
+        first = cache.get(path)
+        second = cache.get(path)
+        assert first is second
+        assert cache.hits == 1
+        assert cache.misses == 1
+    
+    def test_invalidated_on_change(self, config):
+        """Geänderte Datei wird neu geparst."""
+        cache = ModuleCache()
+        path = config.module_to_path("Order::Base")
+        cache.get(path)
+        path.write_text(path.read_text() + "sub extra { }\n")
+        
+        record = cache.get(path)
+        assert "extra" in record.sub_names
+        assert cache.misses == 2
+    
+    def test_missing_file(self, config):
+        """Nicht vorhandene Datei."""
+        cache = ModuleCache()
+        assert cache.get(config.module_to_path("Does::Not::Exist")) is None
+    
+    def test_entry_limit(self, config):
+        """LRU verdrängt älteste Einträge."""
+        cache = ModuleCache(max_entries=2)
+        for name in ("Order::Base", "Order::Validation", "Payment::Gateway"):
+            cache.get(config.module_to_path(name))
+        assert len(cache) == 2
+        
+        cache.get(config.module_to_path("Order::Base"))
+        assert cache.misses == 4
+    
+    def test_memory_limit(self, config):
+        """Einträge über dem Speicherlimit werden nicht gehalten."""
+        cache = ModuleCache(max_bytes=10)
+        record = cache.get(config.module_to_path("Order::Base"))
+        assert record is not None
+        assert len(cache) == 0
+
+
+class TestGetModuleRecord:
+    """Tests für get_module_record()."""
+    
+    def test_uses_config_limits(self, config):
+        """Limits aus der Konfiguration werden übernommen."""
+        config.cache_max_entries = 1
+        get_module_record(config, "Order::Base")
+        record = get_module_record(config, "Payment::Gateway")
+        assert record.packages == ["Payment::Gateway"]
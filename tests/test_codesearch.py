@@ -0,0 +1,143 @@
+"""Tests für tools/codesearch.py (Code-Suche)."""
+import re
+
+import pytest
+from code.tools import codesearch
+from code.tools.codesearch import get_code_search, required_literals, trigrams
+
+
+class TestRequiredLiterals:
+    """Tests für required_literals()."""
+    
+    def test_plain(self):
+        """Reiner Text ist ein Literal."""
+        assert required_literals("validate_order") == ["validate_order"]
+    
+    def test_meta_characters(self):
+        """Metazeichen trennen, optionale Zeichen fallen weg."""
+        assert required_literals(r"sub\s+validate_\w+") == ["sub", "validate_"]
+        assert required_literals("colou?r_code") == ["colo", "r_code"]
+        assert required_literals(r"Order::Base\.pm") == ["Order::Base.pm"]
+    
+    def test_groups_and_alternatives(self):
+        """Gruppen und Alternativen liefern keine Pflicht-Literale."""
+        assert required_literals("(foo)?barbaz") == ["barbaz"]
+        assert required_literals("foo|bar") == []
+    
+    def test_counted_quantifiers(self):
+        """{m}, {m,} und {m,n} sind keine Literale, das Zeichen davor ist optional."""
+        assert required_literals("x{10,20}") == []
+        assert required_literals("fo{1,2}bar") == ["bar"]
+        assert required_literals("abcd{2}efg") == ["abc", "efg"]
+        assert required_literals("order{0,}_id") == ["orde", "_id"]
+        assert required_literals("abc{x}def") == ["abc{x", "def"]
+
+    def test_escapes(self):
+        """Hex-, Unicode-, Oktal- und benannte Escapes beenden ein Literal."""
+        assert required_literals(r"\x24x \+ 7") == ["x + 7"]
+        assert required_literals(r"\u00e4bcd_id") == ["bcd_id"]
+        assert required_literals(r"\N{DOLLAR SIGN}order") == ["order"]
+        assert required_literals(r"\0441abc") == ["abc"]
+
+    def test_verbose(self):
+        """Im verbose-Modus werden keine Literale abgeleitet."""
+        assert required_literals("(?x) valid ate") == []
+        assert required_literals("(?ix)order _id") == []
+
+
+class TestCodeSearchIndex:
+    """Tests für CodeSearchIndex."""
+    
+    def test_candidates(self, config):
+        """Trigramme grenzen Kandidaten ein."""
+        idx = get_code_search(config)
+        assert idx.candidates(["payment_data"]) == ["Order::Validation"]
+        assert idx.candidates(["bless"]) == ["Order::Base"]
+        assert len(idx.candidates([])) == 3
+    
+    def test_search_with_context(self, config):
+        """Treffer mit Zeilennummer und Kontext."""
+        idx = get_code_search(config)
+        matches = list(idx.search("BLESS"))
+        assert len(matches) == 1
+        assert (matches[0].module, matches[0].line) == ("Order::Base", 7)
+        assert [n for n, _ in matches[0].context] == [6, 7, 8]
+    
+    def test_regex(self, config):
+        """Regex-Suche."""
+        idx = get_code_search(config)
+        matches = list(idx.search(r"^sub\s+validate_\w+", regex=True))
+        assert [m.line for m in matches] == [7, 12]
+    
+    def test_regex_counted_quantifier(self, config, temp_project):
+        """Wiederholungsangaben filtern echte Treffer nicht weg."""
+        (temp_project / "lib" / "Order" / "Repeat.pm").write_text("package Order::Repeat;\n# xxxxxxxxxxxx\n")
+        matches = list(get_code_search(config).search("x{10,20}", regex=True))
+        assert [(m.module, m.line) for m in matches] == [("Order::Repeat", 2)]
+    
+    def test_regex_escapes(self, config, temp_project):
+        """Hex-Escapes und verbose-Muster filtern echte Treffer nicht weg."""
+        (temp_project / "lib" / "Order" / "Calc.pm").write_text("package Order::Calc;\nmy $y = $x + 7;\n")
+        idx = get_code_search(config)
+        for pattern in (r"\x24x \+ 7", r"(?x) \$ x \s \+ \s 7"):
+            matches = list(idx.search(pattern, regex=True))
+            assert [(m.module, m.line) for m in matches] == [("Order::Calc", 2)]
+    
+    def test_invalid_regex(self, config):
+        """Ungültiger Regex."""
+        idx = get_code_search(config)
+        with pytest.raises(re.error):
+            list(idx.search("(unclosed", regex=True))
+    
+    def test_incremental(self, config, temp_project):
+        """Geänderte Dateien werden neu indiziert."""
+        idx = get_code_search(config)
+        path = temp_project / "lib" / "Payment" / "Gateway.pm"
+        path.write_text(path.read_text() + "# refund_handler\n")
+        
+        assert idx.refresh() == 1
+        assert idx.candidates(["refund_handler"]) == ["Payment::Gateway"]
+        assert idx.refresh() == 0
+    
+    def test_removed(self, config, temp_project):
+        """Gelöschte Dateien verschwinden aus den Postings, auch bei neu vergebener ID."""
+        idx = get_code_search(config)
+        (temp_project / "lib" / "Payment" / "Gateway.pm").unlink()
+        assert idx.refresh() == 1
+        assert idx.candidates(["amount"]) == []
+        (temp_project / "lib" / "Payment" / "Refund.pm").write_text("package Payment::Refund;\n")
+        assert idx.refresh() == 1
+        assert idx.candidates(["amount"]) == []
+        assert idx.candidates(["refund"]) == ["Payment::Refund"]
+    
+    def test_small_blocks(self, config, temp_project, monkeypatch):
+        """Postings über mehrere Blöcke verteilt."""
+        monkeypatch.setattr(codesearch, "BLOCK_BITS", 1)
+        idx = get_code_search(config)
+        assert idx.candidates(["return 1"]) == ["Order::Validation", "Payment::Gateway"]
+        assert len(idx.candidates(["package"])) == 3
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        path.write_text(path.read_text().replace("bless", "return 1;"))
+        assert idx.refresh() == 1
+        assert idx.candidates(["bless"]) == []
+        assert len(idx.candidates(["return 1"])) == 3
+    
+    def test_revalidation_rate_limited(self, config, temp_project, monkeypatch):
+        """get_code_search gleicht höchstens einmal pro Intervall ab."""
+        get_code_search(config)
+        path = temp_project / "lib" / "Payment" / "Gateway.pm"
+        path.write_text(path.read_text() + "# refund_handler\n")
+        
+        monkeypatch.setattr(codesearch, "REVALIDATE_INTERVAL", 3600.0)
+        assert get_code_search(config).candidates(["refund_handler"]) == []
+        monkeypatch.setattr(codesearch, "REVALIDATE_INTERVAL", 0.0)
+        assert get_code_search(config).candidates(["refund_handler"]) == ["Payment::Gateway"]
+    
+    def test_persisted(self, config):
+        """Index liegt als Datenbank unter docs_root."""
+        get_code_search(config)
+        assert (config.index_dir / "code_search.db").exists()
+    
+    def test_trigrams_case_insensitive(self):
+        """Trigramme ignorieren Groß/Klein."""
+        assert trigrams("ABC") == trigrams("abc")
@@ -28,6 +28,21 @@ class TestConfig:
         config = Config(docs_root=tmp_path)
         assert config.hash_file == tmp_path / ".module_hashes.json"
     
+    def test_tracker_db(self, tmp_path):
+        """tracker_db Property."""
+        config = Config(docs_root=tmp_path)
+        assert config.tracker_db == tmp_path / ".module_hashes.db"
+    
+    def test_snapshot_dir(self, tmp_path):
+        """snapshot_dir Property."""
+        config = Config(docs_root=tmp_path)
+        assert config.snapshot_dir == tmp_path / ".snapshots"
+    
+    def test_index_dir(self, tmp_path):
+        """index_dir Property."""
+        config = Config(docs_root=tmp_path)
+        assert config.index_dir == tmp_path / ".index"
+    
     def test_module_to_path(self, tmp_path):
         """Modulname zu Pfad konvertieren."""
         config = Config(project_root=tmp_path)
@@ -63,15 +78,45 @@ project:
   
 docs:
   root: ~/test-docs
+  fsync: batch
 
 server:
   http_port: 9999
+
+cache:
+  max_entries: 10
+  max_bytes: 4096
+
+performance:
+  workers: 3
+
+tracker:
+  backend: sqlite
+  mode: git
 """)
         
         config = load_config(config_file)
         assert str(config.project_root) == "/test/project"
         assert config.lib_subdir == "src"
         assert config.http_port == 9999
+        assert config.cache_max_entries == 10
+        assert config.cache_max_bytes == 4096
+        assert config.workers == 3
+        assert config.tracker_backend == "sqlite"
+        assert config.tracker_mode == "git"
+        assert config.docs_fsync == "batch"
+    
+    @pytest.mark.parametrize("section, key, value, setting", [
+        ("docs", "fsync", "always", "docs.fsync"),
+        ("tracker", "backend", "postgres", "tracker.backend"),
+        ("tracker", "mode", "sha1", "tracker.mode"),
+    ])
+    def test_invalid_choice(self, tmp_path, section, key, value, setting):
+        """Ungültige Auswahl-Werte werden schon beim Laden abgelehnt."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f"{section}:\n  {key}: {value}\n")
+        with pytest.raises(ValueError, match=f"Ungültiger Wert für {setting}: '{value}'"):
+            load_config(config_file)
     
     def test_load_nonexistent_file(self, tmp_path):
         """Nicht existierende Datei."""
@@ -0,0 +1,72 @@
+"""Tests für tools/coverage.py (Verarbeitung)."""
+import pytest
+from code.tools import coverage, tracker, writer
+
+
+class TestCoverageReport:
+    """Tests für coverage_report()."""
+    
+    def test_untracked(self, config):
+        """Ohne Markierungen ist alles nicht erfasst."""
+        result = coverage.coverage_report(config)
+        assert "Module unter lib: 3" in result
+        assert "Nicht erfasst: 3" in result
+        assert "Order::Validation" in result
+    
+    def test_categories(self, config, temp_project):
+        """Dokumentiert, veraltet, nicht erfasst und verwaist."""
+        tracker.mark_modules_documented(config, ["Order::Base", "Order::Validation"])
+        path = temp_project / "lib" / "Order" / "Validation.pm"
+        path.write_text(path.read_text() + "# Modified\n")
+        writer.write_doc(config, "module", "Payment::Gateway", "# Gateway")
+        writer.write_doc(config, "module", "Old::Module", "# Alt")
+        
+        cov = coverage.get_coverage(config)
+        assert cov.documented == ["Order::Base"]
+        assert cov.stale == ["Order::Validation"]
+        assert cov.untracked == ["Payment::Gateway"]
+        assert cov.with_doc == {"Payment::Gateway"}
+        assert cov.orphaned_docs == ["Old_Module"]
+        
+        result = coverage.coverage_report(config)
+        assert "Nicht erfasst: 1 (davon 1 mit Doku-Datei)" in result
+        assert "Payment::Gateway (Doku vorhanden)" in result
+        assert "modules/Old_Module.md (kein Modul)" in result
+    
+    def test_missing_module(self, config, temp_project):
+        """Markierte, inzwischen gelöschte Module sind verwaist."""
+        tracker.mark_documented(config, "Payment::Gateway")
+        (temp_project / "lib" / "Payment" / "Gateway.pm").unlink()
+        
+        result = coverage.coverage_report(config, "orphaned")
+        assert "Payment::Gateway (markiert, Modul fehlt)" in result
+    
+    def test_stale_is_cached(self, config, temp_project, monkeypatch):
+        """Veraltete Module werden nicht erneut gehasht."""
+        tracker.mark_documented(config, "Order::Base")
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        path.write_text(path.read_text() + "# Modified\n")
+        assert coverage.get_coverage(config).stale == ["Order::Base"]
+        
+        monkeypatch.setattr(tracker, "compute_hash", lambda path: pytest.fail("gehasht"))
+        assert coverage.get_coverage(config).stale == ["Order::Base"]
+        
+        # Neu markiert: Record-Hash ändert sich, Cache greift nicht mehr
+        monkeypatch.undo()
+        tracker.mark_documented(config, "Order::Base")
+        assert coverage.get_coverage(config).documented == ["Order::Base"]
+    
+    def test_pagination(self, config):
+        """Listen werden seitenweise ausgegeben."""
+        first = coverage.coverage_report(config, "untracked", limit=2)
+        assert "Order::Base" in first and "Order::Validation" in first
+        assert "Payment::Gateway" not in first
+        assert "1 weitere (offset=2)" in first
+        
+        second = coverage.coverage_report(config, "untracked", offset=2, limit=2)
+        assert "Payment::Gateway" in second
+        assert "weitere" not in second
+    
+    def test_invalid_category(self, config):
+        """Ungültige Kategorie."""
+        assert "ungültige kategorie" in coverage.coverage_report(config, "foo").lower()
@@ -0,0 +1,267 @@
+"""Tests für tools/docindex.py (Doku-Index)."""
+import os
+
+import pytest
+from code.tools import docindex, writer
+from code.tools.docindex import (
+    DocIndex, get_doc_index, link_key, parse_front_matter, parse_links,
+)
+from code.tools.persist import write_json_atomic
+
+
+class TestFrontMatter:
+    """Tests für parse_front_matter()."""
+    
+    def test_fields(self):
+        """YAML-Felder am Dateianfang."""
+        content = "---\nstatus: draft\ntags: [a, b]\ndate: 2024-01-02\n---\n# Titel\n"
+        assert parse_front_matter(content) == {
+            "status": "draft", "tags": ["a", "b"], "date": "2024-01-02",
+        }
+    
+    def test_nested_dates(self):
+        """Datumsangaben in Listen und verschachtelten Feldern als Text."""
+        content = "---\ndates: [2024-01-01]\nreview:\n  am: 2024-02-03\n---\n"
+        assert parse_front_matter(content) == {
+            "dates": ["2024-01-01"], "review": {"am": "2024-02-03"},
+        }
+    
+    def test_missing_or_invalid(self):
+        """Ohne oder mit kaputtem Front-Matter."""
+        assert parse_front_matter("# Titel\n---\n") == {}
+        assert parse_front_matter("---\n: [\n---\n") == {}
+        assert parse_front_matter("---\nkein ende\n") == {}
+
+
+class TestDocIndex:
+    """Tests für DocIndex."""
+    
+    def test_write_and_delete_update_index(self, config):
+        """write_doc/delete_doc pflegen den Index."""
+        writer.write_doc(config, "module", "Order::Base", "---\nstatus: ok\n---\n# Base\n")
+        index = get_doc_index(config, refresh=False)
+        entry = index.get("module", "Order_Base")
+        assert entry.meta == {"status": "ok"}
+        assert entry.size == len("---\nstatus: ok\n---\n# Base\n")
+        assert entry.source_hash is not None
+        
+        writer.delete_doc(config, "module", "Order::Base")
+        assert index.get("module", "Order_Base") is None
+    
+    def test_source_hash_from_file_name(self, config):
+        """Quell-Hash auch bei Namen in Dateinamen-Schreibweise."""
+        writer.write_doc(config, "module", "Order_Validation", "# V")
+        writer.write_doc(config, "note", "Order::Base", "# Notiz")
+        index = get_doc_index(config, refresh=False)
+        assert index.get("module", "Order_Validation").source_hash is not None
+        assert index.get("note", "Order_Base").source_hash is None
+    
+    def test_persisted(self, config):
+        """Index wird gespeichert und ohne Einlesen wieder geladen."""
+        writer.write_doc(config, "table", "orders", "# Orders")
+        loaded = DocIndex(config.docs_root, config.doc_types, config.index_dir / "docs.db")
+        try:
+            assert loaded.refresh() is False
+            assert [e.key for e in loaded.entries()] == ["table/orders"]
+        finally:
+            loaded.close()
+    
+    def test_only_changed_rows_written(self, config):
+        """Schreiben und Löschen ändern nur die eigene Zeile."""
+        writer.write_docs(config, [
+            {"doc_type": "note", "name": name, "content": f"# {name}"} for name in "abc"
+        ])
+        index = get_doc_index(config, refresh=False)
+        statements = []
+        index._db.set_trace_callback(statements.append)
+        writer.write_doc(config, "note", "b", "# neu")
+        writer.delete_doc(config, "note", "c")
+        index._db.set_trace_callback(None)
+        writes = [s for s in statements if s.startswith(("INSERT", "DELETE"))]
+        assert len(writes) == 2 and "note/b" in writes[0] and "note/c" in writes[1]
+        loaded = DocIndex(config.docs_root, config.doc_types, config.index_dir / "docs.db")
+        try:
+            assert [e.key for e in loaded.entries()] == ["note/a", "note/b"]
+            assert loaded.get("note", "b").size == len("# neu")
+        finally:
+            loaded.close()
+    
+    def test_legacy_json_migrated(self, config):
+        """Eine ältere docs.json wird samt Quell-Hash übernommen und gelöscht."""
+        path = config.docs_root / "notes" / "a.md"
+        path.parent.mkdir()
+        path.write_text("# A")
+        st = path.stat()
+        legacy = config.index_dir / "docs.json"
+        write_json_atomic(legacy, {
+            "version": 2,
+            "docs_root": str(config.docs_root),
+            "docs": {"note/a": {"doc_type": "note", "name": "a", "size": st.st_size,
+                                "mtime_ns": st.st_mtime_ns, "meta": {},
+                                "source_hash": "abc", "links": []}},
+        })
+        index = get_doc_index(config)
+        assert index.get("note", "a").source_hash == "abc"
+        assert not legacy.exists()
+    
+    def test_revalidation_rate_limited(self, config, monkeypatch):
+        """get_doc_index gleicht höchstens einmal pro Intervall ab."""
+        writer.write_doc(config, "note", "a", "# A")
+        get_doc_index(config)
+        (config.docs_root / "notes" / "b.md").write_text("# B")
+        
+        monkeypatch.setattr(docindex, "REVALIDATE_INTERVAL", 3600.0)
+        assert get_doc_index(config).get("note", "b") is None
+        monkeypatch.setattr(docindex, "REVALIDATE_INTERVAL", 0.0)
+        assert get_doc_index(config).get("note", "b") is not None
+    
+    def test_date_list_persisted(self, config):
+        """Datumsangaben in Listen verhindern weder Speichern noch Auflisten."""
+        writer.write_doc(config, "note", "a", "---\ndates: [2024-01-01]\n---\n# A\n")
+        assert get_doc_index(config).get("note", "a").meta == {"dates": ["2024-01-01"]}
+        assert "NOTES (1):" in writer.list_docs(config)
+    
+    def test_external_changes(self, config):
+        """Dateien, die von außen angelegt werden, werden erkannt."""
+        writer.write_doc(config, "note", "a", "# A")
+        index = get_doc_index(config)
+        folder = config.docs_root / "notes"
+        (folder / "b.md").write_text("---\ntag: x\n---\n")
+        
+        assert index.refresh() is True
+        assert index.get("note", "b").meta == {"tag": "x"}
+        assert index.get("note", "a").meta == {}
+    
+    def test_edited_in_place(self, config):
+        """Direkt bearbeitete Dateien werden erkannt (Ordner-mtime bleibt gleich)."""
+        writer.write_doc(config, "note", "a", "# A")
+        index = get_doc_index(config)
+        folder = config.docs_root / "notes"
+        folder_mtime = folder.stat().st_mtime_ns
+        path = folder / "a.md"
+        with open(path, "w") as f:
+            f.write("---\nstatus: neu\n---\n")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        os.utime(folder, ns=(folder_mtime, folder_mtime))
+        
+        assert index.refresh() is True
+        assert index.get("note", "a").meta == {"status": "neu"}
+        assert index.refresh() is False
+
+
+class TestListDocsPaging:
+    """Tests für list_docs() mit Cursor."""
+    
+    @pytest.fixture
+    def many(self, config):
+        for i in range(5):
+            writer.write_doc(config, "note", f"note{i}", f"# {i}")
+        writer.write_doc(config, "module", "Mod", "# Mod")
+        return config
+    
+    def test_pages(self, many):
+        """Seiten schließen lückenlos aneinander an."""
+        first = writer.list_docs(many, "note", limit=2)
+        assert first.split("\n")[:2] == ["note0", "note1"]
+        assert "3 weitere (weiter mit cursor='note/note1')" in first
+        
+        second = writer.list_docs(many, "note", cursor="note/note1", limit=2)
+        assert second.split("\n")[:2] == ["note2", "note3"]
+        last = writer.list_docs(many, "note", cursor="note/note3", limit=2)
+        assert last == "note4"
+    
+    def test_grouped_with_totals(self, many):
+        """Ohne Typ gruppiert, Kopfzeilen mit Gesamtzahl."""
+        result = writer.list_docs(many, limit=3)
+        assert "MODULES (1):\n  - Mod" in result
+        assert "NOTES (5):\n  - note0\n  - note1" in result
+        assert "cursor='note/note1'" in result
+    
+    def test_pattern_and_mtime(self, many):
+        """Filter nach Namen und Sortierung nach mtime."""
+        writer.write_doc(many, "note", "note2", "# 2 neu")
+        
+        assert writer.list_docs(many, pattern="NOTE3") == "\nNOTES (1):\n  - note3"
+        assert writer.list_docs(many, sort="mtime", limit=1).startswith("note: note2")
+    
+    def test_invalid_cursor(self, many):
+        """Ungültiger Cursor."""
+        assert "ungültiger cursor" in writer.list_docs(many, sort="mtime", cursor="x").lower()
+
+
+class TestWikiLinks:
+    """Tests für Wiki-Links, doc_backlinks() und broken_links()."""
+    
+    def test_parse_links(self):
+        """Abschnitt, Alias und Einbettung; Duplikate einmal."""
+        content = "[[Order::Base]] [[Order::Base#Subs]] ![[flows/export.md|Export]] [[#lokal]]"
+        assert parse_links(content) == ["Order::Base", "flows/export.md"]
+        assert link_key("flows/Export.md") == "export"
+        assert link_key("Order::Base") == "order_base"
+    
+    def test_backlinks(self, config):
+        """Verweise über alle Typen, auch auf fehlende Dateien."""
+        writer.write_doc(config, "module", "Order::Base", "# Base")
+        writer.write_doc(config, "flow", "export", "Nutzt [[Order::Base|Basis]]")
+        writer.write_doc(config, "note", "n", "Siehe [[order_base]] und [[Fehlt]]")
+        
+        result = writer.doc_backlinks(config, "module", "Order::Base")
+        assert result == (
+            "Verweise auf module/Order_Base (2):\n"
+            "  - flow: export ([[Order::Base]])\n"
+            "  - note: n ([[order_base]])"
+        )
+        assert "(Datei fehlt) (1)" in writer.doc_backlinks(config, "note", "Fehlt")
+        
+        writer.write_doc(config, "flow", "export", "Ohne Link")
+        assert "(1):" in writer.doc_backlinks(config, "module", "Order::Base")
+    
+    def test_links_persisted(self, config):
+        """Links liegen im gespeicherten Index."""
+        writer.write_doc(config, "note", "a", "[[b]]")
+        loaded = DocIndex(config.docs_root, config.doc_types, config.index_dir / "docs.db")
+        try:
+            assert loaded.get("note", "a").links == ["b"]
+            assert [e.key for e, _ in loaded.backlinks("b")] == ["note/a"]
+        finally:
+            loaded.close()
+    
+    def test_broken_links(self, config):
+        """Abgleich mit Doku-Dateien und Modulen unter lib."""
+        writer.write_doc(config, "module", "Order::Base", "[[Order::Validation]] [[Gibt::Es::Nicht]]")
+        writer.write_doc(config, "note", "n", "[[Order::Base]] [[note2]]")
+        
+        result = writer.broken_links(config)
+        assert result.startswith("Defekte Links: 3 in 2 Dokumenten")
+        assert ("MODUL OHNE DOKU (1):\n"
+                "  module/Order_Base -> [[Order::Validation]] (Modul Order::Validation)") in result
+        assert ("NICHT GEFUNDEN (2):\n"
+                "  module/Order_Base -> [[Gibt::Es::Nicht]]\n"
+                "  note/n -> [[note2]]") in result
+        assert "note/n" not in writer.broken_links(config, "module")
+        
+        writer.write_doc(config, "module", "Order::Validation", "# V")
+        writer.write_doc(config, "note", "note2", "# 2")
+        writer.write_doc(config, "module", "Order::Base", "# ohne Links")
+        assert writer.broken_links(config) == "Keine defekten Links"
+    
+    def test_links_edited_in_place(self, config, monkeypatch):
+        """Links aus direkt bearbeiteten Dateien erscheinen und verschwinden."""
+        monkeypatch.setattr(docindex, "REVALIDATE_INTERVAL", 0.0)
+        writer.write_doc(config, "note", "a", "# A")
+        folder = config.docs_root / "notes"
+        folder_mtime = folder.stat().st_mtime_ns
+        path = folder / "a.md"
+        
+        def edit(content, shift):
+            with open(path, "w") as f:
+                f.write(content)
+            os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + shift))
+            os.utime(folder, ns=(folder_mtime, folder_mtime))
+        
+        edit("[[Missing::Thing]]", 10**9)
+        assert "note/a -> [[Missing::Thing]]" in writer.broken_links(config)
+        assert "note: a" in writer.doc_backlinks(config, "note", "Missing::Thing")
+        
+        edit("ohne Links", 2 * 10**9)
+        assert writer.broken_links(config) == "Keine defekten Links"
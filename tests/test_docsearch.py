@@ -0,0 +1,109 @@
+"""Tests für tools/docsearch.py (Volltextsuche in der Doku)."""
+import os
+
+from code.tools import docindex, writer
+from code.tools.docsearch import DocSearchIndex, get_doc_search, tokenize
+
+
+class TestDocSearch:
+    """Tests für DocSearchIndex."""
+
+    def test_tokenize(self):
+        """Kleingeschrieben, Wörter ab 2 Zeichen, :: trennt."""
+        assert tokenize("Order::Base a B2 Prüfung") == ["order", "base", "b2", "prüfung"]
+
+    def test_ranking(self, config):
+        """Häufigere und seltenere Begriffe ranken höher."""
+        writer.write_doc(config, "note", "a", "Versand Versand Versand Rechnung")
+        writer.write_doc(config, "note", "b", "Versand Rechnung Rechnung Kunde")
+        writer.write_doc(config, "note", "c", "Kunde Kunde Kunde")
+        hits, total = get_doc_search(config).search("versand")
+        assert [h.key for h in hits] == ["note/a", "note/b"]
+        assert total == 2
+        hits, _ = get_doc_search(config).search("rechnung kunde")
+        assert hits[0].key == "note/b"
+
+    def test_doc_type_and_name(self, config):
+        """Filter nach Typ, der Name zählt als Text."""
+        writer.write_doc(config, "module", "Order::Base", "# Basis")
+        writer.write_doc(config, "note", "order", "# Notiz")
+        hits, _ = get_doc_search(config).search("order", "module")
+        assert [h.key for h in hits] == ["module/Order_Base"]
+
+    def test_write_and_delete_update_index(self, config):
+        """write_doc/delete_doc pflegen den Suchindex."""
+        writer.write_doc(config, "table", "orders", "Spalten der Auftragstabelle")
+        search = get_doc_search(config)
+        assert search.search("auftragstabelle")[1] == 1
+        writer.write_doc(config, "table", "orders", "Neuer Text")
+        assert search.search("auftragstabelle")[1] == 0
+        writer.delete_doc(config, "table", "orders")
+        assert search.search("neuer")[1] == 0
+
+    def test_external_changes(self, config, monkeypatch):
+        """Von außen geänderte Dateien werden bei der Suche erkannt."""
+        monkeypatch.setattr(docindex, "REVALIDATE_INTERVAL", 0.0)
+        writer.write_doc(config, "note", "a", "alt")
+        path = config.docs_root / "notes" / "a.md"
+        path.write_text("neu und anders")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        folder = config.docs_root / "notes"
+        os.utime(folder, ns=(st.st_atime_ns, folder.stat().st_mtime_ns + 10**9))
+        search = get_doc_search(config)
+        assert search.search("anders")[1] == 1
+        assert search.search("alt")[1] == 0
+
+    def test_edited_in_place(self, config, monkeypatch):
+        """In der Datei selbst bearbeitete Doku wird durchsuchbar."""
+        monkeypatch.setattr(docindex, "REVALIDATE_INTERVAL", 0.0)
+        writer.write_doc(config, "note", "a", "alt")
+        folder = config.docs_root / "notes"
+        folder_mtime = folder.stat().st_mtime_ns
+        path = folder / "a.md"
+        with open(path, "w") as f:
+            f.write("jetzt mit zebra")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        os.utime(folder, ns=(folder_mtime, folder_mtime))
+        assert "note/a" in writer.search_docs(config, "zebra")
+
+    def test_snippet(self, config):
+        """Zeile mit den meisten Suchbegriffen als Schnipsel."""
+        writer.write_doc(config, "flow", "export", "# Export\n\nDer Export schreibt CSV\nNur CSV\n")
+        hits, _ = get_doc_search(config).search("export csv")
+        assert (hits[0].line, hits[0].snippet) == (3, "Der Export schreibt CSV")
+
+    def test_persisted(self, config):
+        """Index liegt in der Datenbank und wird wieder geladen."""
+        writer.write_doc(config, "note", "a", "persistenter Inhalt")
+        loaded = DocSearchIndex(config.docs_root, config.index_dir / "doc_search.db")
+        try:
+            assert loaded.search("persistenter")[0][0].key == "note/a"
+        finally:
+            loaded.close()
+
+
+class TestSearchDocs:
+    """Tests für search_docs()."""
+
+    def test_output(self, config):
+        """Treffer mit Score und Zeile."""
+        writer.write_doc(config, "note", "a", "# Titel\nZahlungsart Vorkasse\n")
+        result = writer.search_docs(config, "vorkasse")
+        assert "Treffer für 'vorkasse' (1 Dokumente):" in result
+        assert "note/a (Score" in result
+        assert "  2: Zahlungsart Vorkasse" in result
+
+    def test_limit(self, config):
+        """Begrenzung mit Hinweis auf weitere Treffer."""
+        for name in ("a", "b", "c"):
+            writer.write_doc(config, "note", name, "gemeinsam")
+        result = writer.search_docs(config, "gemeinsam", limit=2)
+        assert "... 1 weitere (max. 2)" in result
+
+    def test_errors(self, config):
+        """Leere Suche, ungültiger Typ, keine Treffer."""
+        assert writer.search_docs(config, " ") == "Kein Suchbegriff angegeben"
+        assert "Ungültiger Typ" in writer.search_docs(config, "x", "foo")
+        writer.write_doc(config, "note", "a", "Text")
+        assert writer.search_docs(config, "fehlt") == "Keine Treffer für: fehlt"
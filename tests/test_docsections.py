@@ -0,0 +1,63 @@
+"""Tests für tools/docsections.py (Abschnitte von Doku-Dateien)."""
+import pytest
+from code.tools.docsections import find_section, parse_sections, read_sections
+
+DOC = """\
+---
+title: # kein Titel
+---
+# Order::Base
+
+## Zweck
+
+Text
+
+## Funktionen
+
+### `new($x)`
+
+```perl
+# kein Abschnitt
+```
+
+### `save()` ###
+
+## Notizen
+"""
+
+
+class TestParseSections:
+    """Tests für parse_sections() und find_section()."""
+    
+    def test_offsets(self):
+        """Ebenen, Zeilen und Abschnittsgrenzen."""
+        sections = parse_sections(DOC)
+        assert [(s.level, s.title, s.line) for s in sections] == [
+            (1, "Order::Base", 4), (2, "Zweck", 6), (2, "Funktionen", 10),
+            (3, "`new($x)`", 12), (3, "`save()`", 18), (2, "Notizen", 20),
+        ]
+        functions = sections[2]
+        assert DOC[functions.start:functions.body_start] == "## Funktionen\n"
+        assert DOC[functions.end:].startswith("## Notizen")
+        assert sections[0].end == len(DOC)
+    
+    def test_find(self):
+        """Suche ohne #, Backticks und Groß/Klein; mit # nur diese Ebene."""
+        sections = parse_sections(DOC)
+        assert find_section(sections, "new($x)").line == 12
+        assert find_section(sections, "## zweck").line == 6
+        with pytest.raises(LookupError):
+            find_section(sections, "### Zweck")
+        with pytest.raises(LookupError, match="mehrdeutig"):
+            find_section(parse_sections("# A\n## B\n# C\n## B\n"), "B")
+    
+    def test_read_cached(self, tmp_path):
+        """Abschnitte werden bis zur nächsten Änderung aus dem Cache geliefert."""
+        path = tmp_path / "a.md"
+        path.write_text("# A\n")
+        _, first = read_sections(path)
+        _, second = read_sections(path)
+        assert second is first
+        path.write_text("# A\n## B\n")
+        _, third = read_sections(path)
+        assert [s.title for s in third] == ["A", "B"]
@@ -0,0 +1,70 @@
+"""Tests für tools/index.py (Modul-Index)."""
+import os
+
+import pytest
+from code.tools.index import ModuleIndex, get_module_index
+
+
+def _bump_mtime(path):
+    """Setzt die mtime eines Verzeichnisses sicher auf einen neuen Wert."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+class TestModuleIndex:
+    """Tests für ModuleIndex."""
+    
+    def test_builds_names(self, config):
+        """Alle Module werden erfasst."""
+        idx = get_module_index(config)
+        assert idx.names == ["Order::Base", "Order::Validation", "Payment::Gateway"]
+        assert "Order::Base" in idx
+        assert len(idx) == 3
+    
+    def test_persisted(self, config):
+        """Index wird unter docs_root gespeichert und wieder geladen."""
+        get_module_index(config)
+        index_file = config.index_dir / "modules.json"
+        assert index_file.exists()
+        
+        loaded = ModuleIndex(config.lib_path, ".pm", "::", index_file)
+        assert loaded.names == ["Order::Base", "Order::Validation", "Payment::Gateway"]
+        # Nichts geändert -> kein Neuaufbau nötig
+        assert loaded.refresh() is False
+    
+    def test_incremental_add(self, config, temp_project):
+        """Neue Dateien werden über die Verzeichnis-mtime erkannt."""
+        idx = get_module_index(config)
+        new_file = temp_project / "lib" / "Order" / "Export.pm"
+        new_file.write_text("package Order::Export;\n1;\n")
+        _bump_mtime(new_file.parent)
+        
+        assert idx.refresh() is True
+        assert "Order::Export" in idx
+    
+    def test_incremental_remove_dir(self, config, temp_project):
+        """Gelöschte Verzeichnisse fallen aus dem Index."""
+        idx = get_module_index(config)
+        (temp_project / "lib" / "Payment" / "Gateway.pm").unlink()
+        (temp_project / "lib" / "Payment").rmdir()
+        _bump_mtime(temp_project / "lib")
+        
+        idx.refresh()
+        assert "Payment::Gateway" not in idx
+    
+    def test_search_trigram(self, config):
+        """Suche ohne Groß/Klein über Trigramme."""
+        idx = get_module_index(config)
+        assert idx.search("valid") == ["Order::Validation"]
+        assert idx.search("order::") == ["Order::Base", "Order::Validation"]
+        assert idx.search("xyz123") == []
+    
+    def test_search_short_and_path(self, config):
+        """Kurze Muster und Pfad-Schreibweise."""
+        idx = get_module_index(config)
+        assert idx.search("Ba") == ["Order::Base"]
+        assert idx.search("Order/Base.pm") == ["Order::Base"]
+    
+    def test_shared_instance(self, config):
+        """Pro Konfiguration wird eine Instanz geteilt."""
+        assert get_module_index(config) is get_module_index(config, refresh=False)
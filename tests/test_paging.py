@@ -0,0 +1,68 @@
+"""Tests für tools/paging.py (zeilenweises Lesen)."""
+import pytest
+from code.tools.paging import get_line_table, read_lines
+
+
+@pytest.fixture
+def numbered(tmp_path):
+    """Datei mit 100 nummerierten Zeilen."""
+    path = tmp_path / "Numbered.pm"
+    path.write_text("".join(f"line {i:03d}\n" for i in range(1, 101)))
+    return path
+
+
+class TestLineTable:
+    """Tests für get_line_table()."""
+    
+    def test_offsets(self, numbered):
+        """Offsets der Zeilenanfänge."""
+        table = get_line_table(numbered)
+        assert table.line_count == 100
+        assert table.offsets[1] == len("line 001\n")
+    
+    def test_cached_until_change(self, numbered):
+        """Tabelle wird bis zur nächsten Änderung wiederverwendet."""
+        first = get_line_table(numbered)
+        assert get_line_table(numbered) is first
+        
+        numbered.write_text("eins\nzwei\n")
+        assert get_line_table(numbered).line_count == 2
+    
+    def test_empty_and_missing(self, tmp_path):
+        """Leere und fehlende Dateien."""
+        empty = tmp_path / "Empty.pm"
+        empty.write_text("")
+        assert get_line_table(empty).line_count == 0
+        assert get_line_table(tmp_path / "Missing.pm") is None
+
+
+class TestReadLines:
+    """Tests für read_lines()."""
+    
+    def test_range(self, numbered):
+        """Zeilenbereich lesen."""
+        page = read_lines(numbered, 10, 12)
+        assert page.text == "line 010\nline 011\nline 012\n"
+        assert (page.start, page.end, page.total) == (10, 12, 100)
+        assert page.has_more
+    
+    def test_budget(self, numbered):
+        """Budget begrenzt auf vollständige Zeilen."""
+        page = read_lines(numbered, 1, 0, max_chars=25)
+        assert page.text == "line 001\nline 002\n"
+        assert page.end == 2
+        assert not page.truncated
+    
+    def test_long_single_line(self, tmp_path):
+        """Eine zu lange Zeile wird gekürzt."""
+        path = tmp_path / "Long.pm"
+        path.write_text("x" * 500)
+        page = read_lines(path, 1, 0, max_chars=100)
+        assert page.text == "x" * 100
+        assert page.truncated
+    
+    def test_end_beyond_file(self, numbered):
+        """end_line hinter Dateiende."""
+        page = read_lines(numbered, 99, 500)
+        assert page.text == "line 099\nline 100\n"
+        assert not page.has_more
@@ -0,0 +1,153 @@
+"""Tests für tools/project.py (Projekt-Index)."""
+import os
+
+import pytest
+from code.tools import project
+from code.tools.project import ProjectIndex, get_project_index
+
+
+def _touch_dir(path):
+    """Setzt die mtime eines Verzeichnisses sicher auf einen neuen Wert."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+class TestProjectIndex:
+    """Tests für ProjectIndex."""
+    
+    def test_dependencies_and_dependents(self, config):
+        """Vorwärts- und Rückwärtskanten."""
+        idx = get_project_index(config)
+        assert "Payment::Gateway" in idx.dependencies("Order::Validation")
+        assert idx.dependents("Payment::Gateway") == ["Order::Validation"]
+        assert idx.dependents("strict") == [
+            "Order::Base", "Order::Validation", "Payment::Gateway",
+        ]
+    
+    def test_persisted(self, config):
+        """Index wird gespeichert und ohne Neuscan wieder geladen."""
+        get_project_index(config)
+        index_file = config.index_dir / "project.json"
+        assert index_file.exists()
+        
+        loaded = ProjectIndex(config, index_file)
+        assert loaded.dependents("Order::Base") == ["Order::Validation"]
+        assert loaded.refresh() is False
+    
+    def test_incremental_change(self, config, temp_project):
+        """Geänderte Module werden neu gescannt, Kanten aktualisiert."""
+        idx = get_project_index(config)
+        path = temp_project / "lib" / "Order" / "Validation.pm"
+        path.write_text(path.read_text().replace("use Order::Base;\n", ""))
+        
+        assert idx.refresh() is True
+        assert idx.dependents("Order::Base") == []
+        assert idx.dependents("Payment::Gateway") == ["Order::Validation"]
+    
+    def test_revalidation_rate_limited(self, config, temp_project, monkeypatch):
+        """get_project_index gleicht höchstens einmal pro Intervall ab."""
+        idx = get_project_index(config)
+        path = temp_project / "lib" / "Order" / "Validation.pm"
+        path.write_text(path.read_text().replace("use Order::Base;\n", ""))
+        
+        monkeypatch.setattr(project, "REVALIDATE_INTERVAL", 3600.0)
+        assert get_project_index(config).dependents("Order::Base") == ["Order::Validation"]
+        monkeypatch.setattr(project, "REVALIDATE_INTERVAL", 0.0)
+        assert get_project_index(config).dependents("Order::Base") == []
+        assert idx is get_project_index(config)
+    
+    def test_sub_index(self, config, temp_project):
+        """Sub-Index wird inkrementell gepflegt."""
+        idx = get_project_index(config)
+        assert idx.find_sub("new") == [("Order::Base", "new", 5, 8)]
+        
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        path.write_text(path.read_text().replace("sub new", "sub create"))
+        idx.refresh()
+        assert idx.find_sub("new") == []
+        assert idx.find_sub("create") == [("Order::Base", "create", 5, 8)]
+    
+    def test_summary_fields(self, config):
+        """Zeilen und Packages werden mit gespeichert."""
+        idx = get_project_index(config)
+        summaries = dict(idx.summaries())
+        assert summaries["Order::Validation"]["lines"] == 17
+        assert summaries["Order::Validation"]["packages"] == ["Order::Validation"]
+        assert idx.fan_in("Order::Base") == 1
+        assert idx.fan_out("Order::Validation") == 2
+    
+    def test_process_pool(self, config, monkeypatch):
+        """Viele geänderte Dateien werden im Prozess-Pool gescannt."""
+        monkeypatch.setattr(project, "PARALLEL_THRESHOLD", 2)
+        config.workers = 2
+        idx = get_project_index(config)
+        assert len(idx) == 3
+        assert idx.dependents("Order::Base") == ["Order::Validation"]
+    
+    def test_removed_module(self, config, temp_project):
+        """Gelöschte Module verlieren ihre Kanten."""
+        idx = get_project_index(config)
+        (temp_project / "lib" / "Order" / "Validation.pm").unlink()
+        _touch_dir(temp_project / "lib" / "Order")
+        
+        idx.refresh()
+        assert "Order::Validation" not in idx
+        assert idx.dependents("Payment::Gateway") == []
+
+
+class TestClosure:
+    """Tests für transitive Hüllen und Zyklen."""
+    
+    @pytest.fixture
+    def chain(self, config, temp_project):
+        """Kette A -> B -> C -> A (Zyklus) und D -> A."""
+        lib = temp_project / "lib" / "Chain"
+        lib.mkdir()
+        (lib / "A.pm").write_text("package Chain::A;\nuse Chain::B;\n1;\n")
+        (lib / "B.pm").write_text("package Chain::B;\nuse Chain::C;\n1;\n")
+        (lib / "C.pm").write_text("package Chain::C;\nuse Chain::A;\n1;\n")
+        (lib / "D.pm").write_text("package Chain::D;\nuse Chain::A;\n1;\n")
+        return get_project_index(config)
+    
+    def test_dependencies_with_depth(self, chain):
+        """Tiefe wird pro Modul angegeben und begrenzt."""
+        assert chain.closure("Chain::D") == {"Chain::A": 1, "Chain::B": 2, "Chain::C": 3}
+        assert chain.closure("Chain::D", max_depth=2) == {"Chain::A": 1, "Chain::B": 2}
+    
+    def test_dependents(self, chain):
+        """Rückwärtsrichtung."""
+        reached = chain.closure("Chain::C", "dependents")
+        assert reached == {"Chain::B": 1, "Chain::A": 2, "Chain::D": 3}
+    
+    def test_cached_until_change(self, chain, temp_project):
+        """Hüllen werden gecacht und bei Änderungen verworfen."""
+        first = chain.closure("Chain::D")
+        assert chain.closure("Chain::D") is first
+        
+        (temp_project / "lib" / "Chain" / "D.pm").write_text("package Chain::D;\n1;\n")
+        chain.refresh()
+        assert chain.closure("Chain::D") == {}
+    
+    def test_cycles(self, chain):
+        """Zyklen werden als Komponenten gemeldet."""
+        nodes = ["Chain::D", *chain.closure("Chain::D")]
+        assert chain.cycles(nodes) == [["Chain::A", "Chain::B", "Chain::C"]]
+        assert chain.cycles(["Order::Validation", "Order::Base"]) == []
+    
+    def test_affected(self, chain):
+        """Mehrere geänderte Module auf einmal."""
+        affected = chain.affected(["Chain::B", "Order::Base"])
+        assert affected == {
+            "Chain::A": 1, "Order::Validation": 1, "Chain::C": 2, "Chain::D": 2,
+        }
+    
+    def test_propagate(self, chain):
+        """Abstand und auslösendes Modul, gecacht."""
+        reached = chain.propagate(["Chain::C", "Order::Base"])
+        assert reached == {
+            "Chain::B": (1, "Chain::C"),
+            "Order::Validation": (1, "Order::Base"),
+            "Chain::A": (2, "Chain::C"),
+            "Chain::D": (3, "Chain::C"),
+        }
+        assert chain.propagate(["Order::Base", "Chain::C"]) is reached
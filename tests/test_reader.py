@@ -28,6 +28,30 @@ class TestReadModule:
         
         assert len(result) < 20000
         assert "gekürzt" in result
+    
+    def test_paging(self, config, temp_project):
+        """Zeilenbereiche lesen und weiterblättern."""
+        content = "".join(f"# Zeile {i}\n" for i in range(1, 2001))
+        (temp_project / "lib" / "Big.pm").write_text(content)
+        config.max_file_size = 1000
+        
+        first = reader.read_module(config, "Big")
+        assert first.startswith("# Zeile 1\n")
+        assert "weiter mit start_line=" in first
+        
+        result = reader.read_module(config, "Big", start_line=1500, end_line=1502)
+        assert result.startswith("# Zeile 1500\n# Zeile 1501\n# Zeile 1502\n")
+        assert "Zeilen 1500-1502 von 2000" in result
+    
+    def test_paging_past_end(self, config):
+        """Startzeile hinter Dateiende."""
+        result = reader.read_module(config, "Order::Base", start_line=500)
+        assert "existiert nicht" in result
+    
+    def test_paging_inverted_range(self, config):
+        """end_line vor start_line ist ein Fehler, keine leere Seite."""
+        result = reader.read_module(config, "Order::Base", start_line=5, end_line=4)
+        assert result == "Ungültiger Bereich: end_line 4 liegt vor start_line 5"
 
 
 class TestFindModules:
@@ -66,6 +90,139 @@ class TestModuleDependencies:
         assert "keine abhängigkeiten" in result.lower()
 
 
+class TestModuleDependents:
+    """Tests für module_dependents()."""
+    
+    def test_find_dependents(self, config):
+        """Verwendende Module finden."""
+        result = reader.module_dependents(config, "Order::Base")
+        assert result == "Order::Validation"
+    
+    def test_no_dependents(self, config):
+        """Modul wird nirgends verwendet."""
+        result = reader.module_dependents(config, "Order::Validation")
+        assert "keine module verwenden" in result.lower()
+
+
+class TestDependencyClosure:
+    """Tests für dependency_closure()."""
+    
+    def test_dependencies(self, config):
+        """Transitive Abhängigkeiten mit externen Modulen."""
+        result = reader.dependency_closure(config, "Order::Validation")
+        assert "Ebene 1:" in result
+        assert "Order::Base" in result
+        assert "Extern (2): strict, warnings" in result
+    
+    def test_dependents(self, config):
+        """Transitive Verwender."""
+        result = reader.dependency_closure(config, "Order::Base", "dependents")
+        assert "Order::Validation" in result
+    
+    def test_cycle_reported(self, config, temp_project):
+        """Zyklen werden gemeldet."""
+        (temp_project / "lib" / "Order" / "Base.pm").write_text(
+            "package Order::Base;\nuse Order::Validation;\n1;\n"
+        )
+        result = reader.dependency_closure(config, "Order::Base")
+        assert "ZYKLEN (1)" in result
+        assert "Order::Base -> Order::Validation -> Order::Base" in result
+    
+    def test_invalid_direction(self, config):
+        """Ungültige Richtung."""
+        result = reader.dependency_closure(config, "Order::Base", "sideways")
+        assert "ungültige richtung" in result.lower()
+    
+    def test_unknown_module(self, config):
+        """Nicht vorhandenes Modul."""
+        result = reader.dependency_closure(config, "Does::Not::Exist")
+        assert "nicht gefunden" in result.lower()
+
+
+class TestImpactAnalysis:
+    """Tests für impact_analysis()."""
+    
+    def test_affected_by_paths_and_names(self, config):
+        """Modulnamen und Dateipfade gemischt."""
+        result = reader.impact_analysis(config, ["lib/Order/Base.pm", "Payment::Gateway"])
+        assert "Order::Base" in result
+        assert "Betroffen (1):" in result
+        assert "Order::Validation" in result
+    
+    def test_nothing_affected(self, config):
+        """Keine Verwender."""
+        result = reader.impact_analysis(config, ["Order::Validation"])
+        assert "keine weiteren module" in result.lower()
+
+
+class TestReadSub:
+    """Tests für read_sub()."""
+    
+    def test_read_single_sub(self, config):
+        """Nur die gewünschte Sub wird geliefert."""
+        result = reader.read_sub(config, "Order::Validation", "validate_payment")
+        assert "Zeilen 12-15" in result
+        assert "my ($payment_data) = @_;" in result
+        assert "validate_order" not in result
+    
+    def test_unknown_sub(self, config):
+        """Nicht vorhandene Sub listet vorhandene auf."""
+        result = reader.read_sub(config, "Order::Validation", "nope")
+        assert "nicht gefunden" in result.lower()
+        assert "validate_order" in result
+    
+    def test_unknown_module(self, config):
+        """Nicht vorhandenes Modul."""
+        result = reader.read_sub(config, "Does::Not::Exist", "new")
+        assert "nicht gefunden" in result.lower()
+
+
+class TestFindSub:
+    """Tests für find_sub()."""
+    
+    def test_exact(self, config):
+        """Exakter Name."""
+        result = reader.find_sub(config, "process")
+        assert result == "Payment::Gateway::process (Zeilen 5-8)"
+    
+    def test_partial(self, config):
+        """Teilstring ohne Groß/Klein."""
+        result = reader.find_sub(config, "VALIDATE")
+        assert "Order::Validation::validate_order" in result
+        assert "Order::Validation::validate_payment" in result
+    
+    def test_no_match(self, config):
+        """Keine Treffer."""
+        result = reader.find_sub(config, "xyz123")
+        assert "keine subs gefunden" in result.lower()
+
+
+class TestSearchCode:
+    """Tests für search_code()."""
+    
+    def test_text_search(self, config):
+        """Textsuche mit Modul und Zeile."""
+        result = reader.search_code(config, "$payment_data")
+        assert "Order::Validation:13" in result
+        assert ">   13 |" in result
+    
+    def test_no_match(self, config):
+        """Keine Treffer."""
+        result = reader.search_code(config, "xyz123")
+        assert "keine treffer" in result.lower()
+    
+    def test_max_results(self, config):
+        """Trefferzahl wird begrenzt."""
+        config.max_results = 2
+        result = reader.search_code(config, "use")
+        assert "weitere Treffer" in result
+    
+    def test_invalid_regex(self, config):
+        """Ungültiger Regex."""
+        result = reader.search_code(config, "(unclosed", regex=True)
+        assert "ungültiger regulärer ausdruck" in result.lower()
+
+
 class TestModuleStats:
     """Tests für module_stats()."""
     
@@ -76,3 +233,81 @@ class TestModuleStats:
         assert "Zeilen:" in result
         assert "validate_order" in result
         assert "validate_payment" in result
+    
+    def test_ignores_pod(self, config, temp_project):
+        """Subs in POD-Blöcken werden nicht gezählt."""
+        (temp_project / "lib" / "Documented.pm").write_text(
+            "package Documented;\n\n=head1 SYNOPSIS\n\nsub example { }\n\n=cut\n\n"
+            "sub real { }\n1;\n"
+        )
+        result = reader.module_stats(config, "Documented")
+        assert "Subroutines: 1" in result
+        assert "example" not in result
+
+
+class TestProjectStats:
+    """Tests für project_stats()."""
+    
+    def test_distribution_p90(self):
+        """P90 nach Nearest-Rank, nie unter dem Median."""
+        assert reader._distribution([0, 1]).split()[1:3] == ["0.5", "1"]
+        assert reader._distribution(list(range(1, 11))).split()[2] == "9"
+        assert reader._distribution([5]).split()[1:3] == ["5", "5"]
+    
+    def test_stats_output(self, config):
+        """Summen, Verteilungen und Top-Listen."""
+        result = reader.project_stats(config, top=2)
+        assert "Module: 3" in result
+        assert "Subroutines: 4" in result
+        assert "Interne Abhängigkeiten: 2" in result
+        assert "Fan-in" in result
+        largest = result.split("Größte Module (Zeilen):")[1].split("\n\n")[0]
+        assert "Order::Validation" in largest
+        assert len(largest.strip().splitlines()) == 2
+    
+    def test_no_modules(self, config, temp_project):
+        """Leeres lib-Verzeichnis."""
+        (temp_project / "empty").mkdir()
+        config.lib_subdir = "empty"
+        result = reader.project_stats(config)
+        assert "keine module" in result.lower()
+
+
+class TestBatch:
+    """Tests für die Batch-Varianten."""
+    
+    def test_read_modules(self, config):
+        """Mehrere Module in Reihenfolge, Duplikate entfernt."""
+        result = reader.read_modules(
+            config, ["Payment::Gateway", "Order::Base", "Payment::Gateway"]
+        )
+        assert result.count("=== ") == 2
+        assert result.index("=== Payment::Gateway") < result.index("=== Order::Base")
+        assert "sub process" in result
+    
+    def test_read_modules_budget(self, config):
+        """Budget pro Modul."""
+        result = reader.read_modules(config, ["Order::Validation", "Order::Base"], max_chars=50)
+        assert result.count("gekürzt") == 2
+    
+    def test_missing_module_in_batch(self, config):
+        """Fehlende Module werden einzeln gemeldet."""
+        result = reader.modules_stats(config, ["Order::Base", "Does::Not::Exist"])
+        assert "Subroutines: 1" in result
+        assert "Modul nicht gefunden: Does::Not::Exist" in result
+    
+    def test_modules_dependencies(self, config):
+        """Abhängigkeiten mehrerer Module."""
+        result = reader.modules_dependencies(config, ["Order::Validation", "Order::Base"])
+        assert "Payment::Gateway" in result
+        assert "=== Order::Base ===\nstrict" in result
+    
+    def test_limit(self, config):
+        """Höchstens max_results Module."""
+        config.max_results = 1
+        result = reader.modules_stats(config, ["Order::Base", "Payment::Gateway"])
+        assert "1 weitere Module nicht verarbeitet" in result
+    
+    def test_empty(self, config):
+        """Leere Liste."""
+        assert "keine module" in reader.read_modules(config, []).lower()
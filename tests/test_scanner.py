@@ -0,0 +1,127 @@
+"""Tests für tools/scanner.py (Perl-Scanner)."""
+import pytest
+from code.tools.scanner import _split_code, scan
+
+
+SOURCE = """\
+package Order::Export;
+use strict;
+use 5.010;
+use parent -norequire, 'Order::Base';
+use base qw(
+    Mixin::Logging
+);
+
+=head1 BESCHREIBUNG
+
+sub in_pod { }
+use In::Pod;
+
+=cut
+
+sub short { return 1 }
+
+sub export
+{
+    my ($self) = @_;
+    my $sql = <<"SQL";
+sub in_heredoc {
+use In::Heredoc;
+SQL
+    require Export::Csv;   # require In::Comment
+    if ($self) {
+        return "}";
+    }
+}
+
+sub forward;
+
+sub broken {
+    my $re = qr/\\{/;
+    return 1;
+}
+
+package Order::Export::Helper;
+sub helper {
+    1;
+}
+1;
+__END__
+sub after_end { }
+"""
+
+
+class TestScan:
+    """Tests für scan()."""
+    
+    def test_packages(self):
+        """Mehrere Packages pro Datei."""
+        result = scan(SOURCE)
+        assert result.packages == ["Order::Export", "Order::Export::Helper"]
+        assert result.package_blocks == [
+            ("Order::Export", 1, 37),
+            ("Order::Export::Helper", 38, 44),
+        ]
+    
+    def test_subs_with_ranges(self):
+        """Subs mit Zeilenbereich und Package."""
+        subs = {s.name: s for s in scan(SOURCE).subs}
+        assert list(subs) == ["short", "export", "forward", "broken", "helper"]
+        assert (subs["short"].start, subs["short"].end) == (16, 16)
+        assert (subs["export"].start, subs["export"].end) == (18, 29)
+        assert (subs["forward"].start, subs["forward"].end) == (31, 31)
+        assert (subs["broken"].start, subs["broken"].end) == (33, 36)
+        assert subs["helper"].package == "Order::Export::Helper"
+    
+    def test_dependencies(self):
+        """use, require und Basisklassen, ohne POD/Heredoc/Kommentar."""
+        result = scan(SOURCE)
+        assert result.uses == ["strict", "parent", "base"]
+        assert result.requires == ["Export::Csv"]
+        assert result.parents == ["Order::Base", "Mixin::Logging"]
+        assert "In::Pod" not in result.dependencies
+        assert "In::Heredoc" not in result.dependencies
+    
+    def test_pod_spans(self):
+        """POD-Blöcke werden erfasst."""
+        result = scan(SOURCE)
+        assert result.pod == [(9, 14)]
+        assert result.pod_lines == 6
+    
+    def test_line_count(self):
+        """Zeilenanzahl inklusive Daten-Sektion."""
+        assert scan(SOURCE).line_count == 44
+        assert scan("").line_count == 0
+    
+    def test_unterminated_heredoc_marker(self):
+        """'<<' ohne Endmarke ist kein Heredoc."""
+        result = scan("my $x = 1 <<EOF;\nsub later { }\n")
+        assert result.sub_names == ["later"]
+    
+    def test_quote_at_line_start(self):
+        """Ein String in Spalte 0 wird erkannt, Klammern darin zählen nicht."""
+        assert _split_code('"{" . $x')[1] == 0
+        result = scan('sub a {\n"}" . $x;\n}\nsub b { }\n')
+        assert [(s.name, s.start, s.end) for s in result.subs] == [("a", 1, 3), ("b", 4, 4)]
+    
+    def test_escaped_braces(self):
+        """Escapte Klammern (z.B. in Regexen) ändern die Tiefe nicht."""
+        assert _split_code(r"$s =~ s/\}//;")[1] == 0
+        assert _split_code(r"$s =~ /\{/ and 1;")[1] == 0
+        assert _split_code(r"print \\ '}';")[1] == 0
+        text = (
+            "package Foo;\n\nsub first {\n    return 1;\n}\n\n# Kommentar\n\n"
+            "sub clean {\n    my ($s) = @_;\n    $s =~ s/\\}//g;\n    $s =~ s/\\{//g;\n"
+            "    return $s;\n}\n\nsub after { }\n"
+        )
+        subs = [(s.name, s.start, s.end) for s in scan(text).subs]
+        assert subs == [("first", 3, 5), ("clean", 9, 14), ("after", 16, 16)]
+    
+    def test_require_in_string_or_pod(self):
+        """require in Strings und POD ist keine Abhängigkeit."""
+        text = (
+            'print "please require Some::Thing first";\n'
+            "eval { require Real::Dep; 1 };\n"
+            "=pod\n\nrequire Pod::Dep;\n\n=cut\n"
+        )
+        assert scan(text).requires == ["Real::Dep"]
@@ -0,0 +1,156 @@
+"""Tests für tools/store.py (Verarbeitung)."""
+import json
+import threading
+
+import pytest
+from code.tools import tracker
+from code.tools.store import JsonStore, SqliteStore, open_store
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    """Beide Backends mit identischer Schnittstelle."""
+    if request.param == "json":
+        yield JsonStore(tmp_path / "hashes.json")
+        return
+    store = SqliteStore(tmp_path / "hashes.db")
+    yield store
+    store.close()
+
+
+class TestStore:
+    """Gemeinsame Semantik beider Backends."""
+    
+    def test_empty(self, store):
+        """Leerer Speicher."""
+        assert store.load() == {}
+        assert store.get("Order::Base") is None
+        assert store.names() == []
+        assert store.count() == 0
+    
+    def test_batch_update(self, store):
+        """Mehrere Records auf einmal, None entfernt."""
+        store.update({"B": {"hash": "2"}, "A": {"hash": "1"}})
+        store.update({"A": None, "C": {"hash": "3", "size": 5}})
+        
+        assert store.names() == ["B", "C"]
+        assert store.get("C") == {"hash": "3", "size": 5}
+        assert store.get("A") is None
+        assert store.count() == 2
+    
+    def test_overwrite(self, store):
+        """Vorhandener Record wird ersetzt."""
+        store.update({"A": {"hash": "1"}})
+        store.update({"A": {"hash": "2"}})
+        assert store.load() == {"A": {"hash": "2"}}
+
+
+class TestJsonStore:
+    """Tests für den residenten JSON-Speicher."""
+    
+    def test_resident(self, tmp_path, monkeypatch):
+        """Ohne Änderung der Datei wird nicht neu gelesen."""
+        store = JsonStore(tmp_path / "hashes.json")
+        store.update({"A": {"hash": "1"}})
+        monkeypatch.setattr(json, "loads", lambda *a, **k: pytest.fail("neu gelesen"))
+        assert store.get("A") == {"hash": "1"}
+        assert store.names() == ["A"]
+    
+    def test_external_change(self, tmp_path):
+        """Änderungen anderer Instanzen werden per stat erkannt."""
+        path = tmp_path / "hashes.json"
+        store = JsonStore(path)
+        other = JsonStore(path)
+        store.update({"A": {"hash": "1"}})
+        assert other.names() == ["A"]
+        
+        other.update({"B": {"hash": "2"}})
+        assert store.names() == ["A", "B"]
+        path.unlink()
+        assert store.count() == 0
+    
+    def test_atomic_write_with_lock(self, tmp_path):
+        """Schreiben über Temp-Datei, Lock-Datei daneben."""
+        store = JsonStore(tmp_path / "hashes.json")
+        store.update({"A": {"hash": "1"}})
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["hashes.json", "hashes.json.lock"]
+    
+    def test_shared_instance(self, config):
+        """Der Server hält einen Speicher pro Datei."""
+        assert open_store(config) is open_store(config)
+
+
+class TestSqliteStore:
+    """Tests für das SQLite-Backend."""
+    
+    def test_wal_mode(self, tmp_path):
+        """Datenbank läuft im WAL-Modus."""
+        store = SqliteStore(tmp_path / "hashes.db")
+        mode = store._db.execute("PRAGMA journal_mode").fetchone()[0]
+        store.close()
+        assert mode == "wal"
+    
+    def test_concurrent_instances(self, tmp_path):
+        """Zwei Instanzen verlieren keine Updates der anderen."""
+        first = SqliteStore(tmp_path / "hashes.db")
+        second = SqliteStore(tmp_path / "hashes.db")
+        
+        def mark(store, prefix):
+            for i in range(20):
+                store.update({f"{prefix}{i}": {"hash": str(i)}})
+        
+        threads = [threading.Thread(target=mark, args=(s, p))
+                   for s, p in ((first, "A"), (second, "B"))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert first.count() == 40
+        first.close()
+        second.close()
+    
+    def test_migration(self, tmp_path):
+        """Vorhandene JSON-Datei wird einmalig übernommen."""
+        legacy = tmp_path / ".module_hashes.json"
+        legacy.write_text(json.dumps({"Old": "abc", "New": {"hash": "def", "size": 3}}))
+        
+        store = SqliteStore(tmp_path / "hashes.db", legacy)
+        assert store.get("Old") == {"hash": "abc"}
+        assert store.get("New") == {"hash": "def", "size": 3}
+        assert not legacy.exists()
+        assert (tmp_path / ".module_hashes.json.migrated").exists()
+        store.close()
+
+
+class TestOpenStore:
+    """Tests für open_store()."""
+    
+    def test_json_default(self, config):
+        """Standard ist die JSON-Datei."""
+        assert isinstance(open_store(config), JsonStore)
+    
+    def test_unknown_backend(self, config):
+        """Unbekanntes Backend."""
+        config.tracker_backend = "redis"
+        with pytest.raises(ValueError):
+            open_store(config)
+    
+    def test_tracker_with_sqlite(self, config, temp_project):
+        """Tracker-Tools mit SQLite-Backend, inklusive Migration."""
+        tracker.mark_documented(config, "Order::Base")
+        config.tracker_backend = "sqlite"
+        
+        assert "unverändert" in tracker.check_changes(config, "Order::Base").lower()
+        assert config.tracker_db.exists()
+        assert not config.hash_file.exists()
+        
+        tracker.mark_documented(config, "Order::Validation")
+        path = temp_project / "lib" / "Order" / "Validation.pm"
+        path.write_text(path.read_text() + "# Modified\n")
+        result = tracker.check_all_changes(config)
+        assert "GEÄNDERT (1):" in result
+        assert tracker.list_documented(config) == "Order::Base\nOrder::Validation"
+        
+        tracker.unmark_documented(config, "Order::Base")
+        assert "Verfolgte Module: 1" in tracker.documentation_stats(config)
@@ -1,4 +1,10 @@
 """Tests für tools/tracker.py (Verarbeitung)."""
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+
 import pytest
 from code.tools import tracker
 
@@ -34,6 +40,251 @@ class TestCheckChanges:
         assert "nicht gefunden" in result.lower()
 
 
+class TestStatFastPath:
+    """Tests für den stat-basierten Schnellpfad."""
+    
+    def test_record_contains_stat(self, config):
+        """Record enthält Hash und stat-Signatur."""
+        tracker.mark_documented(config, "Order::Validation")
+        record = json.loads(config.hash_file.read_text())["Order::Validation"]
+        assert set(record) == {"hash", "mtime_ns", "size", "inode", "subs", "packages", "snapshot"}
+    
+    def test_unchanged_stat_skips_hash(self, config, monkeypatch):
+        """Bei gleicher Signatur wird nicht gehasht."""
+        tracker.mark_documented(config, "Order::Validation")
+        monkeypatch.setattr(tracker, "compute_hash", lambda path: pytest.fail("gehasht"))
+        
+        assert "unverändert" in tracker.check_changes(config, "Order::Validation").lower()
+        assert "unverändert: 1" in tracker.check_all_changes(config).lower()
+    
+    def test_paranoid_rehashes(self, config, temp_project):
+        """paranoid erkennt Änderungen trotz gleicher Signatur."""
+        tracker.mark_documented(config, "Order::Base")
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        st = os.stat(path)
+        path.write_text(path.read_text().replace("new", "old"))
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        
+        assert "unverändert" in tracker.check_changes(config, "Order::Base").lower()
+        assert "geändert" in tracker.check_changes(config, "Order::Base", paranoid=True).lower()
+    
+    def test_touched_file_refreshes_stat(self, config, temp_project):
+        """Nur berührte Datei: gleicher Hash, Signatur wird nachgeführt."""
+        tracker.mark_documented(config, "Order::Base")
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000))
+        
+        assert "unverändert: 1" in tracker.check_all_changes(config).lower()
+        record = json.loads(config.hash_file.read_text())["Order::Base"]
+        assert record["mtime_ns"] == st.st_mtime_ns + 5_000_000
+    
+    def test_legacy_string_records(self, config):
+        """Alte Hash-Dateien (nur Hash-String) werden weiter gelesen."""
+        tracker.mark_documented(config, "Order::Base")
+        data = json.loads(config.hash_file.read_text())
+        config.hash_file.write_text(json.dumps({"Order::Base": data["Order::Base"]["hash"]}))
+        
+        assert "unverändert" in tracker.check_changes(config, "Order::Base").lower()
+        assert "Order::Base" in tracker.list_documented(config)
+    
+    @pytest.mark.parametrize("content", [
+        b"package Crlf;\r\nsub a { 1 }\r\n1;\r\n",
+        b"package Crlf;\n# Gr\xfc\xdfe\n1;\n",
+    ])
+    def test_legacy_text_hash(self, config, temp_project, content):
+        """Alte Text-Hashes (CRLF, Latin-1) gelten als unverändert und werden umgestellt."""
+        path = temp_project / "lib" / "Crlf.pm"
+        path.write_bytes(content)
+        legacy = hashlib.md5(path.read_text(encoding="utf-8", errors="replace").encode()).hexdigest()
+        assert legacy != hashlib.md5(content).hexdigest()
+        config.hash_file.write_text(json.dumps({"Crlf": legacy}))
+        
+        assert "unverändert" in tracker.check_changes(config, "Crlf").lower()
+        record = json.loads(config.hash_file.read_text())["Crlf"]
+        assert record["hash"] == hashlib.md5(content).hexdigest()
+        assert record["mtime_ns"] == path.stat().st_mtime_ns
+        
+        path.write_bytes(content.replace(b"1;", b"2;"))
+        assert "geändert" in tracker.check_changes(config, "Crlf", paranoid=True).lower()
+
+
+class TestSubHashes:
+    """Tests für Hashes pro Sub und Package-Block."""
+    
+    def test_record_contains_subs(self, config):
+        """Record enthält einen Hash je Sub und Package."""
+        tracker.mark_documented(config, "Order::Validation")
+        record = json.loads(config.hash_file.read_text())["Order::Validation"]
+        assert set(record["subs"]) == {"validate_order", "validate_payment"}
+        assert set(record["packages"]) == {"Order::Validation"}
+    
+    def test_changed_added_removed(self, config, temp_project):
+        """check_changes nennt geänderte, neue und entfernte Subs."""
+        tracker.mark_documented(config, "Order::Validation")
+        path = temp_project / "lib" / "Order" / "Validation.pm"
+        text = path.read_text()
+        text = text.replace("return 1;\n}\n\nsub validate_payment", "return 2;\n}\n\nsub check_payment")
+        path.write_text(text)
+        
+        result = tracker.check_changes(config, "Order::Validation")
+        assert "GEÄNDERT" in result
+        assert "~ validate_order (Zeilen 7-10)" in result
+        assert "+ check_payment (Zeilen 12-15)" in result
+        assert "- validate_payment" in result
+        assert "Package-Code" not in result
+    
+    def test_package_code_changed(self, config, temp_project):
+        """Änderungen außerhalb von Subs werden dem Package zugeordnet."""
+        tracker.mark_documented(config, "Order::Validation")
+        path = temp_project / "lib" / "Order" / "Validation.pm"
+        path.write_text(path.read_text().replace("use Payment::Gateway;\n", ""))
+        
+        result = tracker.check_changes(config, "Order::Validation")
+        assert "Package-Code außerhalb von Subs geändert: Order::Validation" in result
+        assert "Subs" not in result.replace("außerhalb von Subs", "")
+    
+    def test_legacy_record(self, config, temp_project):
+        """Records ohne Sub-Hashes melden nur die Änderung des Moduls."""
+        tracker.mark_documented(config, "Order::Base")
+        data = json.loads(config.hash_file.read_text())
+        config.hash_file.write_text(json.dumps({"Order::Base": data["Order::Base"]["hash"]}))
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        path.write_text(path.read_text() + "# Modified\n")
+        
+        assert tracker.check_changes(config, "Order::Base") == \
+            "Order::Base: GEÄNDERT seit letzter Dokumentation"
+
+
+class TestDiffSinceDocumented:
+    """Tests für diff_since_documented()."""
+    
+    def test_never_documented(self, config):
+        """Ohne Markierung kein Diff."""
+        assert "noch nie dokumentiert" in tracker.diff_since_documented(config, "Order::Base").lower()
+    
+    def test_unchanged(self, config):
+        """Unverändertes Modul."""
+        tracker.mark_documented(config, "Order::Base")
+        assert "unverändert" in tracker.diff_since_documented(config, "Order::Base").lower()
+    
+    def test_unified_diff(self, config, temp_project):
+        """Diff zwischen Snapshot und aktuellem Stand."""
+        tracker.mark_documented(config, "Order::Base")
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        path.write_text(path.read_text().replace("return bless {}, $class;", "return bless {x => 1}, $class;"))
+        
+        result = tracker.diff_since_documented(config, "Order::Base", context=1)
+        assert result.startswith("--- Order::Base (dokumentiert)\n+++ Order::Base (aktuell)")
+        assert "-    return bless {}, $class;" in result
+        assert "+    return bless {x => 1}, $class;" in result
+        assert "use strict" not in result
+    
+    def test_snapshots_deduplicated(self, config, temp_project):
+        """Gleiche Inhalte werden nur einmal gespeichert."""
+        tracker.mark_documented(config, "Order::Base")
+        tracker.mark_documented(config, "Order::Base")
+        (temp_project / "lib" / "Copy.pm").write_bytes(
+            (temp_project / "lib" / "Order" / "Base.pm").read_bytes())
+        tracker.mark_documented(config, "Copy")
+        
+        assert len(list(config.snapshot_dir.rglob("*.z"))) == 1
+    
+    def test_legacy_record(self, config):
+        """Records ohne Snapshot."""
+        tracker.mark_documented(config, "Order::Base")
+        data = json.loads(config.hash_file.read_text())
+        config.hash_file.write_text(json.dumps({"Order::Base": data["Order::Base"]["hash"]}))
+        assert "kein snapshot" in tracker.diff_since_documented(config, "Order::Base").lower()
+
+
+class TestHashing:
+    """Tests für das blockweise, parallele Hashing."""
+    
+    def test_binary_chunked_hash(self, config, temp_project, monkeypatch):
+        """Hash über Rohbytes, unabhängig von der Blockgröße."""
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        expected = hashlib.md5(path.read_bytes()).hexdigest()
+        monkeypatch.setattr(tracker, "HASH_CHUNK_SIZE", 7)
+        assert tracker.compute_hash(path) == expected
+    
+    def test_invalid_utf8(self, config, temp_project):
+        """Nicht dekodierbare Bytes werden unverändert gehasht."""
+        path = temp_project / "lib" / "Latin1.pm"
+        path.write_bytes(b"package Latin1;\n# Gr\xfc\xdfe\n1;\n")
+        tracker.mark_documented(config, "Latin1")
+        path.write_bytes(b"package Latin1;\n# Gr\xfc\xdfx\n1;\n")
+        assert "geändert" in tracker.check_changes(config, "Latin1", paranoid=True).lower()
+    
+    def test_parallel_check_all(self, config, temp_project):
+        """check_all_changes mit mehreren Workern."""
+        config.workers = 4
+        for name in ("Order::Validation", "Order::Base", "Payment::Gateway"):
+            tracker.mark_documented(config, name)
+        path = temp_project / "lib" / "Payment" / "Gateway.pm"
+        path.write_text(path.read_text() + "# Modified\n")
+        
+        result = tracker.check_all_changes(config)
+        assert "GEÄNDERT (1):" in result
+        assert "Payment::Gateway" in result
+        assert "Unverändert: 2" in result
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", "-C", str(cwd), *args], check=True, capture_output=True)
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git nicht installiert")
+class TestGitMode:
+    """Tests für tracker.mode = git."""
+    
+    @pytest.fixture
+    def git_config(self, config, temp_project):
+        _git(temp_project, "init", "-q")
+        _git(temp_project, "add", "lib")
+        config.tracker_mode = "git"
+        return config
+    
+    def test_records_blob_sha(self, git_config, temp_project):
+        """Record enthält den Blob-SHA aus dem Index."""
+        tracker.mark_documented(git_config, "Order::Base")
+        record = json.loads(git_config.hash_file.read_text())["Order::Base"]
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        data = path.read_bytes()
+        expected = hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+        assert record["algo"] == "git"
+        assert record["hash"] == expected
+    
+    def test_check_all(self, git_config, temp_project, monkeypatch):
+        """Änderungen werden über git erkannt, ohne MD5."""
+        tracker.mark_modules_documented(git_config, ["Order::*", "Payment::Gateway"])
+        monkeypatch.setattr(tracker, "compute_hash", lambda path: pytest.fail("MD5"))
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        path.write_text(path.read_text() + "# Modified\n")
+        other = temp_project / "lib" / "Payment" / "Gateway.pm"
+        st = os.stat(other)
+        os.utime(other, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000))
+        
+        result = tracker.check_all_changes(git_config)
+        assert "GEÄNDERT (1):" in result
+        assert "Order::Base" in result
+        assert "Unverändert: 2" in result
+        assert "geändert" in tracker.check_changes(git_config, "Order::Base", paranoid=True).lower()
+    
+    def test_untracked_file(self, git_config, temp_project):
+        """Nicht versionierte Dateien werden per hash-object gehasht."""
+        (temp_project / "lib" / "New.pm").write_text("package New;\n1;\n")
+        tracker.mark_documented(git_config, "New")
+        assert "unverändert" in tracker.check_changes(git_config, "New", paranoid=True).lower()
+    
+    def test_fallback_outside_git(self, config):
+        """Ohne Repository wird per MD5 gehasht."""
+        config.tracker_mode = "git"
+        tracker.mark_documented(config, "Order::Base")
+        record = json.loads(config.hash_file.read_text())["Order::Base"]
+        assert "algo" not in record
+
+
 class TestMarkDocumented:
     """Tests für mark_documented()."""
     
@@ -78,6 +329,42 @@ class TestUnmarkDocumented:
         assert "nicht als dokumentiert" in result.lower()
 
 
+class TestBatchMarking:
+    """Tests für mark_modules_documented() und unmark_modules_documented()."""
+    
+    def test_mark_many(self, config):
+        """Mehrere Module, ein Schreibvorgang."""
+        result = tracker.mark_modules_documented(config, ["Order::Base", "Payment::Gateway", "Nope"])
+        assert "markiert (2)" in result
+        assert "NICHT GEFUNDEN (1)" in result
+        assert set(json.loads(config.hash_file.read_text())) == {"Order::Base", "Payment::Gateway"}
+    
+    def test_mark_glob(self, config):
+        """Namespace-Muster werden gegen lib aufgelöst."""
+        config.workers = 4
+        result = tracker.mark_modules_documented(config, ["Order::*", "Missing::*"])
+        assert tracker.list_documented(config) == "Order::Base\nOrder::Validation"
+        assert "Missing::*" in result
+    
+    def test_unmark_glob(self, config):
+        """Muster beim Entfernen beziehen sich auf markierte Module."""
+        tracker.mark_modules_documented(config, ["Order::*", "Payment::Gateway"])
+        result = tracker.unmark_modules_documented(config, ["Order::*", "Payment::Other"])
+        assert "entfernt (2)" in result
+        assert "NICHT MARKIERT (1)" in result
+        assert tracker.list_documented(config) == "Payment::Gateway"
+    
+    def test_single_store_update(self, config, monkeypatch):
+        """Alle Records werden in einem Aufruf gespeichert."""
+        from code.tools.store import JsonStore
+        calls = []
+        original = JsonStore.update
+        monkeypatch.setattr(JsonStore, "update",
+                            lambda self, changes: calls.append(1) or original(self, changes))
+        tracker.mark_modules_documented(config, ["Order::*", "Payment::Gateway"])
+        assert len(calls) == 1
+
+
 class TestCheckAllChanges:
     """Tests für check_all_changes()."""
     
@@ -108,6 +395,35 @@ class TestCheckAllChanges:
         assert "Order::Validation" in result
 
 
+class TestPropagation:
+    """Tests für check_all_changes(propagate=True)."""
+    
+    def test_dependency_changed(self, config, temp_project):
+        """Verwender geänderter Module werden mit Abstand gemeldet."""
+        (temp_project / "lib" / "Order" / "Export.pm").write_text(
+            "package Order::Export;\nuse Order::Validation;\n1;\n")
+        tracker.mark_modules_documented(config, ["Order::*", "Payment::Gateway"])
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        path.write_text(path.read_text() + "# Modified\n")
+        
+        result = tracker.check_all_changes(config, propagate=True)
+        assert "GEÄNDERT (1):\n  ⚠ Order::Base" in result
+        assert "ABHÄNGIGKEIT GEÄNDERT (2):" in result
+        assert "⤷ Order::Validation (1 Hop über Order::Base)" in result
+        assert "⤷ Order::Export (2 Hops über Order::Base)" in result
+        assert "Unverändert: 1 Module" in result
+    
+    def test_without_propagate(self, config, temp_project):
+        """Ohne propagate bleibt die Ausgabe modulweise."""
+        tracker.mark_modules_documented(config, ["Order::*"])
+        path = temp_project / "lib" / "Order" / "Base.pm"
+        path.write_text(path.read_text() + "# Modified\n")
+        
+        result = tracker.check_all_changes(config)
+        assert "ABHÄNGIGKEIT" not in result
+        assert "Unverändert: 1 Module" in result
+
+
 class TestListDocumented:
     """Tests für list_documented()."""
     
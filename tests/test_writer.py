@@ -1,6 +1,8 @@
 """Tests für tools/writer.py (Ausgabe)."""
 import pytest
 from code.tools import writer
+from code.tools.docindex import get_doc_index
+from code.tools.docsearch import get_doc_search
 
 
 class TestWriteDoc:
@@ -93,3 +95,136 @@ class TestDeleteDoc:
         """Nicht vorhandene Dokumentation löschen."""
         result = writer.delete_doc(config, "module", "DoesNotExist")
         assert "nicht gefunden" in result.lower()
+
+
+class TestSectionEdits:
+    """Tests für patch_doc(), append_to_section() und insert_section()."""
+    
+    DOC = "# Modul\n\n## Zweck\n\nAlt\n\n## Funktionen\n\n### `a()`\n\nA\n\n## Notizen\n\n- eins\n"
+    
+    @pytest.fixture
+    def doc(self, config):
+        writer.write_doc(config, "module", "Order::Base", self.DOC)
+        return config.docs_root / "modules" / "Order_Base.md"
+    
+    def test_patch(self, config, doc):
+        """Nur der Abschnitt wird ersetzt."""
+        result = writer.patch_doc(config, "module", "Order::Base", "Zweck", "Neu\n")
+        assert result == f"Abschnitt 'Zweck' ersetzt: {doc}"
+        assert doc.read_text() == self.DOC.replace("Alt", "Neu")
+        
+        writer.patch_doc(config, "module", "Order::Base", "## Notizen", "- zwei")
+        assert doc.read_text().endswith("## Notizen\n\n- zwei\n")
+    
+    def test_append(self, config, doc):
+        """Anhängen hinter den Unterabschnitten."""
+        writer.append_to_section(config, "module", "Order::Base", "Funktionen", "### `b()`\n\nB")
+        assert "### `a()`\n\nA\n\n### `b()`\n\nB\n\n## Notizen" in doc.read_text()
+    
+    def test_insert(self, config, doc):
+        """Einfügen als Unterabschnitt oder am Dateiende."""
+        writer.insert_section(config, "module", "Order::Base", "`c()`", "C", after_heading="Funktionen")
+        writer.insert_section(config, "module", "Order::Base", "Anhang", "")
+        content = doc.read_text()
+        assert "A\n\n### `c()`\n\nC\n\n## Notizen" in content
+        assert content.endswith("- eins\n\n## Anhang\n")
+    
+    def test_updates_indexes(self, config, doc):
+        """Doku- und Suchindex sehen den neuen Inhalt."""
+        writer.patch_doc(config, "module", "Order::Base", "Zweck", "Siehe [[Order::Validation]]")
+        assert "Order::Validation" in writer.broken_links(config)
+        assert "module/Order_Base" in writer.search_docs(config, "siehe")
+    
+    def test_errors(self, config, doc):
+        """Fehlende Datei, fehlender Abschnitt, ungültiger Typ."""
+        assert "nicht gefunden" in writer.patch_doc(config, "module", "Fehlt", "Zweck", "")
+        assert writer.patch_doc(config, "module", "Order::Base", "Gibt es nicht", "") == (
+            "Abschnitt nicht gefunden: Gibt es nicht")
+        assert "Ungültiger Typ" in writer.append_to_section(config, "x", "a", "b", "c")
+        assert doc.read_text() == self.DOC
+
+
+class TestWriteDocs:
+    """Tests für write_docs() und das atomare Schreiben."""
+    
+    @pytest.mark.parametrize("fsync", ["none", "file", "batch"])
+    def test_batch(self, config, fsync):
+        """Alle Einträge werden geschrieben und indiziert, keine Temp-Dateien bleiben."""
+        config.docs_fsync = fsync
+        result = writer.write_docs(config, [
+            {"doc_type": "module", "name": "Order::Base", "content": "# Base"},
+            {"doc_type": "note", "name": "a", "content": "Notiz zu Versand"},
+        ])
+        assert result.split("\n") == [
+            "Geschrieben: 2, unverändert: 0, Fehler: 0",
+            "  + modules/Order_Base.md",
+            "  + notes/a.md",
+        ]
+        assert (config.docs_root / "notes" / "a.md").read_text() == "Notiz zu Versand"
+        assert "note/a" in writer.search_docs(config, "versand")
+        leftovers = [p for p in config.docs_root.rglob(".*.tmp")]
+        assert leftovers == []
+    
+    def test_unchanged_skipped(self, config):
+        """Gleicher Inhalt wird nicht neu geschrieben."""
+        writer.write_doc(config, "note", "a", "# A")
+        path = config.docs_root / "notes" / "a.md"
+        mtime = path.stat().st_mtime_ns
+        
+        assert writer.write_doc(config, "note", "a", "# A") == f"Unverändert: {path}"
+        result = writer.write_docs(config, [
+            {"doc_type": "note", "name": "a", "content": "# A"},
+            {"doc_type": "note", "name": "b", "content": "# B"},
+        ])
+        assert result.startswith("Geschrieben: 1, unverändert: 1")
+        assert "  = notes/a.md" in result
+        assert path.stat().st_mtime_ns == mtime
+    
+    @pytest.mark.parametrize("fsync", ["none", "file", "batch"])
+    def test_failure_mid_batch(self, config, fsync):
+        """Nach einem Fehler sind genau die veröffentlichten Dateien indiziert."""
+        config.docs_fsync = fsync
+        config.docs_root.mkdir(parents=True, exist_ok=True)
+        (config.docs_root / "tables").write_text("kein Ordner")
+        with pytest.raises(OSError):
+            writer.write_docs(config, [
+                {"doc_type": "note", "name": "a", "content": "Notiz zu Versand"},
+                {"doc_type": "table", "name": "orders", "content": "# Orders"},
+            ])
+        index = get_doc_index(config, refresh=False)
+        published = fsync != "batch"
+        assert (config.docs_root / "notes" / "a.md").exists() == published
+        assert (index.get("note", "a") is not None) == published
+        assert get_doc_search(config, refresh=False).search("versand")[1] == int(published)
+    
+    def test_module_names_sanitized_once(self, config, monkeypatch):
+        """Modulnamen werden pro Stapel nur einmal in Dateinamen umgesetzt."""
+        calls = []
+        original = writer.get_module_index
+        monkeypatch.setattr(writer, "get_module_index",
+                            lambda cfg: calls.append(1) or original(cfg))
+        writer.write_docs(config, [
+            {"doc_type": "module", "name": "Order_Validation", "content": "# V"},
+            {"doc_type": "module", "name": "Order_Base", "content": "# B"},
+        ])
+        index = get_doc_index(config, refresh=False)
+        assert index.get("module", "Order_Validation").source_hash is not None
+        assert index.get("module", "Order_Base").source_hash is not None
+        assert len(calls) == 1
+    
+    def test_errors(self, config):
+        """Fehlerhafte Einträge werden gemeldet, gültige trotzdem geschrieben."""
+        result = writer.write_docs(config, [
+            {"doc_type": "x", "name": "a", "content": ""},
+            {"doc_type": "note", "name": "a"},
+            {"doc_type": "note", "name": "b", "content": "ok"},
+        ])
+        assert result.startswith("Geschrieben: 1, unverändert: 0, Fehler: 2")
+        assert "  ! #1: Ungültiger Typ 'x'" in result
+        assert "  ! #2: 'doc_type', 'name' und 'content' erforderlich" in result
+    
+    def test_invalid_fsync(self, config):
+        """Unbekannte fsync-Strategie."""
+        config.docs_fsync = "always"
+        with pytest.raises(ValueError, match="fsync"):
+            writer.write_doc(config, "note", "a", "# A")